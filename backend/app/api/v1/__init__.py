@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, matches, leagues, teams, predictions, enhanced
+from app.api.v1.endpoints import auth, matches, leagues, teams, predictions, enhanced, scheduler_status
 
 router = APIRouter()
 
@@ -10,3 +10,4 @@ router.include_router(leagues.router, prefix="/leagues", tags=["leagues"])
 router.include_router(teams.router, prefix="/teams", tags=["teams"])
 router.include_router(predictions.router, prefix="/predictions", tags=["predictions"])
 router.include_router(enhanced.router, prefix="/enhanced", tags=["enhanced"])
+router.include_router(scheduler_status.router, prefix="/scheduler", tags=["scheduler"])
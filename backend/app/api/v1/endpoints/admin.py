@@ -7,24 +7,21 @@ import asyncio
 import logging
 
 from app.db.database import get_db
-from app.db.models import User, Match, Team, League, Prediction
+from app.db.models import User, Match, Team, League, Prediction, LIVE_STATUS_FILTER
+from app.core.config import settings
 from app.core.security import get_current_user, create_access_token
 from app.schemas.schemas import ApiResponse, MatchBase, UserResponse, UserCreate
+from app.services.api_budget import api_budget, api_priority
 from app.services.data_sync import DataSyncService
+from app.services.job_runs import (
+    track_job_run, update_job_progress, record_job_error, queue_job_run,
+    get_active_run, get_latest_run, get_recent_runs, get_job_percentiles, serialize_run,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# --- Global Seed Status ---
-SEED_STATUS = {
-    "is_running": False,
-    "progress": 0,
-    "total": 0,
-    "message": "Idle",
-    "updated_at": None
-}
-
 # --- Dependencies ---
 
 async def get_current_superuser(current_user: dict = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
@@ -90,115 +87,230 @@ async def admin_login(login_data: dict, db: AsyncSession = Depends(get_db)):
 
 # --- Dashboard Stats ---
 
+# pg_class.reltuples estimates for the large tables unless exact counts are
+# asked for (falls back to an exact count if the table was never analyzed).
+# The live count repeats LIVE_STATUS_FILTER so it reads ix_matches_live_status.
+ADMIN_STATS_SQL = """
+SELECT
+    {users} AS users,
+    {matches} AS matches,
+    (SELECT COUNT(*) FROM matches WHERE %s) AS live_matches,
+    {teams} AS teams,
+    (SELECT COUNT(*) FROM leagues) AS leagues
+""" % LIVE_STATUS_FILTER
+
+ADMIN_STATS_TTL = 30  # seconds
+
+
+def _count_sql(table: str, estimate: bool) -> str:
+    if not estimate:
+        return f"(SELECT COUNT(*) FROM {table})"
+    return (
+        f"(SELECT CASE WHEN c.reltuples < 0 THEN (SELECT COUNT(*) FROM {table}) "
+        f"ELSE c.reltuples::bigint END FROM pg_class c WHERE c.oid = '{table}'::regclass)"
+    )
+
+
 @router.get("/stats", response_model=ApiResponse)
 async def get_admin_stats(
+    exact: bool = Query(False, description="COUNT(*) users/matches/teams instead of planner estimates"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_superuser)
 ):
-    """Get system statistics"""
+    """Get system statistics (one aggregate query, cached for 30 seconds)
+    Row counts are planner estimates unless `exact` is set.
+    """
+    from sqlalchemy import text
+    from app.services.cache import local_cache
+    
+    estimate = not exact
+    cache_key = f"admin:stats:{estimate}"
+    cached = local_cache.get(cache_key)
+    if cached:
+        return ApiResponse(success=True, data=cached)
+    
+    sql = ADMIN_STATS_SQL.format(
+        users=_count_sql("users", estimate),
+        matches=_count_sql("matches", estimate),
+        teams=_count_sql("teams", estimate),
+    )
+    row = (await db.execute(text(sql))).one()
+    
+    stats_data = {
+        "users": row.users,
+        "matches": row.matches,
+        "live_matches": row.live_matches,
+        "teams": row.teams,
+        "leagues": row.leagues,
+        "estimated": estimate,
+        "system_status": "healthy" 
+    }
+    local_cache.set(cache_key, stats_data, expire=ADMIN_STATS_TTL)
+    
+    return ApiResponse(success=True, data=stats_data)
+
+# --- Database Metrics ---
+
+@router.get("/metrics/db", response_model=ApiResponse)
+async def get_db_metrics(
+    top: int = Query(20, ge=1, le=200),
+    current_user: User = Depends(get_current_superuser)
+):
+    """Pool usage, statement latency, per-route query counts and slow queries"""
+    from app.db import database
+    from app.db.instrumentation import db_metrics
     
-    # Count Users
-    user_count = await db.scalar(select(func.count(User.id)))
+    pools = {"primary": database.engine.sync_engine.pool}
+    if database.read_engine is not database.engine:
+        pools["read"] = database.read_engine.sync_engine.pool
     
-    # Count Matches
-    match_count = await db.scalar(select(func.count(Match.id)))
-    live_match_count = await db.scalar(select(func.count(Match.id)).where(Match.status == 'live'))
+    return ApiResponse(success=True, data=db_metrics.snapshot(pools, top=top))
+
+
+@router.post("/metrics/db/reset", response_model=ApiResponse)
+async def reset_db_metrics(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Reset database metrics counters"""
+    from app.db.instrumentation import db_metrics
     
-    # Count Teams
-    team_count = await db.scalar(select(func.count(Team.id)))
+    db_metrics.reset()
+    return ApiResponse(success=True, message="Database metrics reset")
+
 
-    # Count Leagues
-    league_count = await db.scalar(select(func.count(League.id)))
+@router.get("/metrics/http-cache", response_model=ApiResponse)
+async def get_http_cache_metrics(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Provider response cache hit rate and API requests saved (this worker)"""
+    from app.services.http_cache import http_cache
     
     return ApiResponse(
         success=True,
         data={
-            "users": user_count,
-            "matches": match_count,
-            "live_matches": live_match_count,
-            "teams": team_count,
-            "leagues": league_count,
-            "system_status": "healthy" 
+            "backend": type(http_cache.backend).__name__ if http_cache.enabled else "off",
+            **http_cache.stats.snapshot(),
         }
     )
 
-# --- Seeding Logic ---
 
-async def run_seed_process():
-    """Background task to seed data"""
-    global SEED_STATUS
-    SEED_STATUS["is_running"] = True
-    SEED_STATUS["progress"] = 0
-    SEED_STATUS["message"] = "Starting seed process..."
-    SEED_STATUS["updated_at"] = datetime.utcnow().isoformat()
+@router.post("/metrics/http-cache/reset", response_model=ApiResponse)
+async def reset_http_cache_metrics(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Reset provider response cache counters"""
+    from app.services.http_cache import http_cache
     
-    try:
-        # We need a new session since we are in a background task
-        # But DataSyncService needs a session.
-        # We'll creating a new session using sessionmaker from database.py directly or similar.
-        # Importing here to avoid circulars if any
-        from app.db.database import AsyncSessionLocal
+    http_cache.stats.reset()
+    return ApiResponse(success=True, message="HTTP cache metrics reset")
+
+
+@router.get("/metrics/providers", response_model=ApiResponse)
+async def get_provider_health(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Circuit breaker state per provider (this worker)"""
+    from app.services.resilience import breaker_report
+    
+    return ApiResponse(success=True, data=breaker_report())
+
+# --- Seeding Logic ---
+
+async def run_seed_process(run_id: Optional[int] = None, trigger: str = "admin", plan: Optional[Dict] = None):
+    """Background task to seed data
+    Recorded in job_runs; progress lives on the run row so every worker sees it.
+    Ingested units are checkpointed, so running the same plan again resumes it.
+    Args:
+        run_id: Queued run claimed by the sync worker (SYNC_MODE=worker)
+        trigger: Who started the seed when no queued run is given
+        plan: {"date_from", "date_to", "league_ids"} of an interrupted run to resume
+    """
+    async with track_job_run("seed", trigger=trigger, run_id=run_id), api_priority("seed"):
+        await update_job_progress(progress=0, total=0, message="Starting seed process...")
         
-        async with AsyncSessionLocal() as db:
-            service = DataSyncService(db)
-            
-            # 1. Sync Leagues
-            SEED_STATUS["message"] = "Syncing leagues..."
-            SEED_STATUS["updated_at"] = datetime.utcnow().isoformat()
-            await service.sync_leagues()
+        try:
+            if plan is None:
+                # We need a new session since we are in a background task
+                # But DataSyncService needs a session.
+                # We'll creating a new session using sessionmaker from database.py directly or similar.
+                # Importing here to avoid circulars if any
+                from app.db.database import AsyncSessionLocal
+                
+                async with AsyncSessionLocal() as db:
+                    service = DataSyncService(db)
+                    
+                    # 1. Sync Leagues
+                    await update_job_progress(message="Syncing leagues...")
+                    await service.sync_leagues()
+                    
+                    # Get all leagues
+                    result = await db.execute(select(League))
+                    leagues = result.scalars().all()
+                    total_leagues = len(leagues)
+                    
+                    await update_job_progress(message=f"Found {total_leagues} leagues. Starting match sync...")
+                
+                # Past 14 days + Future 14 days
+                today = date.today()
+                plan = {
+                    "date_from": (today - timedelta(days=14)).strftime("%Y-%m-%d"),
+                    "date_to": (today + timedelta(days=14)).strftime("%Y-%m-%d"),
+                    "league_ids": [league.external_id for league in leagues],
+                }
             
-            # Get all leagues
-            result = await db.execute(select(League))
-            leagues = result.scalars().all()
-            total_leagues = len(leagues)
+            # 2. Sync Matches and standings.
+            # The pipeline overlaps API fetches with DB writes on its own session.
+            from app.services.seed_pipeline import SeedPipeline, SeedCheckpointStore, plan_seed_units, plan_key
             
-            SEED_STATUS["total"] = total_leagues
-            SEED_STATUS["message"] = f"Found {total_leagues} leagues. Starting match sync..."
+            units = plan_seed_units(plan["league_ids"], plan["date_from"], plan["date_to"])
+            # Stored on the run so an interrupted seed can be resumed with the same units
+            await update_job_progress(plan=plan, planKey=plan_key(units))
             
-            # 2. Sync Matches per league (Past 14 days + Future 14 days)
-            today = date.today()
-            date_from = (today - timedelta(days=14)).strftime("%Y-%m-%d")
-            date_to = (today + timedelta(days=14)).strftime("%Y-%m-%d")
+            async def on_progress(unit, done, total):
+                await update_job_progress(
+                    message=f"Synced {unit.kind} ({done}/{total})",
+                    progress=int((done / total) * 100),
+                    total=total,
+                )
             
-            processed = 0
-            for league in leagues:
-                try:
-                    SEED_STATUS["message"] = f"Syncing {league.name}..."
-                    await service.sync_matches_date_range(league.external_id, date_from, date_to)
-                    # Also sync standings
-                    await service.sync_standings(league.external_id)
-                    
-                except Exception as e:
-                    logger.error(f"Error seeding league {league.name}: {e}")
-                
-                processed += 1
-                SEED_STATUS["progress"] = int((processed / total_leagues) * 100)
-                SEED_STATUS["updated_at"] = datetime.utcnow().isoformat()
-                
-                # Rate limit
-                await asyncio.sleep(5) 
-
-            SEED_STATUS["message"] = "Seed completed successfully!"
-            SEED_STATUS["progress"] = 100
+            pipeline = SeedPipeline(on_progress=on_progress, checkpoints=SeedCheckpointStore())
+            seed_result = await pipeline.run(units)
+            await update_job_progress(resumedUnits=seed_result.resumed)
+            if seed_result.failed:
+                logger.error(f"Seed units failed: {seed_result.failed}")
+            if seed_result.deferred:
+                await update_job_progress(
+                    message=f"API budget exhausted, {len(seed_result.deferred)} units deferred"
+                )
+            else:
+                await update_job_progress(message="Seed completed successfully!", progress=100)
             
-    except Exception as e:
-        SEED_STATUS["message"] = f"Error: {str(e)}"
-        logger.error(f"Seed process failed: {e}")
-    finally:
-        SEED_STATUS["is_running"] = False
-        SEED_STATUS["updated_at"] = datetime.utcnow().isoformat()
+        except Exception as e:
+            logger.error(f"Seed process failed: {e}")
+            record_job_error(e)
+            await update_job_progress(message=f"Error: {str(e)}")
 
 
 @router.post("/seed", response_model=ApiResponse)
 async def trigger_seed(
     background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_superuser)
 ):
-    """Trigger manual data seeding"""
-    global SEED_STATUS
-    if SEED_STATUS["is_running"]:
+    """Trigger manual data seeding
+    With SYNC_MODE=worker the run is queued for the sync worker instead.
+    """
+    if await get_active_run(db, "seed"):
         return ApiResponse(success=False, message="Seed process is already running")
     
+    if settings.SYNC_MODE == "worker":
+        run = await queue_job_run(db, "seed")
+        return ApiResponse(
+            success=True,
+            message="Seed queued for the sync worker",
+            data={"status": "queued", "runId": run.id}
+        )
+    
     background_tasks.add_task(run_seed_process)
     
     return ApiResponse(
@@ -209,15 +321,74 @@ async def trigger_seed(
 
 @router.get("/seed/active", response_model=ApiResponse)
 async def get_seed_status(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_superuser)
 ):
-    """Get status of active seed process"""
+    """Get status of the latest seed run (from any worker)"""
+    run = await get_latest_run(db, "seed")
+    if run is None:
+        return ApiResponse(
+            success=True,
+            data={"is_running": False, "progress": 0, "total": 0, "message": "Idle", "updated_at": None}
+        )
+    
+    details = run.details or {}
+    checkpoints = 0
+    if details.get("planKey"):
+        from app.db.models import SeedCheckpoint
+        checkpoints = await db.scalar(
+            select(func.count(SeedCheckpoint.id)).where(SeedCheckpoint.plan_key == details["planKey"])
+        )
     return ApiResponse(
         success=True,
-        data=SEED_STATUS
+        data={
+            "is_running": run.status in ("queued", "running"),
+            "checkpoints": checkpoints,
+            "status": run.status,
+            "progress": details.get("progress", 0),
+            "total": details.get("total", 0),
+            "message": details.get("message", run.status),
+            "updated_at": details.get("updated_at") or (run.finished_at or run.started_at or run.queued_at).isoformat(),
+            "run": serialize_run(run),
+        }
     )
 
 
+# --- Job Runs ---
+
+@router.get("/jobs/metrics", response_model=ApiResponse)
+async def get_job_metrics(
+    days: int = Query(7, ge=1, le=90),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_superuser)
+):
+    """Duration/API-request percentiles per scheduler job and seed"""
+    return ApiResponse(
+        success=True,
+        data={"days": days, "jobs": await get_job_percentiles(db, days)}
+    )
+
+
+@router.get("/api-budget", response_model=ApiResponse)
+async def get_api_budget(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Provider requests used today / this minute and per-priority caps"""
+    return ApiResponse(success=True, data=await api_budget.report())
+
+
+@router.get("/jobs/runs", response_model=ApiResponse)
+async def get_job_runs(
+    job: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_superuser)
+):
+    """Most recent job runs, optionally for a single job"""
+    runs = await get_recent_runs(db, job, limit)
+    return ApiResponse(success=True, data=[serialize_run(run) for run in runs])
+
+
 # --- Match Management ---
 
 @router.get("/matches", response_model=ApiResponse)
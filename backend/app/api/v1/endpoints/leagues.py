@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from app.db.database import get_db
+from app.db.database import get_read_db
 from app.db.models import League, Standing, Team
 from app.schemas.schemas import ApiResponse
 
@@ -11,7 +11,7 @@ router = APIRouter()
 
 
 @router.get("/", response_model=ApiResponse)
-async def get_leagues(db: AsyncSession = Depends(get_db)):
+async def get_leagues(db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(League))
     leagues = result.scalars().all()
     
@@ -30,7 +30,7 @@ async def get_leagues(db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/{league_id}", response_model=ApiResponse)
-async def get_league_by_id(league_id: int, db: AsyncSession = Depends(get_db)):
+async def get_league_by_id(league_id: int, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(League).where(League.id == league_id))
     league = result.scalar_one_or_none()
     
@@ -49,7 +49,7 @@ async def get_league_by_id(league_id: int, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/{league_id}/standings", response_model=ApiResponse)
-async def get_standings(league_id: int, db: AsyncSession = Depends(get_db)):
+async def get_standings(league_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     Get league standings/table
     Returns teams sorted by points, goal difference, etc.
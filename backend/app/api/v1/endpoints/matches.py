@@ -4,14 +4,19 @@ from sqlalchemy import select, and_, or_
 from sqlalchemy.orm import selectinload
 from typing import Optional
 from datetime import datetime, timedelta
+import asyncio
+import logging
 
-from app.db.database import get_db
+from app.db import database
+from app.db.database import get_read_db
 from app.db.models import Match, Team, League
 from app.schemas.schemas import ApiResponse, PaginatedResponse
 from app.core.security import get_current_user
-from app.services.cache import get_cache, RedisCache
+from app.services.cache import get_cache, RedisCache, local_cache
+from app.services.match_archive import matches_history
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.get("/upcoming", response_model=ApiResponse)
@@ -20,7 +25,7 @@ async def get_upcoming_matches(
     team_id: Optional[int] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     cache: RedisCache = Depends(get_cache),
 ):
     # Check cache first
@@ -108,7 +113,7 @@ async def get_upcoming_matches(
 
 
 @router.get("/live", response_model=ApiResponse)
-async def get_live_matches(db: AsyncSession = Depends(get_db)):
+async def get_live_matches(db: AsyncSession = Depends(get_read_db)):
     query = (
         select(Match)
         .options(
@@ -161,7 +166,7 @@ async def get_live_matches(db: AsyncSession = Depends(get_db)):
 async def get_finished_matches(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     query = select(Match).where(Match.status == "finished")
     query = query.order_by(Match.match_date.desc())
@@ -185,7 +190,7 @@ async def get_finished_matches(
 async def get_matches_by_date(
     date: str = Query(..., description="Date in YYYY-MM-DD format"),
     league_id: Optional[int] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     cache: RedisCache = Depends(get_cache),
 ):
     """
@@ -289,7 +294,7 @@ async def get_matches_date_range(
     date_from: str = Query(..., description="Start date YYYY-MM-DD"),
     date_to: str = Query(..., description="End date YYYY-MM-DD"),
     league_id: Optional[int] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get matches for a date range (for calendar/slider preload)
@@ -360,26 +365,9 @@ async def get_matches_date_range(
     )
 
 
-@router.get("/{match_id}", response_model=ApiResponse)
-async def get_match_by_id(match_id: int, db: AsyncSession = Depends(get_db)):
-    query = (
-        select(Match)
-        .options(
-            selectinload(Match.home_team),
-            selectinload(Match.away_team),
-            selectinload(Match.league)
-        )
-        .where(Match.id == match_id)
-    )
-    
-    result = await db.execute(query)
-    match = result.scalar_one_or_none()
-    
-    if not match:
-        return ApiResponse(success=False, message="Match not found")
-    
-    # Format response
-    match_data = {
+def _serialize_match(match: Match) -> dict:
+    """Match detail payload (teams and league must be loaded)"""
+    return {
         "id": match.id,
         "homeTeam": {
             "id": match.home_team.id,
@@ -410,12 +398,31 @@ async def get_match_by_id(match_id: int, db: AsyncSession = Depends(get_db)):
         "round": match.round,
         "externalId": match.external_id,
     }
+
+
+@router.get("/{match_id}", response_model=ApiResponse)
+async def get_match_by_id(match_id: int, db: AsyncSession = Depends(get_read_db)):
+    query = (
+        select(Match)
+        .options(
+            selectinload(Match.home_team),
+            selectinload(Match.away_team),
+            selectinload(Match.league)
+        )
+        .where(Match.id == match_id)
+    )
     
-    return ApiResponse(success=True, data=match_data)
+    result = await db.execute(query)
+    match = result.scalar_one_or_none()
+    
+    if not match:
+        return ApiResponse(success=False, message="Match not found")
+    
+    return ApiResponse(success=True, data=_serialize_match(match))
 
 
 @router.get("/{match_id}/prediction", response_model=ApiResponse)
-async def get_match_prediction(match_id: int, db: AsyncSession = Depends(get_db)):
+async def get_match_prediction(match_id: int, db: AsyncSession = Depends(get_read_db)):
     # 1. Get Match with Teams loaded
     query = (
         select(Match)
@@ -451,26 +458,158 @@ async def get_match_prediction(match_id: int, db: AsyncSession = Depends(get_db)
         return ApiResponse(success=False, message=f"Prediction failed: {str(e)}")
 
 
+# Per-part cache TTLs (seconds) for /{match_id}/bundle
+BUNDLE_TTLS = {
+    "prediction": 600,
+    "statistics": 900,
+    "h2h": 21600,
+    "teamStats": 1800,
+    "injuries": 21600,
+}
+
+
+async def _bundle_part(cache: RedisCache, key: str, ttl: int, load):
+    """Cached part of a match bundle; `load` runs only on a miss
+    Empty results are not cached so the next request retries them.
+    """
+    cached = local_cache.get(key)
+    if cached is None:
+        cached = await cache.get(key)
+    if cached is not None:
+        return cached
+    value = await load()
+    if value:
+        local_cache.set(key, value, expire=ttl)
+        await cache.set(key, value, expire=ttl)
+    return value
+
+
+async def _bundle_prediction(match_id: int):
+    """ML prediction on its own read session"""
+    from app.ml.feature_engineering import FeatureEngineer
+    from app.ml.model import prediction_model
+    
+    async with database.AsyncReadSessionLocal() as db:
+        match = (await db.execute(
+            select(Match)
+            .options(selectinload(Match.home_team), selectinload(Match.away_team))
+            .where(Match.id == match_id)
+        )).scalar_one_or_none()
+        if match is None:
+            return None
+        return await prediction_model.predict_match(match, FeatureEngineer(db))
+
+
+async def _with_read_session(call):
+    async with database.AsyncReadSessionLocal() as db:
+        return await call(db)
+
+
+@router.get("/{match_id}/bundle", response_model=ApiResponse)
+async def get_match_bundle(
+    match_id: int,
+    external_fixture_id: Optional[int] = None,
+    league_id: Optional[int] = None,
+    season: int = 2024,
+    db: AsyncSession = Depends(get_read_db),
+    cache: RedisCache = Depends(get_cache),
+):
+    """Everything the match detail screen needs in one request
+    The match comes straight from the database. Prediction, statistics, H2H and
+    both teams' statistics and injuries are loaded concurrently (each DB part on
+    its own session) and cached per part.
+    A failing part is returned as null and listed in `errors`.
+    Args:
+        external_fixture_id: API-Football fixture ID for match statistics
+        league_id / season: For team statistics and injuries (defaults to the
+            match's league external ID)
+    """
+    match = (await db.execute(
+        select(Match)
+        .options(
+            selectinload(Match.home_team),
+            selectinload(Match.away_team),
+            selectinload(Match.league)
+        )
+        .where(Match.id == match_id)
+    )).scalar_one_or_none()
+    
+    if not match:
+        return ApiResponse(success=False, message="Match not found")
+    
+    from app.services.enhanced_data_service import EnhancedDataService
+    
+    enhanced = EnhancedDataService(cache)
+    home_id, away_id = match.home_team_id, match.away_team_id
+    league_id = league_id or match.league.external_id
+    prefix = f"match_bundle:{match_id}"
+    parts = {
+        "prediction": _bundle_part(
+            cache, f"{prefix}:prediction", BUNDLE_TTLS["prediction"],
+            lambda: _bundle_prediction(match_id)
+        ),
+        "statistics": _bundle_part(
+            cache, f"{prefix}:statistics:{external_fixture_id}", BUNDLE_TTLS["statistics"],
+            lambda: enhanced.get_match_statistics(match_id, external_fixture_id)
+        ),
+        "h2h": _bundle_part(
+            cache, f"{prefix}:h2h", BUNDLE_TTLS["h2h"],
+            lambda: _with_read_session(lambda s: enhanced.get_head_to_head(home_id, away_id, s))
+        ),
+        "homeTeamStats": _bundle_part(
+            cache, f"{prefix}:team_stats:{home_id}:{league_id}:{season}", BUNDLE_TTLS["teamStats"],
+            lambda: _with_read_session(lambda s: enhanced.get_team_statistics(home_id, league_id, season, s))
+        ),
+        "awayTeamStats": _bundle_part(
+            cache, f"{prefix}:team_stats:{away_id}:{league_id}:{season}", BUNDLE_TTLS["teamStats"],
+            lambda: _with_read_session(lambda s: enhanced.get_team_statistics(away_id, league_id, season, s))
+        ),
+        "homeInjuries": _bundle_part(
+            cache, f"{prefix}:injuries:{home_id}:{league_id}:{season}", BUNDLE_TTLS["injuries"],
+            lambda: enhanced.get_team_injuries(home_id, league_id, season)
+        ),
+        "awayInjuries": _bundle_part(
+            cache, f"{prefix}:injuries:{away_id}:{league_id}:{season}", BUNDLE_TTLS["injuries"],
+            lambda: enhanced.get_team_injuries(away_id, league_id, season)
+        ),
+    }
+    
+    results = await asyncio.gather(*parts.values(), return_exceptions=True)
+    
+    # The match row was just loaded, so it is always served fresh (status/score)
+    bundle, errors = {"match": _serialize_match(match)}, {}
+    for name, value in zip(parts, results):
+        if isinstance(value, Exception):
+            logger.error(f"❌ Match bundle part {name} failed for match {match_id}: {value}")
+            errors[name] = str(value)
+            value = None
+        bundle[name] = value
+    bundle["errors"] = errors
+    
+    return ApiResponse(success=True, data=bundle)
+
+
 @router.get("/h2h", response_model=ApiResponse)
 async def get_head_to_head(
     home_team: int,
     away_team: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    # Get last 5 H2H matches
-    query = select(Match).where(
+    # Get last 5 H2H matches (archived seasons included)
+    h = matches_history.c
+    query = select(matches_history).where(
         and_(
-            Match.status == "finished",
+            h.status == "finished",
             (
-                (Match.home_team_id == home_team) & (Match.away_team_id == away_team)
-                | (Match.home_team_id == away_team) & (Match.away_team_id == home_team)
+                (h.home_team_id == home_team) & (h.away_team_id == away_team)
+                | (h.home_team_id == away_team) & (h.away_team_id == home_team)
             ),
         )
     )
-    query = query.order_by(Match.match_date.desc()).limit(5)
+    query = query.order_by(h.match_date.desc()).limit(5)
     
     result = await db.execute(query)
-    matches = result.scalars().all()
+    matches = result.all()
     
     return ApiResponse(
         success=True,
@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 from typing import List
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.db.models import News
 
 router = APIRouter()
@@ -13,7 +13,7 @@ router = APIRouter()
 async def get_news(
     skip: int = 0, 
     limit: int = 20, 
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get latest news"""
     try:
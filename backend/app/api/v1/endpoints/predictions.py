@@ -1,13 +1,72 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
+from app.db.models import Match
 from app.schemas.schemas import ApiResponse
 from app.ml.model import prediction_model
 from app.ml.feature_engineering import FeatureEngineer
 
 router = APIRouter()
 
+MAX_BATCH_PREDICTIONS = 500
+
+
+@router.get("/batch", response_model=ApiResponse)
+async def get_predictions_batch(
+    date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format"),
+    ids: Optional[str] = Query(None, description="Comma-separated match IDs"),
+    league_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Predictions for every match of a day and/or a list of match IDs
+    Features for all matches come from one history query and the model is
+    called once on the whole feature matrix.
+    """
+    if not date and not ids:
+        return ApiResponse(success=False, message="Pass date and/or ids")
+    
+    query = select(Match).options(
+        selectinload(Match.home_team),
+        selectinload(Match.away_team)
+    )
+    
+    if date:
+        try:
+            target_date = datetime.fromisoformat(date)
+        except ValueError:
+            return ApiResponse(success=False, message="Invalid date format. Use YYYY-MM-DD")
+        date_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        date_end = target_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+        query = query.where(Match.match_date >= date_start, Match.match_date <= date_end)
+    
+    if ids:
+        try:
+            match_ids = [int(match_id) for match_id in ids.split(",") if match_id.strip()]
+        except ValueError:
+            return ApiResponse(success=False, message="ids must be comma-separated integers")
+        if len(match_ids) > MAX_BATCH_PREDICTIONS:
+            return ApiResponse(success=False, message=f"At most {MAX_BATCH_PREDICTIONS} ids per request")
+        query = query.where(Match.id.in_(match_ids))
+    
+    if league_id:
+        query = query.where(Match.league_id == league_id)
+    
+    query = query.order_by(Match.match_date).limit(MAX_BATCH_PREDICTIONS)
+    
+    try:
+        matches = (await db.execute(query)).scalars().all()
+        predictions = await prediction_model.predict_matches(matches, FeatureEngineer(db))
+        return ApiResponse(success=True, data=predictions)
+    except Exception as e:
+        return ApiResponse(success=False, message=str(e))
+
 
 @router.get("/{match_id}", response_model=ApiResponse)
 async def get_prediction(match_id: int, db: AsyncSession = Depends(get_db)):
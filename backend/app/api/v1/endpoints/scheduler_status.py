@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.endpoints.admin import get_current_superuser
+from app.core.config import settings
+from app.core.leader import scheduler_leader
+from app.core.scheduler import scheduler
+from app.db.database import engine, get_db
+from app.db.models import User
+from app.services.job_runs import get_last_runs, serialize_run
+from app.schemas.schemas import ApiResponse
+
+router = APIRouter()
+
+
+@router.get("/status", response_model=ApiResponse)
+async def get_scheduler_status(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_superuser)
+):
+    """Which process holds scheduler leadership, this process's jobs,
+    and the last recorded run of every job (from any process)
+    """
+    leader = None
+    if settings.SCHEDULER_LEADER_ELECTION:
+        async with engine.connect() as conn:
+            leader = await scheduler_leader.current_leader(conn)
+    
+    jobs = [
+        {
+            "id": job.id,
+            "name": job.name,
+            "nextRunTime": job.next_run_time.isoformat() if job.next_run_time else None,
+        }
+        for job in scheduler.get_jobs()
+    ] if scheduler.running else []
+    last_runs = await get_last_runs(db)
+    
+    return ApiResponse(
+        success=True,
+        data={
+            "enabled": settings.ENABLE_SCHEDULER,
+            "leaderElection": settings.SCHEDULER_LEADER_ELECTION,
+            "leader": leader,
+            "thisProcess": {
+                "identity": scheduler_leader.identity,
+                "isLeader": scheduler_leader.is_leader,
+                "electedAt": scheduler_leader.elected_at.isoformat() if scheduler_leader.elected_at else None,
+                "schedulerRunning": scheduler.running,
+            },
+            "jobs": jobs,
+            "lastRuns": {name: serialize_run(run) for name, run in last_runs.items()},
+        }
+    )
@@ -3,15 +3,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_, and_
 from datetime import datetime
 
-from app.db.database import get_db
-from app.db.models import Team, TeamStats, Match
+from app.db.database import get_read_db
+from app.db.models import Team, TeamStats
 from app.schemas.schemas import ApiResponse
+from app.services.match_archive import matches_history
 
 router = APIRouter()
 
 
 @router.get("/{team_id}", response_model=ApiResponse)
-async def get_team_by_id(team_id: int, db: AsyncSession = Depends(get_db)):
+async def get_team_by_id(team_id: int, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(Team).where(Team.id == team_id))
     team = result.scalar_one_or_none()
     
@@ -32,7 +33,7 @@ async def get_team_by_id(team_id: int, db: AsyncSession = Depends(get_db)):
 @router.get("/search", response_model=ApiResponse)
 async def search_teams(
     q: str = Query(..., min_length=2),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     query = select(Team).where(Team.name.ilike(f"%{q}%"))
     result = await db.execute(query)
@@ -53,7 +54,7 @@ async def search_teams(
 
 
 @router.get("/{team_id}/stats", response_model=ApiResponse)
-async def get_team_stats(team_id: int, db: AsyncSession = Depends(get_db)):
+async def get_team_stats(team_id: int, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(
         select(TeamStats)
         .where(TeamStats.team_id == team_id)
@@ -84,27 +85,29 @@ async def get_team_stats(team_id: int, db: AsyncSession = Depends(get_db)):
 async def get_team_recent_matches(
     team_id: int,
     limit: int = Query(5, ge=1, le=20),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get recent finished matches for a team"""
     # Query matches where team is either home or away, and status is FINISHED
+    # (archived seasons included, for teams with few recent matches)
+    h = matches_history.c
     query = (
-        select(Match)
+        select(matches_history)
         .where(
             and_(
                 or_(
-                    Match.home_team_id == team_id,
-                    Match.away_team_id == team_id
+                    h.home_team_id == team_id,
+                    h.away_team_id == team_id
                 ),
-                Match.status == "FINISHED"
+                h.status == "FINISHED"
             )
         )
-        .order_by(Match.match_date.desc())
+        .order_by(h.match_date.desc())
         .limit(limit)
     )
     
     result = await db.execute(query)
-    matches = result.scalars().all()
+    matches = result.all()
     
     matches_data = []
     for match in matches:
@@ -10,6 +10,8 @@ from sqlalchemy import select
 
 from app.db.database import AsyncSessionLocal
 from app.services.data_sync import DataSyncService
+from app.services.api_budget import with_api_priority
+from app.services.job_runs import tracked_job, update_job_progress
 
 
 async def sync_leagues():
@@ -44,6 +46,26 @@ async def update_live():
         print(f"✅ Updated {count} live matches")
 
 
+async def refresh_team_stats(full: bool = False):
+    """Recompute TeamStats (all teams, or only teams with newly finished matches)"""
+    async with AsyncSessionLocal() as db:
+        service = DataSyncService(db)
+        if full:
+            count = await service.refresh_team_stats()
+        else:
+            count = await service.refresh_recent_team_stats()
+        print(f"✅ Refreshed stats for {count} teams")
+
+
+async def archive_matches():
+    """Move finished matches from old seasons into the archive"""
+    from app.services.match_archive import MatchArchiveService
+    async with AsyncSessionLocal() as db:
+        service = MatchArchiveService(db)
+        count = await service.archive_old_seasons()
+        print(f"✅ Archived {count} matches")
+
+
 async def seed_data():
     """Seed initial data for testing"""
     print("🌱 Seeding initial data...")
@@ -74,6 +96,8 @@ async def seed_past_matches(league_id: int, days_back: int = 30):
 
 
 
+@tracked_job("seed", trigger="cli")
+@with_api_priority("seed")
 async def seed_full():
     """
     Seed/Sync all data for ALL leagues in DB:
@@ -91,31 +115,45 @@ async def seed_full():
         from app.db.models import League
         result = await db.execute(select(League))
         leagues = result.scalars().all()
-        league_ids = [(league.external_id, league.name) for league in leagues]
+        league_ids = [league.external_id for league in leagues]
     
     print(f"📋 Found {len(league_ids)} leagues to process...")
     
-    # Process each league with fresh connection
-    for league_id, league_name in league_ids:
-        print(f"\n⚽ Processing {league_name} (ID: {league_id})...")
-        try:
-            # Sync past 14 days
-            await seed_past_matches(league_id, days_back=14)
-            
-            # Sync upcoming 14 days
-            await sync_matches(league_id, days=14)
-            
-            # Sync standings
-            await sync_standings(league_id)
-            
-        except Exception as e:
-            print(f"⚠️  Error processing league {league_id}: {e}")
-        
-        # Rate limit: Free tier allows 10 req/min (1 req every 6s)
-        # We make 3 requests per league (3 * 6s = 18s required)
-        # Adding extra buffer to be safe
-        print("⏳ Waiting 20s to respect rate limit (Free tier: 10 req/min)...")
-        await asyncio.sleep(20)
+    # Batched match windows + per-league standings; fetches overlap DB writes.
+    # No sleep needed: every request goes through the shared token bucket
+    # (rate_limiter.football_data_limiter), which enforces 10 req/min.
+    from datetime import date, timedelta
+    from app.services.seed_pipeline import SeedPipeline, SeedCheckpointStore, plan_seed_units, plan_key
+    
+    today = date.today()
+    plan = {
+        "date_from": (today - timedelta(days=14)).strftime("%Y-%m-%d"),
+        "date_to": (today + timedelta(days=14)).strftime("%Y-%m-%d"),
+        "league_ids": league_ids,
+    }
+    units = plan_seed_units(plan["league_ids"], plan["date_from"], plan["date_to"])
+    # Stored on the run so resume_interrupted_seeds_job can pick it up if the CLI dies
+    await update_job_progress(plan=plan, planKey=plan_key(units))
+    
+    async def on_progress(unit, done, total):
+        print(f"  ⚽ {unit.key} ({done}/{total})")
+        # Heartbeat: without it the run is marked stale and failed after 10 minutes
+        await update_job_progress(
+            message=f"Synced {unit.kind} ({done}/{total})",
+            progress=int((done / total) * 100),
+            total=total,
+        )
+    
+    # Checkpointed: re-running after a crash skips the units already ingested
+    seed_result = await SeedPipeline(on_progress=on_progress, checkpoints=SeedCheckpointStore()).run(units)
+    await update_job_progress(resumedUnits=seed_result.resumed)
+    if seed_result.resumed:
+        print(f"⏩ Resumed: {seed_result.resumed} units were already done")
+    print(f"📊 {seed_result.matches} matches, {seed_result.standings} standings in {seed_result.elapsed:.0f}s")
+    for key in seed_result.failed:
+        print(f"⚠️  Failed: {key}")
+    if seed_result.deferred:
+        print(f"⏭️  API budget exhausted, {len(seed_result.deferred)} units deferred")
         
     print("\n✅ Full seed completed successfully!")
 
@@ -128,6 +166,8 @@ def main():
         print("  sync-matches <league_id> [days]   - Sync upcoming matches")
         print("  sync-standings <league_id>        - Sync standings/table")
         print("  update-live                       - Update live match scores")
+        print("  refresh-team-stats [--full]       - Recompute team stats (incremental by default)")
+        print("  archive-matches                   - Archive finished matches from old seasons")
         print("  seed                              - Seed initial data")
         print("  seed-past-matches <league_id> [days_back] - Seed FINISHED matches")
         print("  seed-full                         - Sync all data (-14/+14 days) for 5 major leagues")
@@ -155,6 +195,10 @@ def main():
         asyncio.run(sync_standings(league_id))
     elif command == "update-live":
         asyncio.run(update_live())
+    elif command == "refresh-team-stats":
+        asyncio.run(refresh_team_stats(full="--full" in sys.argv[2:]))
+    elif command == "archive-matches":
+        asyncio.run(archive_matches())
     elif command == "seed":
         asyncio.run(seed_data())
     elif command == "seed-past-matches":
@@ -7,6 +7,10 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     DATABASE_URL_ASYNC: str
+    # Optional read-only replica for GET endpoints (falls back to primary if empty)
+    DATABASE_URL_READ_ASYNC: str = ""
+    # Statements slower than this are kept in the slow-query log
+    SLOW_QUERY_MS: int = 500
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -16,20 +20,73 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 43200  # 30 days
     
+    # Match/standings source for the sync pipeline: "football-data" or "api-football"
+    FOOTBALL_API_PROVIDER: str = "football-data"
+    
     # Football-Data.org API
     FOOTBALL_API_KEY: str
     FOOTBALL_API_BASE_URL: str = "https://api.football-data.org/v4"
+    FOOTBALL_API_RATE_LIMIT: int = 10  # Requests per minute (free tier)
     
     # API-Football.com (100 req/day free)
     API_FOOTBALL_KEY: str = ""
     API_FOOTBALL_ENABLED: bool = False
+    API_FOOTBALL_DAILY_LIMIT: int = 100
+    API_FOOTBALL_RATE_LIMIT: int = 10  # Requests per minute (free tier)
+    API_FOOTBALL_NEGATIVE_CACHE_TTL: int = 900  # Seconds an empty/failed lookup is not retried
+    
+    # Pooled provider HTTP clients use HTTP/2 when the optional `h2` package is installed
+    HTTP2_ENABLED: bool = True
+    # Provider response cache (competitions, standings, teams):
+    # "auto" = Redis when connected else disk, "redis", "disk" or "off"
+    HTTP_CACHE_BACKEND: str = "auto"
+    HTTP_CACHE_DIR: str = ""  # Disk backend directory (default: system temp dir)
+    HTTP_CACHE_STANDINGS_TTL: int = 600  # Seconds a standings response is served without revalidation
+    # Provider retries (timeouts, 429, 5xx) and per-provider circuit breaker
+    PROVIDER_RETRY_ATTEMPTS: int = 3
+    PROVIDER_RETRY_BASE_DELAY: float = 1.0  # Seconds, doubled per retry (with jitter)
+    PROVIDER_RETRY_MAX_DELAY: float = 65.0  # Longer Retry-After hints give up instead of waiting
+    PROVIDER_CIRCUIT_FAILURES: int = 5  # Consecutive failures before failing fast
+    PROVIDER_CIRCUIT_RESET_SECONDS: float = 60.0
+    
+    # Shared API budget (api_usage table); 0 = no daily cap for that provider
+    FOOTBALL_API_DAILY_LIMIT: int = 0
+    # Share of each provider's daily/minute quota a priority may consume
+    # (live > upcoming > standings > seed), so live updates keep headroom
+    API_BUDGET_SHARE_UPCOMING: float = 0.9
+    API_BUDGET_SHARE_STANDINGS: float = 0.75
+    API_BUDGET_SHARE_SEED: float = 0.6
+    
+    # Incremental nightly sync: beyond the new edge days, re-fetch only this
+    # range around today (results being confirmed, imminent kickoff changes)
+    SYNC_RECENT_DAYS_BACK: int = 2
+    SYNC_RECENT_DAYS_AHEAD: int = 1
+    
+    # Seasons kept in the hot matches table; older finished matches are archived
+    MATCH_ARCHIVE_KEEP_SEASONS: int = 2
     
     # ML Model
     MODEL_PATH: str = "./models/prediction_model_v2.pkl"
     ENABLE_ML_PREDICTIONS: bool = True
+    # Elo ratings for inference: "file" (elo_ratings.json, falls back to the
+    # database when missing) or "db" (team_stats.elo_rating)
+    ELO_SOURCE: str = "file"
+    ELO_RATINGS_PATH: str = ""  # Empty: app/ml/elo_ratings.json
+    ELO_RELOAD_CHECK_SECONDS: float = 5.0
     
     # Background Scheduler
     ENABLE_SCHEDULER: bool = True  # Set to False to disable auto-updates
+    # "inline": API processes run the scheduler (subject to leader election)
+    # "worker": sync runs only in `python -m app.worker`; the API never runs sync code
+    SYNC_MODE: str = "inline"
+    # Only the worker holding a Postgres advisory lock runs the scheduler
+    SCHEDULER_LEADER_ELECTION: bool = True
+    SCHEDULER_LEADER_RETRY_SECONDS: int = 15
+    # "adaptive": poll leagues only around stored kickoff times
+    # "interval": poll every active league every 5 minutes (legacy)
+    LIVE_POLLING_MODE: str = "adaptive"
+    LIVE_POLL_SECONDS: int = 60            # While matches are in play
+    LIVE_POLL_COOLDOWN_SECONDS: int = 300  # After expected full-time, until FINISHED
     
     # CORS
     CORS_ORIGINS: List[str] = [
@@ -44,7 +101,7 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
 
-    @field_validator("DATABASE_URL_ASYNC")
+    @field_validator("DATABASE_URL_ASYNC", "DATABASE_URL_READ_ASYNC")
     @classmethod
     def assemble_async_db_connection(cls, v: str | None) -> str:
         if v:
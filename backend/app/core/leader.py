@@ -0,0 +1,151 @@
+"""
+Scheduler leader election via a Postgres advisory lock
+
+Every API worker runs the lifespan hook, but only the worker holding the
+session-level advisory lock runs the APScheduler jobs. The lock lives on a
+dedicated connection: if the leader process dies its connection closes, the
+lock is released, and another worker picks it up on its next attempt.
+"""
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.db.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary app-wide key for pg_try_advisory_lock (fits in 32 bits -> pg_locks.objid)
+SCHEDULER_LOCK_KEY = 72_700_101
+
+Callback = Callable[[], Union[None, Awaitable[None]]]
+
+
+async def _call(callback: Optional[Callback]):
+    if callback is None:
+        return
+    result = callback()
+    if asyncio.iscoroutine(result):
+        await result
+
+
+class LeaderElector:
+    """Holds (or keeps trying to take) the scheduler advisory lock"""
+
+    def __init__(
+        self,
+        lock_key: int = SCHEDULER_LOCK_KEY,
+        on_elected: Optional[Callback] = None,
+        on_demoted: Optional[Callback] = None,
+        retry_seconds: int = 15,
+    ):
+        self.lock_key = lock_key
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.retry_seconds = retry_seconds
+        self.identity = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+        self.elected_at: Optional[datetime] = None
+        self._conn: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _try_acquire(self) -> bool:
+        if self._conn is None:
+            conn = await engine.connect()
+            # Autocommit so the heartbeat never leaves the session idle in transaction
+            self._conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await self._conn.execute(
+                text("SELECT set_config('application_name', :name, false)"),
+                {"name": f"scoreflow-scheduler:{self.identity}"[:63]},
+            )
+        return bool(await self._conn.scalar(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key}
+        ))
+
+    async def _heartbeat(self):
+        await self._conn.execute(text("SELECT 1"))
+
+    async def _close_connection(self):
+        if self._conn is not None:
+            try:
+                await self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    async def _demote(self):
+        if self.is_leader:
+            self.is_leader = False
+            self.elected_at = None
+            logger.warning(f"👑 Scheduler leadership lost by {self.identity}")
+            await _call(self.on_demoted)
+
+    async def _run(self):
+        while True:
+            try:
+                if self.is_leader:
+                    await self._heartbeat()
+                elif await self._try_acquire():
+                    self.is_leader = True
+                    self.elected_at = datetime.utcnow()
+                    logger.info(f"👑 Scheduler leadership acquired by {self.identity}")
+                    await _call(self.on_elected)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Leader election error: {e}")
+                await self._demote()
+                await self._close_connection()
+            await asyncio.sleep(self.retry_seconds)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._demote()
+        if self._conn is not None:
+            try:
+                await self._conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key}
+                )
+            except Exception:
+                pass
+        await self._close_connection()
+
+    async def current_leader(self, conn: AsyncConnection) -> Optional[Dict]:
+        """Which backend currently holds the lock (readable from any process)"""
+        result = await conn.execute(
+            text(
+                "SELECT a.pid, a.application_name, a.client_addr, a.backend_start "
+                "FROM pg_locks l JOIN pg_stat_activity a ON a.pid = l.pid "
+                "WHERE l.locktype = 'advisory' AND l.classid = 0 "
+                "AND l.objid = :key AND l.granted"
+            ),
+            {"key": self.lock_key},
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return {
+            "pid": row.pid,
+            "holder": row.application_name.replace("scoreflow-scheduler:", "", 1),
+            "clientAddr": str(row.client_addr) if row.client_addr else None,
+            "connectedAt": row.backend_start.isoformat() if row.backend_start else None,
+        }
+
+
+scheduler_leader = LeaderElector(retry_seconds=settings.SCHEDULER_LEADER_RETRY_SECONDS)
@@ -9,31 +9,90 @@ from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime, date, timedelta
 import logging
 
+from app.core.config import settings
 from app.db.database import AsyncSessionLocal
 from app.services.data_sync import DataSyncService
+from app.services.api_budget import api_budget, api_priority, with_api_priority, ApiBudgetExceeded, FOOTBALL_DATA
+from app.services.job_runs import tracked_job, track_job_run, record_job_error
+from app.services.resilience import CircuitOpen
 
 logger = logging.getLogger(__name__)
 
 scheduler = AsyncIOScheduler()
 
 
+async def _sync_leagues_batched(service: DataSyncService, leagues: dict, date_from: str, date_to: str) -> int:
+    """Sync a date range for {external_id: name} leagues with batched /matches calls
+    If the batched sync fails, leagues it had not committed yet are retried with
+    one request per league.
+    """
+    counts = {}
+    try:
+        await service.sync_matches_batch(list(leagues), date_from, date_to, counts=counts)
+        for league_id, name in leagues.items():
+            if league_id in counts:
+                logger.info(f"  ✅ {name}: {counts[league_id]} matches")
+            else:
+                # The provider could not fetch it; its cursor was left as is
+                logger.error(f"  ❌ {name}: matches not fetched")
+                record_job_error(f"{name}: matches not fetched")
+        return sum(counts.values())
+    except (ApiBudgetExceeded, CircuitOpen):
+        # Per-league requests would spend more of the same budget / fail the same way
+        raise
+    except Exception as e:
+        await service.db.rollback()
+        logger.error(
+            f"  ⚠️  Batched sync failed ({e}) after {len(counts)}/{len(leagues)} leagues, "
+            f"falling back to per-league requests for the rest"
+        )
+    
+    total = sum(counts.values())
+    for league_id, name in leagues.items():
+        if league_id in counts:
+            continue
+        try:
+            count = await service.sync_matches_date_range(
+                league_id=league_id,
+                date_from=date_from,
+                date_to=date_to
+            )
+            total += count
+            logger.info(f"  ✅ {name}: {count} matches")
+        except (ApiBudgetExceeded, CircuitOpen) as e:
+            logger.warning(f"  ⏭️  Remaining leagues dropped: {e}")
+            break
+        except Exception as e:
+            await service.db.rollback()
+            logger.error(f"  ❌ {name} failed: {e}")
+            record_job_error(f"{name}: {e}")
+    return total
+
+
+@tracked_job("seed_monthly_matches")
+@with_api_priority("seed")
 async def seed_monthly_matches_job():
     """Job to seed 1 month of matches (2 weeks before + 2 weeks after today)
-    Runs daily at midnight to ensure fresh data
+    Runs daily at midnight to ensure fresh data. Incremental: per-league sync
+    cursors limit it to new edge days plus the recent range around today.
     """
     try:
         logger.info("🌱 Running scheduled job: seed_monthly_matches")
+        
+        # Calculate date range: 14 days before + 14 days after = 28 days
+        today = date.today()
+        date_from = (today - timedelta(days=14)).strftime("%Y-%m-%d")
+        date_to = (today + timedelta(days=14)).strftime("%Y-%m-%d")
+        
+        logger.info(f"📅 Seeding matches from {date_from} to {date_to}")
+        
+        # Only the edge days never fetched plus a short recent range, per the
+        # league sync cursors; batched windows overlap fetching with ingesting
+        from app.services.seed_pipeline import SeedPipeline
+        from app.services.sync_cursors import plan_incremental_units
+        
+        # Get ALL leagues from DB
         async with AsyncSessionLocal() as db:
-            service = DataSyncService(db)
-            
-            # Calculate date range: 14 days before + 14 days after = 28 days
-            today = date.today()
-            date_from = (today - timedelta(days=14)).strftime("%Y-%m-%d")
-            date_to = (today + timedelta(days=14)).strftime("%Y-%m-%d")
-            
-            logger.info(f"📅 Seeding matches from {date_from} to {date_to}")
-            
-            # Get ALL leagues from DB
             from sqlalchemy import select
             from app.db.models import League
             result = await db.execute(select(League))
@@ -41,29 +100,43 @@ async def seed_monthly_matches_job():
             
             logger.info(f"📋 Processing {len(leagues)} leagues...")
             
-            total_synced = 0
-            for league in leagues:
-                try:
-                    count = await service.sync_matches_date_range(
-                        league_id=league.external_id,
-                        date_from=date_from,
-                        date_to=date_to
-                    )
-                    total_synced += count
-                    logger.info(f"  ✅ {league.name}: {count} matches")
-                    
-                    # Rate limit: 10 req/min -> 1 req every 6s (now 20s for safety)
-                    import asyncio
-                    await asyncio.sleep(20)
-                    
-                except Exception as e:
-                    logger.error(f"  ❌ {league.name} failed: {e}")
-            
-            logger.info(f"✅ Total seeded: {total_synced} matches for 1 month")
+            units = await plan_incremental_units(
+                db,
+                [league.external_id for league in leagues],
+                date_from,
+                date_to,
+                recent_days_back=settings.SYNC_RECENT_DAYS_BACK,
+                recent_days_ahead=settings.SYNC_RECENT_DAYS_AHEAD,
+                today=today
+            )
+        logger.info(f"🧭 Incremental plan: {len(units)} requests instead of a full window refetch")
+        
+        if not await api_budget.can_spend(FOOTBALL_DATA, len(units)):
+            logger.warning(f"⏭️  Monthly seed dropped: API budget too low for {len(units)} requests")
+            return
+        seed_result = await SeedPipeline().run(units)
+        matches = seed_result.matches
+        
+        if seed_result.failed:
+            # A batched window can fail on one league's data; retry each league
+            # on its own so the others are not left until next month
+            from app.services.seed_pipeline import split_per_league
+            by_key = {unit.key: unit for unit in units}
+            retry_units = split_per_league([by_key[key] for key in seed_result.failed if key in by_key])
+            logger.warning(f"🔁 Retrying {len(seed_result.failed)} failed units as {len(retry_units)} per-league requests")
+            retry_result = await SeedPipeline().run(retry_units)
+            matches += retry_result.matches
+            if retry_result.failed:
+                logger.error(f"❌ Still failing per league: {', '.join(retry_result.failed)}")
+        
+        logger.info(f"✅ Total seeded: {matches} matches for 1 month")
     except Exception as e:
         logger.error(f"❌ Error seeding monthly matches: {e}")
+        record_job_error(e)
 
 
+@tracked_job("sync_realtime_scores")
+@with_api_priority("live")
 async def sync_realtime_scores_job():
     """Job to sync real-time scores for matches within the monthly window
     Runs every 5 minutes to keep scores up-to-date
@@ -96,28 +169,66 @@ async def sync_realtime_scores_job():
             
             logger.info(f"🎯 Syncing {len(active_leagues)} active leagues: {active_leagues}")
             
-            total_updated = 0
-            for league_id in active_leagues:
-                try:
-                    count = await service.sync_matches_date_range(
-                        league_id=league_id,
-                        date_from=date_from,
-                        date_to=date_to
-                    )
-                    total_updated += count
-                    
-                    # Rate limit: Sleep 20s between leagues to avoid 429
-                    import asyncio
-                    await asyncio.sleep(20)
-                    
-                except Exception as e:
-                    logger.error(f"  ❌ League {league_id} failed: {e}")
+            total_updated = await _sync_leagues_batched(
+                service,
+                {league_id: f"League {league_id}" for league_id in active_leagues},
+                date_from,
+                date_to
+            )
             
             logger.info(f"✅ Updated {total_updated} matches (real-time)")
+            
+            # Recompute stats only for teams whose matches finished since the last refresh
+            refreshed = await service.refresh_recent_team_stats()
+            logger.info(f"📊 Refreshed stats for {refreshed} teams")
     except Exception as e:
         logger.error(f"❌ Error syncing real-time scores: {e}")
+        record_job_error(e)
+
+
+async def poll_live_leagues_job():
+    """Job to poll leagues with matches in play, driven by stored kickoff times
+    Runs every LIVE_POLL_SECONDS but only calls the API for leagues that are due
+    """
+    from app.services.live_polling import live_polling_planner
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            plans = await live_polling_planner.build_timetable(db)
+            due = live_polling_planner.due(plans)
+            if not due:
+                return
+            
+            # Only polls that actually call the API are recorded in job_runs
+            async with track_job_run("poll_live_leagues"), api_priority("live"):
+                logger.info(f"⚽ Live polling {len(due)}/{len(plans)} leagues: "
+                            f"{[(p.name, p.in_play) for p in due]}")
+                service = DataSyncService(db)
+                
+                # One batched request covers every due league
+                date_from = min(plan.date_range()[0] for plan in due)
+                date_to = max(plan.date_range()[1] for plan in due)
+                total_updated = await _sync_leagues_batched(
+                    service,
+                    {plan.league_external_id: plan.name for plan in due},
+                    date_from,
+                    date_to
+                )
+                for plan in due:
+                    live_polling_planner.mark_polled(plan.league_external_id)
+                awaiting_results = any(plan.awaiting_result > 0 for plan in due)
+                
+                logger.info(f"✅ Updated {total_updated} matches (live)")
+                
+                if awaiting_results:
+                    refreshed = await service.refresh_recent_team_stats()
+                    logger.info(f"📊 Refreshed stats for {refreshed} teams")
+    except Exception as e:
+        logger.error(f"❌ Error polling live leagues: {e}")
 
 
+@tracked_job("sync_today_matches")
+@with_api_priority("upcoming")
 async def sync_today_matches_job():
     """Job to sync today's matches for ALL leagues"""
     try:
@@ -137,19 +248,21 @@ async def sync_today_matches_job():
                     count = await service.sync_matches(league.external_id, days_ahead=1)
                     total_synced += count
                     logger.info(f"  ✅ {league.name}: {count} matches")
-                    
-                    # Rate limit
-                    import asyncio
-                    await asyncio.sleep(20)
-                    
+                except (ApiBudgetExceeded, CircuitOpen) as e:
+                    logger.warning(f"  ⏭️  Remaining leagues dropped: {e}")
+                    break
                 except Exception as e:
                     logger.error(f"  ❌ {league.name} failed: {e}")
+                    record_job_error(f"{league.name}: {e}")
             
             logger.info(f"✅ Total synced: {total_synced} matches")
     except Exception as e:
         logger.error(f"❌ Error syncing today's matches: {e}")
+        record_job_error(e)
 
 
+@tracked_job("sync_standings")
+@with_api_priority("standings")
 async def sync_standings_job():
     """Job to sync league standings/tables"""
     try:
@@ -163,21 +276,27 @@ async def sync_standings_job():
             result = await db.execute(select(League))
             leagues = result.scalars().all()
             
+            if not await api_budget.can_spend(FOOTBALL_DATA, len(leagues)):
+                logger.warning(f"⏭️  Standings sync dropped: API budget too low for {len(leagues)} requests")
+                return
+            
             for league in leagues:
                 try:
                     count = await service.sync_standings(league.external_id)
                     logger.info(f"  ✅ {league.name}: {count} teams")
-                    
-                    # Rate limit
-                    import asyncio
-                    await asyncio.sleep(20)
-                    
+                except (ApiBudgetExceeded, CircuitOpen) as e:
+                    logger.warning(f"  ⏭️  Remaining leagues dropped: {e}")
+                    break
                 except Exception as e:
                     logger.error(f"  ❌ {league.name} failed: {e}")
+                    record_job_error(f"{league.name}: {e}")
     except Exception as e:
         logger.error(f"❌ Error syncing standings: {e}")
+        record_job_error(e)
 
 
+@tracked_job("sync_upcoming_matches")
+@with_api_priority("upcoming")
 async def sync_upcoming_matches_job():
     """Job to sync upcoming matches (next 7 days)"""
     try:
@@ -196,19 +315,20 @@ async def sync_upcoming_matches_job():
                 try:
                     count = await service.sync_matches(league.external_id, days_ahead=7)
                     total_synced += count
-                    
-                    # Rate limit
-                    import asyncio
-                    await asyncio.sleep(20)
-                    
+                except (ApiBudgetExceeded, CircuitOpen) as e:
+                    logger.warning(f"  ⏭️  Remaining leagues dropped: {e}")
+                    break
                 except Exception as e:
                     logger.error(f"  ❌ {league.name} failed: {e}")
+                    record_job_error(f"{league.name}: {e}")
             
             logger.info(f"✅ Total synced: {total_synced} upcoming matches")
     except Exception as e:
         logger.error(f"❌ Error syncing upcoming matches: {e}")
+        record_job_error(e)
 
 
+@tracked_job("sync_news")
 async def sync_news_job():
     """Job to fetch latest football news from RSS feeds"""
     try:
@@ -222,6 +342,59 @@ async def sync_news_job():
             
     except Exception as e:
         logger.error(f"❌ Error syncing news: {e}")
+        record_job_error(e)
+
+
+@tracked_job("archive_matches")
+async def archive_matches_job():
+    """Job to move finished matches from old seasons into the partitioned archive"""
+    try:
+        logger.info("🗄️  Running scheduled job: archive_matches")
+        async with AsyncSessionLocal() as db:
+            from app.services.match_archive import MatchArchiveService
+            service = MatchArchiveService(db)
+            
+            count = await service.archive_old_seasons()
+            logger.info(f"✅ Archived {count} matches")
+    except Exception as e:
+        logger.error(f"❌ Error archiving matches: {e}")
+        record_job_error(e)
+
+
+async def run_queued_seeds_job():
+    """Job to run seeds queued through POST /admin/seed (SYNC_MODE=worker)"""
+    from app.services.job_runs import claim_queued_run
+    
+    try:
+        run_id = await claim_queued_run("seed")
+        if run_id is None:
+            return
+        
+        logger.info(f"🌱 Running queued seed (run {run_id})")
+        from app.api.v1.endpoints.admin import run_seed_process
+        await run_seed_process(run_id=run_id)
+    except Exception as e:
+        logger.error(f"❌ Error running queued seed: {e}")
+
+
+async def resume_interrupted_seeds_job():
+    """Job to resume seeds whose worker died (no heartbeat for 10 minutes)
+    Checkpointed units are skipped, so only the unfinished part is fetched again.
+    """
+    from app.services.job_runs import fail_stale_runs
+    
+    try:
+        interrupted = await fail_stale_runs("seed", timedelta(minutes=10))
+        resumable = [run for run in interrupted if (run.details or {}).get("plan")]
+        if not resumable:
+            return
+        
+        run = max(resumable, key=lambda r: r.id)
+        logger.warning(f"🔁 Resuming interrupted seed (run {run.id})")
+        from app.api.v1.endpoints.admin import run_seed_process
+        await run_seed_process(trigger="resume", plan=run.details["plan"])
+    except Exception as e:
+        logger.error(f"❌ Error resuming interrupted seeds: {e}")
 
 
 def start_scheduler():
@@ -236,14 +409,24 @@ def start_scheduler():
         replace_existing=True
     )
     
-    # Sync real-time scores every 5 minutes (today + tomorrow)
-    scheduler.add_job(
-        sync_realtime_scores_job,
-        trigger=IntervalTrigger(minutes=5),
-        id="sync_realtime_scores",
-        name="Sync real-time scores",
-        replace_existing=True
-    )
+    if settings.LIVE_POLLING_MODE == "adaptive":
+        # Poll leagues only between kickoff and full-time + 30 min
+        scheduler.add_job(
+            poll_live_leagues_job,
+            trigger=IntervalTrigger(seconds=settings.LIVE_POLL_SECONDS),
+            id="poll_live_leagues",
+            name="Poll live leagues (kickoff-aware)",
+            replace_existing=True
+        )
+    else:
+        # Sync real-time scores every 5 minutes (today + tomorrow)
+        scheduler.add_job(
+            sync_realtime_scores_job,
+            trigger=IntervalTrigger(minutes=5),
+            id="sync_realtime_scores",
+            name="Sync real-time scores",
+            replace_existing=True
+        )
     
     # Sync standings twice daily (6 AM and 6 PM)
     scheduler.add_job(
@@ -271,16 +454,53 @@ def start_scheduler():
         replace_existing=True
     )
 
+    # Archive old seasons monthly (1st of the month, 3 AM)
+    scheduler.add_job(
+        archive_matches_job,
+        trigger=CronTrigger(day="1", hour="3", minute="0"),
+        id="archive_matches",
+        name="Archive old season matches",
+        replace_existing=True
+    )
+
+    # Resume seeds interrupted by a crash or restart
+    scheduler.add_job(
+        resume_interrupted_seeds_job,
+        trigger=IntervalTrigger(minutes=5),
+        id="resume_interrupted_seeds",
+        name="Resume interrupted seeds",
+        replace_existing=True
+    )
+
+    if settings.SYNC_MODE == "worker":
+        # Admin-triggered seeds are queued in job_runs and picked up here
+        scheduler.add_job(
+            run_queued_seeds_job,
+            trigger=IntervalTrigger(seconds=15),
+            id="run_queued_seeds",
+            name="Run queued seeds",
+            replace_existing=True
+        )
+
     scheduler.start()
     logger.info("📅 Scheduler started successfully")
     logger.info("  - Monthly seed (2 weeks ± today): Daily at midnight")
-    logger.info("  - Real-time scores: Every 5 minutes")
+    if settings.LIVE_POLLING_MODE == "adaptive":
+        logger.info(f"  - Live scores: Kickoff-aware, every {settings.LIVE_POLL_SECONDS}s while in play")
+    else:
+        logger.info("  - Real-time scores: Every 5 minutes")
     logger.info("  - Standings: Twice daily (6 AM, 6 PM)")
     logger.info("  - Upcoming matches: Every 6 hours")
     logger.info("  - News: Every 30 minutes")
+    logger.info("  - Match archive: Monthly (1st, 3 AM)")
+    logger.info("  - Interrupted seeds: Resumed from checkpoints (checked every 5 minutes)")
+    if settings.SYNC_MODE == "worker":
+        logger.info("  - Queued seeds: Checked every 15 seconds")
 
 
 def stop_scheduler():
     """Stop the background scheduler"""
-    scheduler.shutdown()
+    if not scheduler.running:
+        return
+    scheduler.shutdown(wait=False)
     logger.info("📅 Scheduler stopped")
@@ -1,12 +1,17 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
+from sqlalchemy import text
 
 from app.core.config import settings
+from app.db.instrumentation import InstrumentedAsyncQueuePool, instrument_engine
 
+import logging
 import ssl
 import os
 
+logger = logging.getLogger(__name__)
+
 # Determine if we need SSL (Render requires it)
 # Check for RENDER env var or if URL contains 'render'
 # Also check if database host contains 'render' (common in connection strings)
@@ -31,16 +36,26 @@ if use_ssl:
 else:
     print("🔓 SSL Context: Disabled")
 
-engine = create_async_engine(
-    settings.DATABASE_URL_ASYNC,
-    echo=False,
-    future=True,
-    pool_pre_ping=True,  # Check connection liveness before usingg
-    pool_size=40,  
-    pool_recycle=1800,      # Keep 10 connections open
-    max_overflow=40,     # Allow 20 more temporary connections
-    connect_args=connect_args
-)
+
+def _create_engine(url: str):
+    return instrument_engine(create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedAsyncQueuePool,  # Records checkout wait time
+        pool_pre_ping=True,  # Check connection liveness before usingg
+        pool_size=40,  
+        pool_recycle=1800,      # Keep 10 connections open
+        max_overflow=40,     # Allow 20 more temporary connections
+        connect_args=connect_args
+    ))
+
+
+engine = _create_engine(settings.DATABASE_URL_ASYNC)
+
+# Read-only engine for GET endpoints. Without a replica URL it is the primary
+# engine itself, so both session factories share one pool.
+read_engine = _create_engine(settings.DATABASE_URL_READ_ASYNC) if settings.DATABASE_URL_READ_ASYNC else engine
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -48,12 +63,58 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 
+async def check_read_engine() -> bool:
+    """Verify the read replica is reachable, falling back to the primary if not
+    Returns True when reads are served by a separate replica.
+    """
+    global read_engine, AsyncReadSessionLocal
+    if read_engine is engine:
+        return False
+    
+    try:
+        async with read_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.error(f"❌ Read replica unavailable, using primary for reads: {e}")
+        await read_engine.dispose()
+        read_engine = engine
+        AsyncReadSessionLocal = async_sessionmaker(
+            engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        return False
+
+
+async def dispose_engines():
+    """Dispose the primary engine and the read replica engine (if separate)"""
+    if read_engine is not engine:
+        await read_engine.dispose()
+    await engine.dispose()
+
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db():
+    """Session for read-only endpoints, bound to the replica when configured"""
+    async with AsyncReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
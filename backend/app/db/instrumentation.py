@@ -0,0 +1,190 @@
+"""
+Database instrumentation: pool checkout wait, statement latency,
+slow-query log and per-request query counts.
+Exposed through GET /api/v1/admin/metrics/db
+"""
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Mutable [count] per request; the list is shared with child tasks/greenlets
+# so increments made inside SQLAlchemy hooks are visible to the middleware.
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar("request_queries", default=None)
+
+# Route key for requests that matched no route (404s, scanners)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class DBMetrics:
+    """In-process database metrics (one instance per worker process)"""
+
+    def __init__(self, slow_query_ms: int = 500, max_slow_queries: int = 50, max_statements: int = 200):
+        self.slow_query_ms = slow_query_ms
+        self.max_statements = max_statements
+        self.slow_queries = deque(maxlen=max_slow_queries)
+        self.reset()
+
+    def reset(self):
+        """Clear all counters"""
+        self.started_at = datetime.utcnow()
+        self.checkouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.statements: Dict[str, Dict[str, float]] = {}
+        self.routes: Dict[str, Dict[str, float]] = {}
+        self.slow_queries.clear()
+
+    # --- Pool ---
+
+    def record_checkout(self, wait: float):
+        self.checkouts += 1
+        self.checkout_wait_total += wait
+        self.checkout_wait_max = max(self.checkout_wait_max, wait)
+
+    # --- Statements ---
+
+    def record_statement(self, statement: str, parameters: Any, duration: float):
+        counter = _request_queries.get()
+        if counter is not None:
+            counter[0] += 1
+
+        key = " ".join(statement.split())[:200]
+        stats = self.statements.get(key)
+        if stats is None:
+            if len(self.statements) >= self.max_statements:
+                # Drop the cheapest statement to keep memory bounded
+                cheapest = min(self.statements, key=lambda k: self.statements[k]["total"])
+                del self.statements[cheapest]
+            stats = self.statements[key] = {"count": 0, "total": 0.0, "max": 0.0}
+        stats["count"] += 1
+        stats["total"] += duration
+        stats["max"] = max(stats["max"], duration)
+
+        duration_ms = duration * 1000
+        if duration_ms >= self.slow_query_ms:
+            params = repr(parameters)
+            self.slow_queries.append({
+                "statement": statement,
+                "parameters": params[:500],
+                "durationMs": round(duration_ms, 2),
+                "at": datetime.utcnow().isoformat(),
+            })
+            logger.warning(f"🐢 Slow query ({duration_ms:.0f} ms): {key} params={params[:200]}")
+
+    # --- Requests ---
+
+    def start_request(self):
+        """Start counting queries for the current request; returns a reset token"""
+        return _request_queries.set([0])
+
+    def finish_request(self, route: str, token) -> int:
+        """Record the query count for a finished request"""
+        counter = _request_queries.get()
+        _request_queries.reset(token)
+        count = counter[0] if counter else 0
+
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = {"requests": 0, "queries": 0, "max": 0}
+        stats["requests"] += 1
+        stats["queries"] += count
+        stats["max"] = max(stats["max"], count)
+        return count
+
+    # --- Report ---
+
+    def snapshot(self, pools: Dict[str, Any], top: int = 20) -> Dict[str, Any]:
+        pool_data = {}
+        for name, pool in pools.items():
+            pool_data[name] = {
+                "size": pool.size(),
+                "checkedIn": pool.checkedin(),
+                "inUse": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+
+        statements = sorted(self.statements.items(), key=lambda item: item[1]["total"], reverse=True)[:top]
+        routes = sorted(
+            self.routes.items(),
+            key=lambda item: item[1]["queries"] / max(item[1]["requests"], 1),
+            reverse=True,
+        )
+
+        return {
+            "since": self.started_at.isoformat(),
+            "pools": pool_data,
+            "checkout": {
+                "count": self.checkouts,
+                "avgWaitMs": round(self.checkout_wait_total / max(self.checkouts, 1) * 1000, 3),
+                "maxWaitMs": round(self.checkout_wait_max * 1000, 3),
+            },
+            "statements": [
+                {
+                    "statement": key,
+                    "count": int(stats["count"]),
+                    "avgMs": round(stats["total"] / stats["count"] * 1000, 3),
+                    "maxMs": round(stats["max"] * 1000, 3),
+                    "totalMs": round(stats["total"] * 1000, 3),
+                }
+                for key, stats in statements
+            ],
+            "routes": [
+                {
+                    "route": route,
+                    "requests": int(stats["requests"]),
+                    "avgQueries": round(stats["queries"] / max(stats["requests"], 1), 2),
+                    "maxQueries": int(stats["max"]),
+                }
+                for route, stats in routes
+            ],
+            "slowQueryThresholdMs": self.slow_query_ms,
+            "slowQueries": list(self.slow_queries),
+        }
+
+
+db_metrics = DBMetrics(slow_query_ms=settings.SLOW_QUERY_MS)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_metrics.record_checkout(time.perf_counter() - start)
+
+
+def instrument_engine(engine):
+    """Attach statement timing hooks to an AsyncEngine"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        db_metrics.record_statement(statement, parameters, time.perf_counter() - starts.pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+    return engine
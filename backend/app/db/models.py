@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, JSON
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Float, JSON, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -46,8 +46,21 @@ class League(Base):
     external_id = Column(Integer, unique=True)
 
 
+# Statuses stored for matches in progress (see DataSyncService._map_status)
+LIVE_STATUSES = ["live", "LIVE", "IN_PLAY", "PAUSED"]
+# Predicate of the partial live index; queries must repeat it verbatim to use it
+LIVE_STATUS_FILTER = "status IN ({})".format(", ".join(f"'{status}'" for status in LIVE_STATUSES))
+
+
 class Match(Base):
     __tablename__ = "matches"
+    __table_args__ = (
+        # Team history lookups (FeatureEngineer): last N matches of a team
+        Index("ix_matches_home_team_date", "home_team_id", "match_date"),
+        Index("ix_matches_away_team_date", "away_team_id", "match_date"),
+        # Live count (admin stats): only the handful of live rows are indexed
+        Index("ix_matches_live_status", "status", postgresql_where=text(LIVE_STATUS_FILTER)),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     home_team_id = Column(Integer, ForeignKey("teams.id"))
@@ -67,6 +80,105 @@ class Match(Base):
     league = relationship("League")
 
 
+class MatchArchive(Base):
+    """Finished matches from past seasons, moved out of the hot `matches` table.
+    Range-partitioned by match_date, one partition per season (see MatchArchiveService).
+    """
+    __tablename__ = "match_archive"
+    __table_args__ = (
+        Index("ix_match_archive_home_team_id", "home_team_id"),
+        Index("ix_match_archive_away_team_id", "away_team_id"),
+        Index("ix_match_archive_external_id", "external_id"),
+        {"postgresql_partition_by": "RANGE (match_date)"},
+    )
+
+    # The partition key must be part of the primary key
+    id = Column(Integer, primary_key=True)
+    match_date = Column(DateTime, primary_key=True)
+    home_team_id = Column(Integer, ForeignKey("teams.id"))
+    away_team_id = Column(Integer, ForeignKey("teams.id"))
+    league_id = Column(Integer, ForeignKey("leagues.id"))
+    status = Column(String)
+    home_score = Column(Integer, nullable=True)
+    away_score = Column(Integer, nullable=True)
+    venue = Column(String)
+    round = Column(String)
+    external_id = Column(Integer)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class JobRun(Base):
+    """One execution of a scheduler job or seed (see app.services.job_runs)"""
+    __tablename__ = "job_runs"
+    __table_args__ = (
+        Index("ix_job_runs_job_name_started_at", "job_name", "started_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String, nullable=False)
+    trigger = Column(String, default="scheduler")  # scheduler, admin, cli, worker
+    status = Column(String, default="running", index=True)  # queued, running, success, failed
+    worker = Column(String)  # host:pid that executed the run
+    queued_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # Last progress write; stale = worker died
+    finished_at = Column(DateTime, nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+    api_requests = Column(Integer, default=0)
+    rows_inserted = Column(Integer, default=0)
+    rows_updated = Column(Integer, default=0)
+    rows_unchanged = Column(Integer, default=0)
+    error = Column(String, nullable=True)
+    details = Column(JSON)  # Progress and job-specific counters
+
+
+class SeedCheckpoint(Base):
+    """A seed unit (match window or league standings) that was fully ingested
+    Keyed by the seed plan, so a restarted seed skips units it already did.
+    """
+    __tablename__ = "seed_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("plan_key", "unit_key", name="uq_seed_checkpoints_unit"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    plan_key = Column(String, nullable=False, index=True)
+    unit_key = Column(String, nullable=False)
+    rows = Column(Integer, default=0)
+    job_run_id = Column(Integer, nullable=True)
+    completed_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SyncCursor(Base):
+    """What has already been fetched for a league (see app.services.sync_cursors)"""
+    __tablename__ = "sync_cursors"
+
+    id = Column(Integer, primary_key=True, index=True)
+    league_external_id = Column(Integer, unique=True, nullable=False)
+    # UTC match dates covered by previous /matches fetches
+    fetched_from = Column(Date, nullable=True)
+    fetched_to = Column(Date, nullable=True)
+    # Newest `lastUpdated` seen in those fetches
+    last_updated_seen = Column(DateTime, nullable=True)
+    # Newest `lastUpdated` per UTC match date: {"YYYY-MM-DD": ISO datetime}
+    day_watermarks = Column(JSON, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ApiUsage(Base):
+    """Requests spent per provider per day/minute (see app.services.api_budget)"""
+    __tablename__ = "api_usage"
+    __table_args__ = (
+        UniqueConstraint("provider", "period", "period_start", name="uq_api_usage_period"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    provider = Column(String, nullable=False)  # football-data, api-football
+    period = Column(String, nullable=False)  # day, minute
+    period_start = Column(DateTime, nullable=False)  # UTC
+    requests = Column(Integer, default=0, nullable=False)
+
+
 class Prediction(Base):
     __tablename__ = "predictions"
 
@@ -13,6 +13,7 @@ from sklearn.metrics import accuracy_score, classification_report
 
 from app.db.database import AsyncSessionLocal
 from app.db.models import Team
+from app.ml.elo import save_ratings
 
 # Constants
 K_FACTOR_BASE = 20
@@ -262,8 +263,8 @@ class CSVPipeline:
         print(f"✅ Processed {len(features)} matches")
         
         # Save final Elo ratings for inference usage
-        with open("app/ml/elo_ratings.json", "w") as f:
-            json.dump(self.elo_ratings, f)
+        # (atomic replace, so running APIs hot-reload a complete file)
+        save_ratings(self.elo_ratings)
             
         return np.array(features), np.array(labels)
 
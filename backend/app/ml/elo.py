@@ -0,0 +1,134 @@
+"""
+In-memory Elo ratings for inference
+
+EloRatingService keeps the team_id -> rating map in memory, so a lookup is a
+dict access. The source is checked for changes at most every
+ELO_RELOAD_CHECK_SECONDS. A changed source is loaded into a new dict, which
+then replaces the old one in a single assignment, so readers never see a
+half-loaded map.
+
+Sources (ELO_SOURCE):
+    file  elo_ratings.json next to this module (or ELO_RATINGS_PATH), written by
+          csv_pipeline.py; changes are detected by mtime. Falls back to the
+          database when the file does not exist.
+    db    latest-season team_stats.elo_rating per team; changes are detected
+          by max(updated_at) and the row count.
+"""
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import TeamStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ELO = 1500.0
+DEFAULT_RATINGS_PATH = Path(__file__).resolve().parent / "elo_ratings.json"
+
+
+def ratings_path() -> Path:
+    return Path(settings.ELO_RATINGS_PATH) if settings.ELO_RATINGS_PATH else DEFAULT_RATINGS_PATH
+
+
+def save_ratings(ratings: Dict[int, float], path: Optional[Path] = None):
+    """Write ratings atomically (temp file + rename) so a reload never reads a partial file"""
+    path = path or ratings_path()
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".elo_ratings.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump({str(team_id): float(rating) for team_id, rating in ratings.items()}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class EloRatingService:
+    """Cached team Elo ratings with hot reload"""
+
+    def __init__(
+        self,
+        source: Optional[str] = None,
+        path: Optional[Path] = None,
+        check_interval: Optional[float] = None,
+    ):
+        self.source = source or settings.ELO_SOURCE
+        self.path = path or ratings_path()
+        self.check_interval = settings.ELO_RELOAD_CHECK_SECONDS if check_interval is None else check_interval
+        self.ratings: Dict[int, float] = {}
+        self.version = None  # file mtime, or (max updated_at, row count) for the DB
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def get(self, team_id: int, db: Optional[AsyncSession] = None) -> float:
+        """Rating of one team (DEFAULT_ELO when unknown)
+        Args:
+            db: Session used when ratings come from the database
+        """
+        await self._refresh(db)
+        return self.ratings.get(team_id, DEFAULT_ELO)
+
+    async def get_many(self, team_ids: Iterable[int], db: Optional[AsyncSession] = None) -> Dict[int, float]:
+        await self._refresh(db)
+        ratings = self.ratings
+        return {team_id: ratings.get(team_id, DEFAULT_ELO) for team_id in team_ids}
+
+    async def _refresh(self, db: Optional[AsyncSession]):
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+        async with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return
+            try:
+                if self.source == "file" and self.path.exists():
+                    self._refresh_from_file()
+                elif db is not None:
+                    await self._refresh_from_db(db)
+                else:
+                    return  # Nothing to read yet; try again on the next lookup with a session
+            except Exception as e:
+                # Keep serving the ratings we have
+                logger.error(f"❌ Elo ratings reload failed ({self.source}): {e}")
+            self._checked_at = time.monotonic()
+
+    def _refresh_from_file(self):
+        mtime = self.path.stat().st_mtime_ns
+        if mtime == self.version:
+            return
+        with open(self.path, "r") as f:
+            raw = json.load(f)
+        self.ratings = {int(team_id): float(rating) for team_id, rating in raw.items()}
+        self.version = mtime
+        logger.info(f"📈 Loaded {len(self.ratings)} Elo ratings from {self.path}")
+
+    async def _refresh_from_db(self, db: AsyncSession):
+        version = tuple((await db.execute(
+            select(func.max(TeamStats.updated_at), func.count(TeamStats.id))
+        )).one())
+        if version == self.version:
+            return
+        # Latest season per team
+        result = await db.execute(
+            select(TeamStats.team_id, TeamStats.elo_rating)
+            .distinct(TeamStats.team_id)
+            .order_by(TeamStats.team_id, TeamStats.season.desc())
+        )
+        self.ratings = {
+            team_id: float(rating if rating is not None else DEFAULT_ELO)
+            for team_id, rating in result.all()
+        }
+        self.version = version
+        logger.info(f"📈 Loaded {len(self.ratings)} Elo ratings from team_stats")
+
+
+# Global instance
+elo_service = EloRatingService()
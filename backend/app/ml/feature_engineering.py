@@ -1,101 +1,115 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from typing import Dict, List
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, text, bindparam, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from app.db.models import Match, Team, TeamStats
+from app.ml.elo import elo_service
+from app.services.match_archive import MATCHES_HISTORY
+
+FINISHED_STATUSES = ["finished", "FINISHED"]
+
+# Must match csv_pipeline.py feature order (12 features - no odds)
+FEATURE_ORDER = [
+    "home_elo", "away_elo", "elo_diff",
+    "home_form_pts", "away_form_pts",
+    "home_goals_avg", "away_goals_avg",
+    "home_conceded_avg", "away_conceded_avg",
+    "home_rest_days", "away_rest_days",
+    "elo_diff_abs"
+]
+
+
+# Last N finished matches of one team ({team} is a column of the outer row,
+# {source} is `matches` or the `matches_history` view),
+# aggregated into form points (last :form_n), goal averages and last match date.
+# Each side is an index range scan on ix_matches_*_team_date that stops after
+# :last_n matching rows (status and scores are read from the table rows).
+TEAM_HISTORY_SQL = """
+    SELECT count(*) AS played,
+           coalesce(sum(CASE WHEN rn <= :form_n THEN
+               CASE WHEN scored > conceded THEN 3 WHEN scored = conceded THEN 1 ELSE 0 END
+           END), 0) AS form_points,
+           avg(scored) AS scored_avg,
+           avg(conceded) AS conceded_avg,
+           max(match_date) AS last_match
+    FROM (
+        SELECT match_date, scored, conceded,
+               row_number() OVER (ORDER BY match_date DESC) AS rn
+        FROM (
+            (SELECT match_date, coalesce(home_score, 0) AS scored, coalesce(away_score, 0) AS conceded
+             FROM {source}
+             WHERE home_team_id = {team} AND status = ANY(:statuses)
+             ORDER BY match_date DESC LIMIT :last_n)
+            UNION ALL
+            (SELECT match_date, coalesce(away_score, 0), coalesce(home_score, 0)
+             FROM {source}
+             WHERE away_team_id = {team} AND status = ANY(:statuses)
+             ORDER BY match_date DESC LIMIT :last_n)
+        ) sides
+        ORDER BY match_date DESC
+        LIMIT :last_n
+    ) recent
+"""
+
+def match_features_sql(source: str = "matches"):
+    """The match and both teams' histories in one round trip"""
+    return text(f"""
+SELECT m.home_team_id, m.away_team_id,
+       h.played AS home_played, h.form_points AS home_form_points,
+       h.scored_avg AS home_scored_avg, h.conceded_avg AS home_conceded_avg,
+       h.last_match AS home_last_match,
+       a.played AS away_played, a.form_points AS away_form_points,
+       a.scored_avg AS away_scored_avg, a.conceded_avg AS away_conceded_avg,
+       a.last_match AS away_last_match
+FROM {source} m
+CROSS JOIN LATERAL ({TEAM_HISTORY_SQL.format(team="m.home_team_id", source=source)}) h
+CROSS JOIN LATERAL ({TEAM_HISTORY_SQL.format(team="m.away_team_id", source=source)}) a
+WHERE m.id = :match_id
+""").bindparams(
+        bindparam("match_id", type_=Integer),
+        bindparam("statuses", type_=ARRAY(String)),
+    )
+
+
+def team_features_sql(source: str = "matches"):
+    """Histories of many teams (:team_ids) in one round trip"""
+    return text(f"""
+SELECT t.team_id, h.played, h.form_points, h.scored_avg, h.conceded_avg, h.last_match
+FROM unnest(:team_ids) AS t(team_id)
+CROSS JOIN LATERAL ({TEAM_HISTORY_SQL.format(team="t.team_id", source=source)}) h
+""").bindparams(
+        bindparam("team_ids", type_=ARRAY(Integer)),
+        bindparam("statuses", type_=ARRAY(String)),
+    )
+
+
+MATCH_FEATURES_SQL = match_features_sql()
+# Training: archived seasons are only in the history view
+HISTORY_MATCH_FEATURES_SQL = match_features_sql(MATCHES_HISTORY)
+TEAM_FEATURES_SQL = team_features_sql()
+HISTORY_TEAM_FEATURES_SQL = team_features_sql(MATCHES_HISTORY)
 
 
 class FeatureEngineer:
     """Feature engineering for match prediction"""
     
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, history: bool = False):
+        """
+        Args:
+            history: Read `matches_history` (hot + archived seasons) instead of
+                `matches`, for training on past seasons
+        """
         self.db = db
+        self.features_sql = HISTORY_MATCH_FEATURES_SQL if history else MATCH_FEATURES_SQL
+        self.team_features_sql = HISTORY_TEAM_FEATURES_SQL if history else TEAM_FEATURES_SQL
     
     async def get_team_elo(self, team_id: int) -> float:
-        """Get team's Elo rating from JSON file"""
-        import json
-        from pathlib import Path
-        
-        elo_file = Path("app/ml/elo_ratings.json")
-        if elo_file.exists():
-            with open(elo_file, "r") as f:
-                elo_ratings = json.load(f)
-                # Convert team_id to string key
-                return float(elo_ratings.get(str(team_id), 1500.0))
-        
-        # Fallback to database if file doesn't exist
-        result = await self.db.execute(
-            select(TeamStats)
-            .where(TeamStats.team_id == team_id)
-            .order_by(TeamStats.season.desc())
-            .limit(1)
-        )
-        stats = result.scalar_one_or_none()
-        return stats.elo_rating if stats else 1500.0
-    
-    async def get_team_form(self, team_id: int, last_n: int = 5) -> float:
-        """Calculate team form from last N matches"""
-        result = await self.db.execute(
-            select(Match)
-            .where(
-                ((Match.home_team_id == team_id) | (Match.away_team_id == team_id)),
-                Match.status.in_(["finished", "FINISHED"])  # Handle both cases
-            )
-            .order_by(Match.match_date.desc())
-            .limit(last_n)
-        )
-        matches = result.scalars().all()
-        
-        if not matches:
-            return 0.5
-        
-        points = 0
-        for match in matches:
-            if match.home_team_id == team_id:
-                if match.home_score > match.away_score:
-                    points += 3
-                elif match.home_score == match.away_score:
-                    points += 1
-            else:
-                if match.away_score > match.home_score:
-                    points += 3
-                elif match.away_score == match.home_score:
-                    points += 1
-        
-        max_points = last_n * 3
-        return points / max_points
-    
-    async def get_goals_avg(self, team_id: int, last_n: int = 10) -> Tuple[float, float]:
-        """Get average goals scored and conceded"""
-        result = await self.db.execute(
-            select(Match)
-            .where(
-                ((Match.home_team_id == team_id) | (Match.away_team_id == team_id)),
-                Match.status.in_(["finished", "FINISHED"])  # Handle both cases
-            )
-            .order_by(Match.match_date.desc())
-            .limit(last_n)
-        )
-        matches = result.scalars().all()
-        
-        if not matches:
-            return 1.0, 1.0
-        
-        scored = []
-        conceded = []
-        
-        for match in matches:
-            if match.home_team_id == team_id:
-                scored.append(match.home_score or 0)
-                conceded.append(match.away_score or 0)
-            else:
-                scored.append(match.away_score or 0)
-                conceded.append(match.home_score or 0)
-        
-        return np.mean(scored), np.mean(conceded)
+        """Get team's Elo rating (in-memory, see app.ml.elo)"""
+        return await elo_service.get(team_id, self.db)
     
     async def get_h2h_stats(self, home_team_id: int, away_team_id: int, last_n: int = 5) -> Dict:
         """Get head-to-head statistics"""
@@ -136,84 +150,116 @@ class FeatureEngineer:
             "total": len(matches)
         }
     
-    async def get_days_since_last_match(self, team_id: int) -> int:
-        """Get days since team's last match"""
-        result = await self.db.execute(
-            select(Match)
-            .where(
-                ((Match.home_team_id == team_id) | (Match.away_team_id == team_id)),
-                Match.status == "finished"
-            )
-            .order_by(Match.match_date.desc())
-            .limit(1)
-        )
-        last_match = result.scalar_one_or_none()
-        
-        if not last_match:
-            return 7
-        
-        days = (datetime.utcnow() - last_match.match_date).days
-        return max(days, 0)
-    
     async def extract_features(self, match_id: int) -> Dict:
-        """Extract all features for a match"""
-        # Get match
-        result = await self.db.execute(
-            select(Match).where(Match.id == match_id)
-        )
-        match = result.scalar_one_or_none()
+        """Extract all features for a match
+        The match row and both teams' form, goal averages and last match date
+        come from a single statement (MATCH_FEATURES_SQL).
+        """
+        result = await self.db.execute(self.features_sql, {
+            "match_id": match_id,
+            "statuses": FINISHED_STATUSES,
+            "form_n": 5,
+            "last_n": 10,
+        })
+        row = result.mappings().one_or_none()
         
-        if not match:
+        if not row:
             raise ValueError(f"Match {match_id} not found")
         
         # Extract features
-        home_elo = await self.get_team_elo(match.home_team_id)
-        away_elo = await self.get_team_elo(match.away_team_id)
+        elo = await elo_service.get_many([row["home_team_id"], row["away_team_id"]], self.db)
+        home_elo = elo[row["home_team_id"]]
+        away_elo = elo[row["away_team_id"]]
         
-        home_form = await self.get_team_form(match.home_team_id)
-        away_form = await self.get_team_form(match.away_team_id)
+        home = self.team_features_from_aggregates(row, "home_")
+        away = self.team_features_from_aggregates(row, "away_")
         
-        home_goals_avg, home_conceded_avg = await self.get_goals_avg(match.home_team_id)
-        away_goals_avg, away_conceded_avg = await self.get_goals_avg(match.away_team_id)
+        # Return 12 features (no odds for production)
+        features = self.build_features(home_elo, away_elo, home, away)
+        
+        # Debug logging
+        print(f"🔍 Features for match {match_id}:")
+        print(f"  Elo: {home_elo:.0f} vs {away_elo:.0f} (diff: {home_elo - away_elo:.0f})")
+        print(f"  Form: {home['form']:.2f} vs {away['form']:.2f}")
+        print(f"  Goals: {home['goals_avg']:.2f} vs {away['goals_avg']:.2f}")
+        print(f"  Conceded: {home['conceded_avg']:.2f} vs {away['conceded_avg']:.2f}")
         
-        home_days = await self.get_days_since_last_match(match.home_team_id)
-        away_days = await self.get_days_since_last_match(match.away_team_id)
+        return features
+    
+    @staticmethod
+    def team_features_from_aggregates(row, prefix: str = "", form_n: int = 5) -> Dict:
+        """Team features from the TEAM_HISTORY_SQL columns of a result row
+        Args:
+            prefix: Column prefix ("home_"/"away_" in MATCH_FEATURES_SQL)
+        """
+        if not row[f"{prefix}played"]:
+            return {"form": 0.5, "goals_avg": 1.0, "conceded_avg": 1.0, "rest_days": 7}
         
-        # Return 12 features (no odds for production)
-        features = {
+        return {
+            "form": row[f"{prefix}form_points"] / (form_n * 3),
+            "goals_avg": float(row[f"{prefix}scored_avg"]),
+            "conceded_avg": float(row[f"{prefix}conceded_avg"]),
+            "rest_days": max((datetime.utcnow() - row[f"{prefix}last_match"]).days, 0),
+        }
+    
+    @staticmethod
+    def build_features(home_elo: float, away_elo: float, home: Dict, away: Dict) -> Dict:
+        """Feature dict from both teams' Elo and team_features_from_aggregates output"""
+        return {
             "home_elo": home_elo,
             "away_elo": away_elo,
             "elo_diff": home_elo - away_elo,
-            "home_form_pts": home_form,
-            "away_form_pts": away_form,
-            "home_goals_avg": home_goals_avg,
-            "away_goals_avg": away_goals_avg,
-            "home_conceded_avg": home_conceded_avg,
-            "away_conceded_avg": away_conceded_avg,
-            "home_rest_days": home_days,
-            "away_rest_days": away_days,
+            "home_form_pts": home["form"],
+            "away_form_pts": away["form"],
+            "home_goals_avg": home["goals_avg"],
+            "away_goals_avg": away["goals_avg"],
+            "home_conceded_avg": home["conceded_avg"],
+            "away_conceded_avg": away["conceded_avg"],
+            "home_rest_days": home["rest_days"],
+            "away_rest_days": away["rest_days"],
             "elo_diff_abs": abs(home_elo - away_elo),
         }
+    
+    async def extract_features_batch(self, matches: List[Match]) -> Dict[int, Dict]:
+        """Features for many matches with a single history query
+        Same statement per team as extract_features (TEAM_HISTORY_SQL), run
+        LATERAL over every involved team at once.
+        Args:
+            matches: Loaded Match rows
+        Returns:
+            match_id -> features dict (same keys as extract_features)
+        """
+        team_ids = list({m.home_team_id for m in matches} | {m.away_team_id for m in matches})
+        if not team_ids:
+            return {}
         
-        # Debug logging
-        print(f"🔍 Features for match {match_id}:")
-        print(f"  Elo: {home_elo:.0f} vs {away_elo:.0f} (diff: {home_elo - away_elo:.0f})")
-        print(f"  Form: {home_form:.2f} vs {away_form:.2f}")
-        print(f"  Goals: {home_goals_avg:.2f} vs {away_goals_avg:.2f}")
-        print(f"  Conceded: {home_conceded_avg:.2f} vs {away_conceded_avg:.2f}")
+        result = await self.db.execute(self.team_features_sql, {
+            "team_ids": team_ids,
+            "statuses": FINISHED_STATUSES,
+            "form_n": 5,
+            "last_n": 10,
+        })
+        team_features = {
+            row["team_id"]: self.team_features_from_aggregates(row)
+            for row in result.mappings().all()
+        }
+        elo = await elo_service.get_many(team_ids, self.db)
         
-        return features
+        return {
+            match.id: self.build_features(
+                elo[match.home_team_id], elo[match.away_team_id],
+                team_features[match.home_team_id], team_features[match.away_team_id]
+            )
+            for match in matches
+        }
     
     def features_to_array(self, features: Dict) -> np.ndarray:
         """Convert features dict to numpy array"""
-        # Must match csv_pipeline.py feature order (12 features - no odds)
-        feature_order = [
-            "home_elo", "away_elo", "elo_diff",
-            "home_form_pts", "away_form_pts",
-            "home_goals_avg", "away_goals_avg",
-            "home_conceded_avg", "away_conceded_avg",
-            "home_rest_days", "away_rest_days",
-            "elo_diff_abs"
-        ]
-        
-        return np.array([features[key] for key in feature_order]).reshape(1, -1)
+        return np.array([features[key] for key in FEATURE_ORDER]).reshape(1, -1)
+    
+    def features_to_matrix(self, features_list: List[Dict]) -> np.ndarray:
+        """Stack feature dicts into an (n, 12) array, one row per match"""
+        return np.array(
+            [[features[key] for key in FEATURE_ORDER] for features in features_list],
+            dtype=float
+        ).reshape(-1, len(FEATURE_ORDER))
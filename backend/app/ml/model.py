@@ -1,6 +1,6 @@
 import joblib
 import numpy as np
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 from pathlib import Path
 
 from app.ml.feature_engineering import FeatureEngineer
@@ -27,13 +27,19 @@ class PredictionModel:
     
     def predict_outcome(self, features: np.ndarray) -> Dict[str, float]:
         """Predict match outcome probabilities"""
+        return self.predict_outcomes(features)[0]
+    
+    def predict_outcomes(self, features: np.ndarray) -> List[Dict[str, float]]:
+        """Outcome probabilities for every row of an (n, 12) feature matrix
+        The trained model is called once for the whole matrix.
+        """
         if self.model is None:
             # Baseline prediction using Elo difference
-            elo_diff = features[0, 2]  # elo_diff is 3rd feature
+            elo_diff = features[:, 2]  # elo_diff is 3rd feature
             
             # Simple logistic function
             home_prob = 1 / (1 + np.exp(-elo_diff / 400))
-            draw_prob = 0.25
+            draw_prob = np.full_like(home_prob, 0.25)
             away_prob = 1 - home_prob - draw_prob
             
             # Normalize
@@ -42,26 +48,29 @@ class PredictionModel:
             draw_prob /= total
             away_prob /= total
             
-            confidence = 0.5  # Low confidence for baseline
+            confidence = np.full_like(home_prob, 0.5)  # Low confidence for baseline
         else:
             # Use trained model
             # Classes are likely [0, 1, 2] -> [Away, Draw, Home] based on training script
-            proba = self.model.predict_proba(features)[0]
+            proba = self.model.predict_proba(features)
             
             # CORRECT MAPPING:
-            away_prob = float(proba[0]) # Class 0
-            draw_prob = float(proba[1]) # Class 1
-            home_prob = float(proba[2]) # Class 2
+            away_prob = proba[:, 0] # Class 0
+            draw_prob = proba[:, 1] # Class 1
+            home_prob = proba[:, 2] # Class 2
             
             # Confidence based on max probability
-            confidence = max(home_prob, draw_prob, away_prob)
+            confidence = proba.max(axis=1)
         
-        return {
-            "home_win_probability": home_prob,
-            "draw_probability": draw_prob,
-            "away_win_probability": away_prob,
-            "confidence": confidence
-        }
+        return [
+            {
+                "home_win_probability": float(home),
+                "draw_probability": float(draw),
+                "away_win_probability": float(away),
+                "confidence": float(conf)
+            }
+            for home, draw, away, conf in zip(home_prob, draw_prob, away_prob, confidence)
+        ]
     
     def predict_score(self, features: np.ndarray) -> Tuple[int, int]:
         """Predict match score"""
@@ -92,10 +101,33 @@ class PredictionModel:
         # Extract features
         features_dict = await feature_engineer.extract_features(match.id)
         features_array = feature_engineer.features_to_array(features_dict)
-        features_list = features_array.tolist()[0] # Convert to list for explanation
         
         # 3. Predict
         outcome = self.predict_outcome(features_array)
+        
+        return self._format_prediction(match, features_dict, features_array, outcome)
+    
+    async def predict_matches(self, matches: List[Match], feature_engineer: FeatureEngineer) -> List[Dict]:
+        """Predictions for many matches: one feature query, one predict_proba call
+        Args:
+            matches: Match rows with home_team/away_team loaded
+        """
+        if not matches:
+            return []
+        
+        features_by_match = await feature_engineer.extract_features_batch(matches)
+        features_list = [features_by_match[match.id] for match in matches]
+        features_matrix = feature_engineer.features_to_matrix(features_list)
+        outcomes = self.predict_outcomes(features_matrix)
+        
+        return [
+            self._format_prediction(match, features_dict, features_matrix[i:i + 1], outcome)
+            for i, (match, features_dict, outcome) in enumerate(zip(matches, features_list, outcomes))
+        ]
+    
+    def _format_prediction(self, match: Match, features_dict: Dict, features_array: np.ndarray, outcome: Dict) -> Dict:
+        """API payload for one match from its features (1x12 array) and outcome"""
+        features_list = features_array.tolist()[0] # Convert to list for explanation
         predicted_home, predicted_away = self.predict_score(features_array)
         
         # 4. Generate Explanation
@@ -23,6 +23,7 @@ from pathlib import Path
 from app.db.database import AsyncSessionLocal
 from app.db.models import Match, Team, TeamStats
 from app.ml.feature_engineering import FeatureEngineer
+from app.services.match_archive import MatchArchiveService, matches_history
 
 
 class ModelTrainer:
@@ -37,24 +38,26 @@ class ModelTrainer:
         print("📊 Preparing training data...")
         
         async with AsyncSessionLocal() as db:
-            # Get finished matches
-            query = select(Match).where(Match.status == "finished")
+            # Get finished matches, including seasons moved to match_archive
+            await MatchArchiveService(db).ensure_history_view()
+            await db.commit()
             
-            if min_date:
-                query = query.where(Match.match_date >= min_date)
+            query = select(
+                matches_history.c.id,
+                matches_history.c.home_score,
+                matches_history.c.away_score
+            ).where(matches_history.c.status == "finished")
             
-            query = query.options(
-                selectinload(Match.home_team),
-                selectinload(Match.away_team)
-            )
+            if min_date:
+                query = query.where(matches_history.c.match_date >= min_date)
             
             result = await db.execute(query)
-            matches = result.scalars().all()
+            matches = result.all()
             
             print(f"Found {len(matches)} finished matches")
             
             # Extract features for each match
-            feature_engineer = FeatureEngineer(db)
+            feature_engineer = FeatureEngineer(db, history=True)
             
             X = []
             y = []
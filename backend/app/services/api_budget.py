@@ -0,0 +1,302 @@
+"""
+Shared API request budget across jobs and processes
+
+Every provider request reserves one unit in the `api_usage` table for the
+current UTC day and minute. Work runs at a priority (live > upcoming >
+standings > seed) and each priority may only use its share of the quota
+(API_BUDGET_SHARE_*), so the last slice of the day and of every minute is
+always left for live updates.
+
+- Minute window full: the caller waits for the next minute (deferred).
+- Day window full: ApiBudgetExceeded is raised and the work is dropped.
+  The worker remembers this until UTC midnight (`is_exhausted`), so
+  on-demand callers go straight to their fallback without a lookup.
+
+Providers that report their own daily count (API-Football's
+x-ratelimit-requests-* headers) are reconciled with `observe_headers`, so
+requests made with the same key elsewhere are accounted too.
+
+Jobs set their priority with `with_api_priority` / `api_priority`; the API
+clients read it from a ContextVar, like the job-run counters.
+"""
+import asyncio
+import functools
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.services.cache import local_cache
+from app.services.http_clients import FOOTBALL_DATA, API_FOOTBALL
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = ("live", "upcoming", "standings", "seed")
+# Work without an explicit priority (e.g. on-demand endpoints)
+DEFAULT_PRIORITY = "upcoming"
+
+_priority: ContextVar[str] = ContextVar("api_priority", default=DEFAULT_PRIORITY)
+
+
+class ApiBudgetExceeded(Exception):
+    """The provider's quota for this priority is spent for today"""
+
+    def __init__(self, provider: str, priority: str, period: str):
+        self.provider = provider
+        self.priority = priority
+        self.period = period
+        super().__init__(f"{provider} {period} budget exhausted for {priority} work")
+
+
+@contextmanager
+def api_priority(priority: str):
+    """Run the enclosed requests at `priority`"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown API priority: {priority}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def with_api_priority(priority: str):
+    """Decorator running an async job at `priority`"""
+    def decorator(job):
+        @functools.wraps(job)
+        async def wrapper(*args, **kwargs):
+            with api_priority(priority):
+                return await job(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@dataclass
+class ProviderLimits:
+    per_day: int  # 0 = no daily cap
+    per_minute: int  # 0 = no minute cap
+
+
+RESERVE_SQL = text("""
+INSERT INTO api_usage (provider, period, period_start, requests)
+VALUES (:provider, :period, :period_start, 1)
+ON CONFLICT (provider, period, period_start)
+DO UPDATE SET requests = api_usage.requests + 1
+WHERE api_usage.requests < :cap
+RETURNING requests
+""")
+
+# Raise today's counter to the provider-reported usage (never lowers it)
+OBSERVED_SQL = text("""
+INSERT INTO api_usage (provider, period, period_start, requests)
+VALUES (:provider, 'day', :period_start, :used)
+ON CONFLICT (provider, period, period_start)
+DO UPDATE SET requests = GREATEST(api_usage.requests, EXCLUDED.requests)
+""")
+
+USAGE_SQL = text("""
+SELECT provider, period, requests
+FROM api_usage
+WHERE (period = 'day' AND period_start = :day_start)
+   OR (period = 'minute' AND period_start = :minute_start)
+""")
+
+
+class ApiBudget:
+    """Persistent per-provider request budget with priority shares"""
+
+    def __init__(self, limits: Dict[str, ProviderLimits], shares: Dict[str, float], session_factory=AsyncSessionLocal):
+        self.limits = limits
+        self.shares = shares
+        self.session_factory = session_factory
+
+    def cap(self, limit: int, priority: str) -> Optional[int]:
+        """Requests `priority` may reach in a window with `limit` (None = uncapped)"""
+        if not limit:
+            return None
+        return max(1, int(limit * self.shares.get(priority, 1.0)))
+
+    @staticmethod
+    def _periods(now: datetime):
+        return (
+            ("day", now.replace(hour=0, minute=0, second=0, microsecond=0)),
+            ("minute", now.replace(second=0, microsecond=0)),
+        )
+
+    async def _try_reserve(self, provider: str, priority: str) -> Optional[str]:
+        """Reserve one request; returns the exhausted period or None on success"""
+        limits = self.limits[provider]
+        now = datetime.utcnow()
+        try:
+            async with self.session_factory() as db:
+                for period, period_start in self._periods(now):
+                    cap = self.cap(limits.per_day if period == "day" else limits.per_minute, priority)
+                    result = await db.execute(RESERVE_SQL, {
+                        "provider": provider,
+                        "period": period,
+                        "period_start": period_start,
+                        "cap": cap if cap is not None else 2**31 - 1,
+                    })
+                    used = result.scalar()
+                    if used is None:
+                        await db.rollback()
+                        return period
+                    if period == "day" and used == 1:
+                        # First request of the day: drop old minute rows
+                        await db.execute(
+                            text("DELETE FROM api_usage WHERE period = 'minute' AND period_start < :before"),
+                            {"before": now - timedelta(days=1)},
+                        )
+                await db.commit()
+        except Exception as e:
+            # Budget bookkeeping must never block live updates
+            logger.warning(f"⚠️  API budget unavailable, allowing request: {e}")
+        return None
+
+    async def reserve(self, provider: str, priority: Optional[str] = None, wait: bool = True):
+        """Reserve one request for `provider` at `priority` (defaults to the context's)
+        Raises:
+            ApiBudgetExceeded: the daily share is spent, or the minute share
+                is spent and `wait` is False
+        """
+        priority = priority or _priority.get()
+        while True:
+            period = await self._try_reserve(provider, priority)
+            if period is None:
+                return
+            if period == "minute" and wait:
+                now = datetime.utcnow()
+                delay = 60 - now.second - now.microsecond / 1_000_000 + 0.1
+                logger.info(f"⏳ {provider} minute budget full for {priority} work, deferring {delay:.0f}s")
+                await asyncio.sleep(delay)
+                continue
+            if period == "day":
+                self._mark_exhausted(provider, priority)
+            raise ApiBudgetExceeded(provider, priority, period)
+
+    async def _usage(self) -> Dict[str, Dict[str, int]]:
+        now = datetime.utcnow()
+        (_, day_start), (_, minute_start) = self._periods(now)
+        usage = {provider: {"day": 0, "minute": 0} for provider in self.limits}
+        async with self.session_factory() as db:
+            result = await db.execute(USAGE_SQL, {"day_start": day_start, "minute_start": minute_start})
+            for provider, period, requests in result.all():
+                usage.setdefault(provider, {"day": 0, "minute": 0})[period] = requests
+        return usage
+
+    async def can_spend(self, provider: str, count: int, priority: Optional[str] = None) -> bool:
+        """Whether `count` more requests fit in today's share for `priority`"""
+        priority = priority or _priority.get()
+        cap = self.cap(self.limits[provider].per_day, priority)
+        if cap is None:
+            return True
+        try:
+            used = (await self._usage())[provider]["day"]
+        except Exception as e:
+            logger.warning(f"⚠️  API budget unavailable: {e}")
+            return True
+        return used + count <= cap
+
+    @staticmethod
+    def _exhausted_key(provider: str, priority: str) -> str:
+        return f"api_budget:exhausted:{provider}:{priority}"
+
+    def _mark_exhausted(self, provider: str, priority: str):
+        """Remember in this worker that `priority` is out of quota until UTC midnight"""
+        now = datetime.utcnow()
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        local_cache.set(self._exhausted_key(provider, priority), True, expire=int((midnight - now).total_seconds()) + 1)
+
+    async def is_exhausted(self, provider: str, priority: Optional[str] = None) -> bool:
+        """Whether today's share for `priority` is spent
+        Positive answers are remembered until UTC midnight, negative ones for a
+        minute, so hot paths rarely touch the database.
+        """
+        priority = priority or _priority.get()
+        if local_cache.get(self._exhausted_key(provider, priority)):
+            return True
+        checked_key = f"api_budget:available:{provider}:{priority}"
+        if local_cache.get(checked_key):
+            return False
+        if not await self.can_spend(provider, 1, priority):
+            self._mark_exhausted(provider, priority)
+            return True
+        local_cache.set(checked_key, True, expire=60)
+        return False
+
+    async def observe_headers(
+        self,
+        provider: str,
+        headers,
+        limit_header: str = "x-ratelimit-requests-limit",
+        remaining_header: str = "x-ratelimit-requests-remaining",
+    ):
+        """Reconcile today's counter with the provider's own daily quota headers"""
+        try:
+            remaining = int(headers.get(remaining_header))
+            limit = int(headers.get(limit_header) or self.limits[provider].per_day)
+        except (TypeError, ValueError):
+            return
+
+        if remaining <= 0:
+            # The provider itself refuses further requests, whatever the priority
+            logger.warning(f"⛔ {provider} reports its daily quota used up")
+            for priority in PRIORITIES:
+                self._mark_exhausted(provider, priority)
+
+        day_start = self._periods(datetime.utcnow())[0][1]
+        try:
+            async with self.session_factory() as db:
+                await db.execute(OBSERVED_SQL, {
+                    "provider": provider,
+                    "period_start": day_start,
+                    "used": max(0, limit - remaining),
+                })
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"⚠️  Could not record {provider} quota headers: {e}")
+
+    async def report(self) -> List[Dict]:
+        """Usage, limits and per-priority caps for every provider"""
+        usage = await self._usage()
+        return [
+            {
+                "provider": provider,
+                "usedToday": usage[provider]["day"],
+                "usedThisMinute": usage[provider]["minute"],
+                "dailyLimit": limits.per_day or None,
+                "minuteLimit": limits.per_minute or None,
+                "caps": {
+                    priority: {
+                        "day": self.cap(limits.per_day, priority),
+                        "minute": self.cap(limits.per_minute, priority),
+                    }
+                    for priority in PRIORITIES
+                },
+            }
+            for provider, limits in self.limits.items()
+        ]
+
+
+api_budget = ApiBudget(
+    limits={
+        FOOTBALL_DATA: ProviderLimits(settings.FOOTBALL_API_DAILY_LIMIT, settings.FOOTBALL_API_RATE_LIMIT),
+        API_FOOTBALL: ProviderLimits(settings.API_FOOTBALL_DAILY_LIMIT, settings.API_FOOTBALL_RATE_LIMIT),
+    },
+    shares={
+        "live": 1.0,
+        "upcoming": settings.API_BUDGET_SHARE_UPCOMING,
+        "standings": settings.API_BUDGET_SHARE_STANDINGS,
+        "seed": settings.API_BUDGET_SHARE_SEED,
+    },
+)
@@ -7,6 +7,11 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 import logging
 
+from app.services.api_budget import api_budget, ApiBudgetExceeded
+from app.services.http_clients import http_clients, API_FOOTBALL
+from app.services.job_runs import record_api_request
+from app.services.resilience import send_with_retry, CircuitOpen
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,28 +20,50 @@ class APIFootballClient:
     
     BASE_URL = "https://v3.football.api-sports.io"
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key
         self.headers = {
             "x-apisports-key": api_key,
             "x-apisports-host": "v3.football.api-sports.io"
         }
+        self._http = http_client
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Injected client, or the shared pooled one for API-Football"""
+        return self._http or http_clients.get(API_FOOTBALL)
     
     async def _request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make API request with error handling"""
         url = f"{self.BASE_URL}/{endpoint}"
         
+        if await api_budget.is_exhausted(API_FOOTBALL):
+            logger.info(f"API-Football quota spent for today, skipping {endpoint}")
+            return None
+        
+        async def send() -> httpx.Response:
+            # 100 requests/day: never wait for the minute window, just skip
+            await api_budget.reserve(API_FOOTBALL, wait=False)
+            record_api_request()
+            response = await self.http.get(url, headers=self.headers, params=params)
+            # Persist the key's real daily usage (also counts other consumers)
+            await api_budget.observe_headers(API_FOOTBALL, response.headers)
+            return response
+        
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get("errors"):
-                    logger.error(f"API-Football error: {data['errors']}")
-                    return None
-                
-                return data
+            # Each retry spends daily quota, so retry only once
+            response = await send_with_retry(API_FOOTBALL, send, attempts=2)
+            response.raise_for_status()
+            data = response.json()
+            
+            if data.get("errors"):
+                logger.error(f"API-Football error: {data['errors']}")
+                return None
+            
+            return data
+        except (ApiBudgetExceeded, CircuitOpen) as e:
+            logger.warning(f"API-Football request skipped: {e}")
+            return None
         except httpx.HTTPError as e:
             logger.error(f"API-Football request failed: {e}")
             return None
@@ -286,6 +313,40 @@ class APIFootballClient:
         
         return injuries
     
+    async def get_fixtures(self, league_id: int, season: int, date_from: str, date_to: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get raw fixtures of a league between two dates (YYYY-MM-DD)
+        Endpoint: /fixtures
+        Returns None when the request failed or was skipped, so callers can
+        tell "no fixtures" from "not fetched"
+        """
+        params = {"league": league_id, "season": season, "from": date_from, "to": date_to}
+        data = await self._request("fixtures", params)
+        if data is None:
+            return None
+        return data.get("response") or []
+    
+    async def get_standings(self, league_id: int, season: int) -> List[Dict[str, Any]]:
+        """
+        Get raw standings rows of a league (first group)
+        Endpoint: /standings
+        """
+        data = await self._request("standings", {"league": league_id, "season": season})
+        response = (data or {}).get("response") or []
+        if not response:
+            return []
+        groups = response[0].get("league", {}).get("standings") or []
+        return groups[0] if groups else []
+    
+    async def get_team(self, team_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get raw team details
+        Endpoint: /teams
+        """
+        data = await self._request("teams", {"id": team_id})
+        response = (data or {}).get("response") or []
+        return response[0] if response else None
+    
     async def check_api_status(self) -> Dict[str, Any]:
         """
         Check API status and remaining requests
@@ -1,6 +1,7 @@
 import redis.asyncio as redis
 from typing import Optional, Any
 import json
+import time
 from datetime import timedelta
 
 from app.core.config import settings
@@ -79,8 +80,42 @@ class RedisCache:
         return await self.redis_client.exists(key) > 0
 
 
-# Global cache instance
+class LocalCache:
+    """In-process TTL cache for small, per-worker hot values"""
+    
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: dict = {}
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get value if present and not expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+    
+    def set(self, key: str, value: Any, expire: int = 300):
+        """Set value with a TTL in seconds"""
+        if len(self._data) >= self.max_entries:
+            now = time.monotonic()
+            self._data = {k: v for k, v in self._data.items() if v[0] >= now}
+            if len(self._data) >= self.max_entries:
+                # Still full: drop the entry closest to expiry
+                del self._data[min(self._data, key=lambda k: self._data[k][0])]
+        self._data[key] = (time.monotonic() + expire, value)
+    
+    def delete(self, key: str):
+        """Delete key from cache"""
+        self._data.pop(key, None)
+
+
+# Global cache instances
 cache = RedisCache()
+local_cache = LocalCache()
 
 
 # Dependency for FastAPI
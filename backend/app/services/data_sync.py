@@ -1,18 +1,105 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, text, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Tuple, Union
 
 from app.db.models import Team, League, Match, TeamStats, Standing
 from app.services.football_api import get_football_api_client
+from app.services.providers import (
+    FootballProvider, MatchFetchFailed, MatchRecord, StandingRecord, TeamRecord, get_provider
+)
+from app.services.job_runs import record_rows
+
+
+# Recomputes TeamStats for many teams in one statement. Mirrors
+# calculate_team_stats: form/W/D/L/goals/clean sheets come from the last 5
+# finished matches, matches_played counts up to the last 20.
+# {home_filter} and {away_filter} are either empty or restrict each side of the
+# scan to :team_ids.
+TEAM_STATS_REFRESH_SQL = """
+WITH team_matches AS (
+    SELECT home_team_id AS team_id, match_date,
+           COALESCE(home_score, 0) AS scored, COALESCE(away_score, 0) AS conceded
+    FROM matches
+    WHERE status IN ('finished', 'FINISHED') {home_filter}
+    UNION ALL
+    SELECT away_team_id AS team_id, match_date,
+           COALESCE(away_score, 0) AS scored, COALESCE(home_score, 0) AS conceded
+    FROM matches
+    WHERE status IN ('finished', 'FINISHED') {away_filter}
+),
+ranked AS (
+    SELECT team_id, scored, conceded,
+           ROW_NUMBER() OVER (PARTITION BY team_id ORDER BY match_date DESC) AS rn
+    FROM team_matches
+    WHERE team_id IS NOT NULL
+),
+agg AS (
+    SELECT
+        team_id,
+        COALESCE(string_agg(
+            CASE WHEN scored > conceded THEN 'W' WHEN scored < conceded THEN 'L' ELSE 'D' END,
+            '' ORDER BY rn
+        ) FILTER (WHERE rn <= 5), '') AS form,
+        COUNT(*) FILTER (WHERE rn <= 5 AND scored > conceded) AS wins,
+        COUNT(*) FILTER (WHERE rn <= 5 AND scored = conceded) AS draws,
+        COUNT(*) FILTER (WHERE rn <= 5 AND scored < conceded) AS losses,
+        COALESCE(SUM(scored) FILTER (WHERE rn <= 5), 0) AS goals_scored,
+        COALESCE(SUM(conceded) FILTER (WHERE rn <= 5), 0) AS goals_conceded,
+        COUNT(*) FILTER (WHERE rn <= 5 AND conceded = 0) AS clean_sheets,
+        COUNT(*) AS matches_played
+    FROM ranked
+    WHERE rn <= 20
+    GROUP BY team_id
+),
+updated AS (
+    UPDATE team_stats ts
+    SET form = agg.form,
+        wins = agg.wins,
+        draws = agg.draws,
+        losses = agg.losses,
+        goals_scored = agg.goals_scored,
+        goals_conceded = agg.goals_conceded,
+        clean_sheets = agg.clean_sheets,
+        matches_played = agg.matches_played,
+        updated_at = :now
+    FROM agg
+    WHERE ts.team_id = agg.team_id AND ts.season = :season
+    RETURNING ts.team_id
+),
+inserted AS (
+    INSERT INTO team_stats (
+        team_id, season, form, wins, draws, losses,
+        goals_scored, goals_conceded, clean_sheets, matches_played,
+        elo_rating, updated_at
+    )
+    SELECT agg.team_id, :season, agg.form, agg.wins, agg.draws, agg.losses,
+           agg.goals_scored, agg.goals_conceded, agg.clean_sheets, agg.matches_played,
+           1500.0, :now
+    FROM agg
+    WHERE agg.team_id NOT IN (SELECT team_id FROM updated)
+    RETURNING team_id
+)
+SELECT (SELECT COUNT(*) FROM updated) + (SELECT COUNT(*) FROM inserted)
+"""
 
 
 class DataSyncService:
     """Service to sync data from external API to database"""
     
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, api_client=None, provider: Optional[FootballProvider] = None):
+        """
+        Args:
+            db: Session used for all writes
+            api_client: football-data.org client to fetch with; defaults to one
+                on the shared pooled HTTP client
+            provider: Source of the normalized match/standing records; defaults
+                to FOOTBALL_API_PROVIDER (reusing `api_client` for football-data)
+        """
         self.db = db
-        self.api_client = get_football_api_client()
+        self.api_client = api_client or get_football_api_client()
+        self.provider = provider or get_provider(self.api_client)
     
     async def sync_leagues(self) -> int:
         """Sync leagues/competitions from API"""
@@ -40,20 +127,23 @@ class DataSyncService:
         await self.db.commit()
         return synced_count
     
-    async def sync_team(self, team_data: Dict) -> Team:
-        """Sync a single team"""
+    async def sync_team(self, team_data: Union[TeamRecord, Dict]) -> Team:
+        """Sync a single team (a TeamRecord or a football-data.org team dict)"""
+        if not isinstance(team_data, TeamRecord):
+            team_data = TeamRecord.from_football_data(team_data)
+        
         result = await self.db.execute(
-            select(Team).where(Team.external_id == team_data["id"])
+            select(Team).where(Team.external_id == team_data.external_id)
         )
         team = result.scalar_one_or_none()
         
         if not team:
             team = Team(
-                name=team_data["name"],
-                short_name=team_data.get("shortName", team_data["name"][:3]),
-                logo=team_data.get("crest", ""),
-                country=team_data.get("area", {}).get("name", ""),
-                external_id=team_data["id"]
+                name=team_data.name,
+                short_name=team_data.short_name or team_data.name[:3],
+                logo=team_data.crest,
+                country=team_data.country,
+                external_id=team_data.external_id
             )
             self.db.add(team)
             await self.db.commit()
@@ -204,19 +294,77 @@ class DataSyncService:
         Returns:
             Number of matches synced/updated
         """
-        matches_data = await self.api_client.get_matches(
-            competition_id=league_id,
-            date_from=date_from,
-            date_to=date_to
-        )
+        failed = set()
+        grouped = await self.provider.get_matches_grouped([league_id], date_from, date_to, failed=failed)
+        if failed:
+            # Nothing was fetched: leave the sync cursor where it is
+            raise MatchFetchFailed(failed)
+        return await self.ingest_matches(league_id, grouped[league_id], window=(date_from, date_to))
+    
+    async def sync_matches_batch(
+        self,
+        league_ids: List[int],
+        date_from: str,
+        date_to: str,
+        counts: Optional[Dict[int, int]] = None
+    ) -> Dict[int, int]:
+        """Sync a date range for several leagues with batched /matches requests
+        Args:
+            league_ids: League external IDs (football-data.org competition IDs)
+            date_from: Start date in format YYYY-MM-DD
+            date_to: End date in format YYYY-MM-DD
+            counts: Dict filled as each league is committed, so a caller can
+                tell which leagues were done if a later one raises
+        Returns:
+            Number of matches synced/updated per league. Leagues the provider
+            could not fetch are left out and their sync cursors untouched.
+        """
+        failed = set()
+        grouped = await self.provider.get_matches_grouped(league_ids, date_from, date_to, failed=failed)
         
+        counts = {} if counts is None else counts
+        for league_id, matches_data in grouped.items():
+            if league_id in failed:
+                continue
+            counts[league_id] = await self.ingest_matches(league_id, matches_data, window=(date_from, date_to))
+        return counts
+    
+    async def ingest_matches(
+        self,
+        league_id: int,
+        matches_data: Sequence[Union[MatchRecord, Dict]],
+        window: Optional[Tuple[str, str]] = None
+    ) -> int:
+        """Insert or update matches fetched from the API for one league
+        Args:
+            league_id: League external ID
+            matches_data: MatchRecords, or football-data.org /matches entries
+            window: (date_from, date_to) the matches were fetched for. When given,
+                matches the league's sync cursor marks as unchanged are skipped
+                and the cursor is advanced to cover the window.
+        Returns:
+            Number of matches synced/updated
+        """
         synced_count = 0
         updated_count = 0
+        unchanged_count = 0
+        
+        matches_data = [
+            match if isinstance(match, MatchRecord) else MatchRecord.from_football_data(match)
+            for match in matches_data
+        ]
+        
+        cursor = None
+        all_matches = matches_data
+        if window is not None:
+            from app.services.sync_cursors import get_cursor, filter_unchanged
+            cursor = await get_cursor(self.db, league_id)
+            matches_data, unchanged_count = filter_unchanged(cursor, matches_data)
         
         for match_data in matches_data:
             # Sync teams first
-            home_team = await self.sync_team(match_data["homeTeam"])
-            away_team = await self.sync_team(match_data["awayTeam"])
+            home_team = await self.sync_team(match_data.home_team)
+            away_team = await self.sync_team(match_data.away_team)
             
             # Get league from DB
             result = await self.db.execute(
@@ -229,12 +377,12 @@ class DataSyncService:
             
             # Check if match exists
             result = await self.db.execute(
-                select(Match).where(Match.external_id == match_data["id"])
+                select(Match).where(Match.external_id == match_data.external_id)
             )
             existing = result.scalar_one_or_none()
             
             # Map status
-            status = match_data["status"]
+            status = match_data.status
             if status in ["SCHEDULED", "TIMED"]:
                 db_status = "SCHEDULED"
             elif status in ["IN_PLAY", "PAUSED", "HALFTIME"]:
@@ -245,11 +393,18 @@ class DataSyncService:
                 db_status = "SCHEDULED"
             
             if existing:
-                # Update existing match (scores, status, date)
-                existing.status = db_status
-                existing.home_score = match_data["score"]["fullTime"]["home"]
-                existing.away_score = match_data["score"]["fullTime"]["away"]
-                existing.match_date = (datetime.fromisoformat(match_data["utcDate"].replace("Z", "+00:00")) + timedelta(hours=7)).replace(tzinfo=None)
+                # Update existing match (scores, status, date) only if something changed
+                values = {
+                    "status": db_status,
+                    "home_score": match_data.home_score,
+                    "away_score": match_data.away_score,
+                    "match_date": match_data.match_date,
+                }
+                if all(getattr(existing, key) == value for key, value in values.items()):
+                    unchanged_count += 1
+                    continue
+                for key, value in values.items():
+                    setattr(existing, key, value)
                 updated_count += 1
             else:
                 # Create new match
@@ -257,19 +412,24 @@ class DataSyncService:
                     home_team_id=home_team.id,
                     away_team_id=away_team.id,
                     league_id=league.id,
-                    match_date=(datetime.fromisoformat(match_data["utcDate"].replace("Z", "+00:00")) + timedelta(hours=7)).replace(tzinfo=None),
+                    match_date=match_data.match_date,
                     status=db_status,
-                    home_score=match_data["score"]["fullTime"]["home"],
-                    away_score=match_data["score"]["fullTime"]["away"],
-                    venue=match_data.get("venue", ""),
-                    round=str(match_data.get("matchday", "")),
-                    external_id=match_data["id"]
+                    home_score=match_data.home_score,
+                    away_score=match_data.away_score,
+                    venue=match_data.venue,
+                    round=str(match_data.matchday or ""),
+                    external_id=match_data.external_id
                 )
                 self.db.add(match)
                 synced_count += 1
         
+        if window is not None:
+            from app.services.sync_cursors import advance_cursor
+            advance_cursor(self.db, cursor, league_id, window[0], window[1], all_matches)
+        
         await self.db.commit()
-        return synced_count + updated_count
+        record_rows(inserted=synced_count, updated=updated_count, unchanged=unchanged_count)
+        return synced_count + updated_count + unchanged_count
     
     def _map_status(self, api_status: str) -> str:
         """Map API status to our status"""
@@ -391,6 +551,62 @@ class DataSyncService:
         
         return stats
     
+    async def refresh_team_stats(self, team_ids: Optional[List[int]] = None, season: int = 2024) -> int:
+        """Recompute TeamStats for many teams with a single set-based statement
+        Args:
+            team_ids: Internal team IDs to refresh, or None for every team
+            season: Season the stats rows are stored under
+        Returns:
+            Number of team_stats rows inserted or updated
+        """
+        if team_ids is not None and not team_ids:
+            return 0
+        
+        if team_ids is None:
+            sql = TEAM_STATS_REFRESH_SQL.format(home_filter="", away_filter="")
+            stmt = text(sql)
+        else:
+            sql = TEAM_STATS_REFRESH_SQL.format(
+                home_filter="AND home_team_id = ANY(:team_ids)",
+                away_filter="AND away_team_id = ANY(:team_ids)",
+            )
+            stmt = text(sql).bindparams(bindparam("team_ids", type_=ARRAY(Integer)))
+        
+        params = {"season": season, "now": datetime.utcnow()}
+        if team_ids is not None:
+            params["team_ids"] = list(team_ids)
+        
+        result = await self.db.execute(stmt, params)
+        refreshed = result.scalar() or 0
+        await self.db.commit()
+        return refreshed
+    
+    async def refresh_recent_team_stats(self, season: int = 2024) -> int:
+        """Refresh TeamStats only for teams with matches finished since the last refresh
+        The last refresh time is the newest team_stats.updated_at, so the cursor is
+        shared by every worker. Falls back to a full refresh when no stats exist yet.
+        """
+        last_refresh = await self.db.scalar(
+            select(func.max(TeamStats.updated_at)).where(TeamStats.season == season)
+        )
+        if last_refresh is None:
+            return await self.refresh_team_stats(season=season)
+        
+        # match_date is stored as UTC+7 kickoff time, updated_at as UTC. A one day
+        # lookback covers the offset and matches that finish hours after kickoff.
+        since = last_refresh - timedelta(days=1)
+        result = await self.db.execute(
+            select(Match.home_team_id, Match.away_team_id).where(
+                Match.status.in_(["finished", "FINISHED"]),
+                Match.match_date >= since,
+            )
+        )
+        team_ids = set()
+        for home_team_id, away_team_id in result.all():
+            team_ids.update(t for t in (home_team_id, away_team_id) if t is not None)
+        
+        return await self.refresh_team_stats(sorted(team_ids), season=season)
+    
     async def sync_standings(self, league_external_id: int) -> int:
         """
         Sync league standings/table from API
@@ -405,16 +621,19 @@ class DataSyncService:
             raise ValueError(f"League with external_id {league_external_id} not found")
         
         # Fetch standings from API
-        response = await self.api_client.get_competition_standings(league_external_id)
-        standings_list = response.get("standings", [])
-        
-        if not standings_list:
-            return 0
-        
-        # Get the first standings (TOTAL type)
-        standings_data = standings_list[0].get("table", [])
+        standings = await self.provider.get_standings(league_external_id)
+        return await self.ingest_standings(league, standings)
+    
+    async def ingest_standings(self, league: League, standings: Union[List[StandingRecord], Dict]) -> int:
+        """Replace a league's standings
+        Args:
+            league: League the table belongs to
+            standings: StandingRecords, or a football-data.org /standings response
+        """
+        if isinstance(standings, dict):
+            standings = StandingRecord.from_football_data_response(standings)
         
-        if not standings_data:
+        if not standings:
             return 0
         
         synced_count = 0
@@ -428,27 +647,29 @@ class DataSyncService:
         )
         
         # Insert new standings
-        for standing_item in standings_data:
+        for standing_item in standings:
             # Sync team first
-            team = await self.sync_team(standing_item["team"])
+            team = await self.sync_team(standing_item.team)
             
             # Create standing entry
             standing = Standing(
                 league_id=league.id,
                 team_id=team.id,
-                position=standing_item["position"],
-                played=standing_item["playedGames"],
-                won=standing_item["won"],
-                drawn=standing_item["draw"],
-                lost=standing_item["lost"],
-                goals_for=standing_item["goalsFor"],
-                goals_against=standing_item["goalsAgainst"],
-                goal_difference=standing_item["goalDifference"],
-                points=standing_item["points"],
-                form=standing_item.get("form") or ""
+                position=standing_item.position,
+                played=standing_item.played,
+                won=standing_item.won,
+                drawn=standing_item.draw,
+                lost=standing_item.lost,
+                goals_for=standing_item.goals_for,
+                goals_against=standing_item.goals_against,
+                goal_difference=standing_item.goal_difference,
+                points=standing_item.points,
+                form=standing_item.form
             )
             self.db.add(standing)
             synced_count += 1
         
         await self.db.commit()
+        # Standings are replaced wholesale, so every row counts as inserted
+        record_rows(inserted=synced_count)
         return synced_count
@@ -1,32 +1,69 @@
 """
 Enhanced data service combining Football-Data.org + API-Football
+
+API-Football allows 100 requests/day, so every lookup is guarded:
+- results are cached in Redis and in the worker's local cache (Redis may be off),
+- empty/failed answers are cached as misses for API_FOOTBALL_NEGATIVE_CACHE_TTL,
+- once the day's budget is spent (or the provider reports 0 remaining) calls
+  go straight to the database fallback.
 """
 from typing import Optional, Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import logging
 
-from app.services.api_football_client import get_api_football_client
-from app.services.cache import RedisCache
-from app.db.models import Match, Team, TeamStats
+from app.services.api_budget import api_budget
+from app.services.api_football_client import APIFootballClient, get_api_football_client
+from app.services.cache import RedisCache, local_cache
+from app.services.http_clients import API_FOOTBALL
+from app.services.match_archive import matches_history
+from app.db.models import Team, TeamStats
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+MISS_PREFIX = "api_football_miss:"
+
 
 class EnhancedDataService:
     """Service to get enhanced match and team data"""
     
-    def __init__(self, cache: RedisCache):
+    def __init__(self, cache: RedisCache, api_football: Optional[APIFootballClient] = None):
         self.cache = cache
         self.api_football_enabled = settings.API_FOOTBALL_ENABLED
         
-        if self.api_football_enabled and settings.API_FOOTBALL_KEY:
+        if api_football is not None:
+            self.api_football = api_football
+        elif self.api_football_enabled and settings.API_FOOTBALL_KEY:
+            # Shared client: requests reuse the pooled API-Football connection
             self.api_football = get_api_football_client(settings.API_FOOTBALL_KEY)
         else:
             self.api_football = None
             logger.info("API-Football is disabled or no API key provided")
     
+    async def _get_cached(self, cache_key: str) -> Optional[Any]:
+        """Shared cache first, then this worker's local cache"""
+        cached = await self.cache.get(cache_key)
+        if cached is None:
+            cached = local_cache.get(cache_key)
+        return cached
+    
+    async def _set_cached(self, cache_key: str, value: Any, expire: int):
+        await self.cache.set(cache_key, value, expire=expire)
+        local_cache.set(cache_key, value, expire=expire)
+    
+    async def _should_call_api(self, cache_key: str) -> bool:
+        """API-Football enabled, no recent miss for this key and quota left today"""
+        if not self.api_football:
+            return False
+        if await self._get_cached(MISS_PREFIX + cache_key) is not None:
+            return False
+        return not await api_budget.is_exhausted(API_FOOTBALL)
+    
+    async def _remember_miss(self, cache_key: str):
+        """Cache an empty/failed API-Football answer so it is not re-requested"""
+        await self._set_cached(MISS_PREFIX + cache_key, True, expire=settings.API_FOOTBALL_NEGATIVE_CACHE_TTL)
+    
     async def get_team_statistics(
         self, 
         team_id: int, 
@@ -41,20 +78,21 @@ class EnhancedDataService:
         cache_key = f"team_stats:{team_id}:{league_id}:{season}"
         
         # Check cache first
-        cached = await self.cache.get(cache_key)
-        if cached:
+        cached = await self._get_cached(cache_key)
+        if cached is not None:
             return cached
         
         # Try API-Football if enabled
-        if self.api_football:
+        if await self._should_call_api(cache_key):
             try:
                 stats = await self.api_football.get_team_statistics(team_id, league_id, season)
                 if stats:
                     # Cache for 1 hour
-                    await self.cache.set(cache_key, stats, expire=3600)
+                    await self._set_cached(cache_key, stats, expire=3600)
                     return stats
             except Exception as e:
                 logger.error(f"API-Football failed for team stats: {e}")
+            await self._remember_miss(cache_key)
         
         # Fallback to database
         result = await db.execute(
@@ -96,7 +134,7 @@ class EnhancedDataService:
                 "cleanSheet": {"total": team_stats.clean_sheets or 0},
             }
             # Cache for 30 minutes
-            await self.cache.set(cache_key, stats, expire=1800)
+            await self._set_cached(cache_key, stats, expire=1800)
             return stats
         
         return None
@@ -114,61 +152,66 @@ class EnhancedDataService:
         cache_key = f"h2h:{team1_id}:{team2_id}:{last}"
         
         # Check cache
-        cached = await self.cache.get(cache_key)
-        if cached:
+        cached = await self._get_cached(cache_key)
+        if cached is not None:
             return cached
         
         # Try API-Football if enabled
-        if self.api_football:
+        if await self._should_call_api(cache_key):
             try:
                 h2h_matches = await self.api_football.get_head_to_head(team1_id, team2_id, last)
                 if h2h_matches:
                     # Cache for 6 hours
-                    await self.cache.set(cache_key, h2h_matches, expire=21600)
+                    await self._set_cached(cache_key, h2h_matches, expire=21600)
                     return h2h_matches
             except Exception as e:
                 logger.error(f"API-Football failed for H2H: {e}")
+            await self._remember_miss(cache_key)
         
-        # Fallback to database
+        # Fallback to database (archived seasons included)
         from sqlalchemy import and_, or_
-        from sqlalchemy.orm import selectinload
+        from sqlalchemy.orm import aliased
         
+        h = matches_history.c
+        home_team, away_team = aliased(Team), aliased(Team)
         query = (
-            select(Match)
-            .options(
-                selectinload(Match.home_team),
-                selectinload(Match.away_team),
-                selectinload(Match.league)
+            select(
+                h.id, h.match_date, h.home_score, h.away_score,
+                home_team.id.label("home_id"), home_team.name.label("home_name"), home_team.logo.label("home_logo"),
+                away_team.id.label("away_id"), away_team.name.label("away_name"), away_team.logo.label("away_logo"),
             )
+            .select_from(matches_history)
+            .join(home_team, home_team.id == h.home_team_id)
+            .join(away_team, away_team.id == h.away_team_id)
             .where(
                 and_(
-                    Match.status == "finished",
+                    h.status == "finished",
                     or_(
-                        and_(Match.home_team_id == team1_id, Match.away_team_id == team2_id),
-                        and_(Match.home_team_id == team2_id, Match.away_team_id == team1_id)
+                        and_(h.home_team_id == team1_id, h.away_team_id == team2_id),
+                        and_(h.home_team_id == team2_id, h.away_team_id == team1_id)
                     )
                 )
             )
-            .order_by(Match.match_date.desc())
+            .order_by(h.match_date.desc())
             .limit(last)
         )
         
         result = await db.execute(query)
-        matches = result.scalars().all()
+        matches = result.all()
         
         h2h_data = [
             {
                 "fixtureId": match.id,
                 "date": match.match_date.isoformat(),
                 "homeTeam": {
-                    "id": match.home_team.id,
-                    "name": match.home_team.name,
-                    "logo": match.home_team.logo,
+                    "id": match.home_id,
+                    "name": match.home_name,
+                    "logo": match.home_logo,
                 },
                 "awayTeam": {
-                    "id": match.away_team.id,
-                    "name": match.away_team.name,
-                    "logo": match.away_team.logo,
+                    "id": match.away_id,
+                    "name": match.away_name,
+                    "logo": match.away_logo,
                 },
                 "score": {
                     "home": match.home_score,
@@ -184,7 +227,7 @@ class EnhancedDataService:
         ]
         
         # Cache for 6 hours
-        await self.cache.set(cache_key, h2h_data, expire=21600)
+        await self._set_cached(cache_key, h2h_data, expire=21600)
         return h2h_data
     
     async def get_match_statistics(
@@ -202,19 +245,23 @@ class EnhancedDataService:
         cache_key = f"match_stats:{match_id}"
         
         # Check cache
-        cached = await self.cache.get(cache_key)
-        if cached:
+        cached = await self._get_cached(cache_key)
+        if cached is not None:
             return cached
         
+        if not await self._should_call_api(cache_key):
+            return None
+        
         try:
             stats = await self.api_football.get_match_statistics(external_fixture_id)
             if stats:
                 # Cache for 15 minutes (live matches change frequently)
-                await self.cache.set(cache_key, stats, expire=900)
+                await self._set_cached(cache_key, stats, expire=900)
                 return stats
         except Exception as e:
             logger.error(f"Failed to get match statistics: {e}")
         
+        await self._remember_miss(cache_key)
         return None
     
     async def get_ai_prediction(
@@ -232,19 +279,23 @@ class EnhancedDataService:
         cache_key = f"api_prediction:{match_id}"
         
         # Check cache
-        cached = await self.cache.get(cache_key)
-        if cached:
+        cached = await self._get_cached(cache_key)
+        if cached is not None:
             return cached
         
+        if not await self._should_call_api(cache_key):
+            return None
+        
         try:
             prediction = await self.api_football.get_predictions(external_fixture_id)
             if prediction:
                 # Cache for 24 hours (predictions don't change)
-                await self.cache.set(cache_key, prediction, expire=86400)
+                await self._set_cached(cache_key, prediction, expire=86400)
                 return prediction
         except Exception as e:
             logger.error(f"Failed to get API prediction: {e}")
         
+        await self._remember_miss(cache_key)
         return None
     
     async def get_team_injuries(
@@ -263,19 +314,23 @@ class EnhancedDataService:
         cache_key = f"injuries:{team_id}:{league_id}:{season}"
         
         # Check cache
-        cached = await self.cache.get(cache_key)
-        if cached:
+        cached = await self._get_cached(cache_key)
+        if cached is not None:
             return cached
         
+        if not await self._should_call_api(cache_key):
+            return []
+        
         try:
             injuries = await self.api_football.get_team_injuries(team_id, league_id, season)
             if injuries:
                 # Cache for 6 hours
-                await self.cache.set(cache_key, injuries, expire=21600)
+                await self._set_cached(cache_key, injuries, expire=21600)
                 return injuries
         except Exception as e:
             logger.error(f"Failed to get team injuries: {e}")
         
+        await self._remember_miss(cache_key)
         return []
     
     async def check_api_status(self) -> Dict[str, Any]:
@@ -292,6 +347,7 @@ class EnhancedDataService:
                 "enabled": True,
                 "requests": status.get("requests", {}),
                 "email": status.get("email", ""),
+                "quotaExhausted": await api_budget.is_exhausted(API_FOOTBALL),
             }
         except Exception as e:
             logger.error(f"Failed to check API status: {e}")
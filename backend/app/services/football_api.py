@@ -1,43 +1,150 @@
+import asyncio
 import httpx
-from typing import List, Dict, Optional
+import logging
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
-import os
+import re
 
 from app.core.config import settings
+from app.services.api_budget import api_budget
+from app.services.http_cache import http_cache
+from app.services.http_clients import http_clients, FOOTBALL_DATA
+from app.services.job_runs import record_api_request
+from app.services.json_stream import iter_json_items
+from app.services.rate_limiter import football_data_limiter
+from app.services.resilience import backoff_delay, get_breaker, send_with_retry
+
+logger = logging.getLogger(__name__)
 
 
 class FootballAPIClient:
     """Client for football-data.org API"""
     
-    def __init__(self):
+    # /matches rejects date windows longer than 10 days
+    MAX_MATCHES_WINDOW_DAYS = 10
+    
+    # Slow-changing endpoints served from the HTTP cache: (name, path pattern, TTL seconds)
+    CACHE_TTLS = (
+        ("competitions", re.compile(r"^/competitions$"), 24 * 3600),
+        ("standings", re.compile(r"^/competitions/\d+/standings$"), settings.HTTP_CACHE_STANDINGS_TTL),
+        ("teams", re.compile(r"^/teams/\d+$"), 7 * 24 * 3600),
+    )
+    
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.base_url = settings.FOOTBALL_API_BASE_URL
         self.api_key = settings.FOOTBALL_API_KEY
         self.headers = {
             "X-Auth-Token": self.api_key
         }
+        self.limiter = football_data_limiter
+        self._http = http_client
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Injected client, or the shared pooled one for football-data.org"""
+        return self._http or http_clients.get(FOOTBALL_DATA)
+    
+    def _cache_policy(self, path: str) -> Tuple[Optional[str], Optional[int]]:
+        """(endpoint name, TTL) if `path` is cacheable"""
+        for name, pattern, ttl in self.CACHE_TTLS:
+            if pattern.match(path):
+                return name, ttl
+        return None, None
+    
+    async def _send(self, path: str, params: Optional[Dict], headers: Dict, stream: bool = False) -> httpx.Response:
+        """One budgeted, rate-limited GET with retries (see resilience)
+        With `stream` the body is not read yet; the caller must close the response.
+        """
+        async def send() -> httpx.Response:
+            await api_budget.reserve(FOOTBALL_DATA)
+            await self.limiter.acquire()
+            record_api_request()
+            request = self.http.build_request(
+                "GET",
+                f"{self.base_url}{path}",
+                headers=headers,
+                params=params
+            )
+            response = await self.http.send(request, stream=stream)
+            self.limiter.update_from_headers(response.headers)
+            return response
+        
+        return await send_with_retry(FOOTBALL_DATA, send)
+    
+    async def _stream(self, path: str, params: Optional[Dict], key: str) -> AsyncIterator[Dict]:
+        """Like _get, but yields the items of the `key` array as they are decoded
+        Used for /matches, whose season-sized bodies are never cached.
+        The body is read after send_with_retry has returned, so a timeout or
+        dropped connection mid-body is handled here: it counts as a breaker
+        failure and the whole request is sent again (budget, limiter and breaker
+        included), skipping items already yielded.
+        """
+        attempts = settings.PROVIDER_RETRY_ATTEMPTS
+        yielded = set()
+        for attempt in range(attempts):
+            response = await self._send(path, params, self.headers, stream=True)
+            try:
+                response.raise_for_status()
+                async for item in iter_json_items(response, key):
+                    item_id = item.get("id")
+                    if item_id is not None:
+                        if item_id in yielded:
+                            continue
+                        yielded.add(item_id)
+                    yield item
+                return
+            except httpx.TransportError as e:
+                get_breaker(FOOTBALL_DATA).record_failure(e)
+                if attempt + 1 >= attempts:
+                    raise
+                delay = backoff_delay(attempt, settings.PROVIDER_RETRY_BASE_DELAY, settings.PROVIDER_RETRY_MAX_DELAY)
+                logger.warning(f"🔁 {FOOTBALL_DATA} body read failed ({e!r}), retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            finally:
+                await response.aclose()
+    
+    async def _get(self, path: str, params: Optional[Dict] = None) -> Dict:
+        """Budgeted, rate-limited GET request, returns the decoded JSON body
+        Cacheable paths are served from the HTTP cache while fresh and
+        revalidated with conditional requests once stale.
+        Timeouts, 429s and 5xx responses are retried with backoff (see resilience).
+        Raises ApiBudgetExceeded when today's share for the current priority is
+        spent, CircuitOpen while football-data.org keeps failing.
+        """
+        endpoint, ttl = self._cache_policy(path)
+        key = entry = None
+        headers = self.headers
+        if ttl is not None:
+            key = http_cache.make_key(FOOTBALL_DATA, path, params)
+            entry = await http_cache.get(key)
+            if entry is not None and entry.is_fresh:
+                http_cache.stats.record(endpoint, "hits")
+                return entry.body
+            if entry is not None:
+                headers = {**self.headers, **entry.conditional_headers()}
+        
+        response = await self._send(path, params, headers)
+        
+        if response.status_code == 304 and entry is not None:
+            http_cache.stats.record(endpoint, "revalidated")
+            await http_cache.touch(key, entry, response.headers)
+            return entry.body
+        
+        response.raise_for_status()
+        data = response.json()
+        if ttl is not None:
+            http_cache.stats.record(endpoint, "misses")
+            await http_cache.store(key, data, ttl, response.headers)
+        return data
     
     async def get_competitions(self) -> List[Dict]:
         """Get available competitions/leagues"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/competitions",
-                headers=self.headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("competitions", [])
+        data = await self._get("/competitions")
+        return data.get("competitions", [])
     
     async def get_competition_standings(self, competition_id: int) -> Dict:
         """Get standings for a competition"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/competitions/{competition_id}/standings",
-                headers=self.headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._get(f"/competitions/{competition_id}/standings")
     
     async def get_matches(
         self,
@@ -56,29 +163,63 @@ class FootballAPIClient:
         if status:
             params["status"] = status
         
-        url = f"{self.base_url}/competitions/{competition_id}/matches" if competition_id else f"{self.base_url}/matches"
+        path = f"/competitions/{competition_id}/matches" if competition_id else "/matches"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=self.headers,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("matches", [])
+        return [match async for match in self._stream(path, params, "matches")]
+    
+    async def iter_matches_multi(
+        self,
+        competition_ids: List[int],
+        date_from: str,
+        date_to: str,
+        status: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        """Stream matches for several competitions with one request per date chunk
+        Uses /matches?competitions=..., which allows at most MAX_MATCHES_WINDOW_DAYS
+        per request, so longer windows are split into chunks.
+        """
+        if not competition_ids:
+            return
+        
+        start = datetime.strptime(date_from, "%Y-%m-%d").date()
+        end = datetime.strptime(date_to, "%Y-%m-%d").date()
+        
+        while start <= end:
+            chunk_end = min(start + timedelta(days=self.MAX_MATCHES_WINDOW_DAYS - 1), end)
+            params = {
+                "competitions": ",".join(str(c) for c in competition_ids),
+                "dateFrom": start.strftime("%Y-%m-%d"),
+                "dateTo": chunk_end.strftime("%Y-%m-%d"),
+            }
+            if status:
+                params["status"] = status
+            
+            async for match in self._stream("/matches", params, "matches"):
+                yield match
+            
+            start = chunk_end + timedelta(days=1)
+    
+    async def get_matches_multi(
+        self,
+        competition_ids: List[int],
+        date_from: str,
+        date_to: str,
+        status: Optional[str] = None
+    ) -> Dict[int, List[Dict]]:
+        """Get matches for several competitions, see iter_matches_multi
+        Returns:
+            Matches grouped by competition ID (every requested ID is present)
+        """
+        grouped: Dict[int, List[Dict]] = {competition_id: [] for competition_id in competition_ids}
+        async for match in self.iter_matches_multi(competition_ids, date_from, date_to, status):
+            competition_id = match.get("competition", {}).get("id")
+            if competition_id in grouped:
+                grouped[competition_id].append(match)
+        return grouped
     
     async def get_team(self, team_id: int) -> Dict:
         """Get team details"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/teams/{team_id}",
-                headers=self.headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._get(f"/teams/{team_id}")
     
     async def get_team_matches(
         self,
@@ -93,88 +234,9 @@ class FootballAPIClient:
         if date_to:
             params["dateTo"] = date_to
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/teams/{team_id}/matches",
-                headers=self.headers,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("matches", [])
-
-
-# Alternative: API-Football (RapidAPI)
-class APIFootballClient:
-    """Client for API-Football (RapidAPI)"""
-    
-    def __init__(self):
-        self.base_url = "https://api-football-v1.p.rapidapi.com/v3"
-        self.api_key = os.getenv("RAPID_API_KEY", "")
-        self.headers = {
-            "X-RapidAPI-Key": self.api_key,
-            "X-RapidAPI-Host": "api-football-v1.p.rapidapi.com"
-        }
-    
-    async def get_leagues(self, season: int = 2024) -> List[Dict]:
-        """Get leagues"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/leagues",
-                headers=self.headers,
-                params={"season": season},
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("response", [])
-    
-    async def get_fixtures(
-        self,
-        league_id: Optional[int] = None,
-        date: Optional[str] = None,
-        status: Optional[str] = None
-    ) -> List[Dict]:
-        """Get fixtures/matches"""
-        params = {}
-        if league_id:
-            params["league"] = league_id
-        if date:
-            params["date"] = date
-        if status:
-            params["status"] = status
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/fixtures",
-                headers=self.headers,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("response", [])
-    
-    async def get_standings(self, league_id: int, season: int = 2024) -> List[Dict]:
-        """Get league standings"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/standings",
-                headers=self.headers,
-                params={"league": league_id, "season": season},
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("response", [])
+        return [match async for match in self._stream(f"/teams/{team_id}/matches", params, "matches")]
 
 
-# Factory to get the right client
-def get_football_api_client():
-    provider = settings.FOOTBALL_API_PROVIDER if hasattr(settings, 'FOOTBALL_API_PROVIDER') else "football-data.org"
-    
-    if provider == "api-football":
-        return APIFootballClient()
-    else:
-        return FootballAPIClient()
+# Other providers are reached through app.services.providers
+def get_football_api_client(http_client: Optional[httpx.AsyncClient] = None) -> FootballAPIClient:
+    return FootballAPIClient(http_client)
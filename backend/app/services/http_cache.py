@@ -0,0 +1,190 @@
+"""
+HTTP response cache for provider API calls
+
+Slow-changing provider payloads (competitions, standings, teams) are stored
+with their ETag / Last-Modified validators and a freshness TTL:
+- fresh entry: served without any network call (no quota spent),
+- stale entry with validators: conditional request; a 304 reuses the body,
+- otherwise a normal request whose response replaces the entry.
+Entries live in Redis when it is connected, else on local disk
+(HTTP_CACHE_BACKEND). Hit/revalidation counters are per process and exposed
+through GET /api/v1/admin/metrics/http-cache.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.services.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Stale entries are kept this long so they can still be revalidated with a 304
+STALE_RETENTION_SECONDS = 7 * 24 * 3600
+
+
+@dataclass
+class CachedResponse:
+    body: Any
+    stored_at: float
+    ttl: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() - self.stored_at < self.ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class DiskBackend:
+    """One JSON file per entry under `directory`"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def _read(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, data: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        # Atomic: concurrent readers never see a half-written entry
+        os.replace(tmp, path)
+
+    async def get(self, key: str) -> Optional[Dict]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, data: Dict):
+        await asyncio.to_thread(self._write, key, data)
+
+
+class RedisBackend:
+    """Entries in the shared Redis cache (visible to every worker)"""
+
+    PREFIX = "http_cache:"
+
+    async def get(self, key: str) -> Optional[Dict]:
+        return await cache.get(self.PREFIX + key)
+
+    async def set(self, key: str, data: Dict):
+        await cache.set(self.PREFIX + key, data, expire=data["ttl"] + STALE_RETENTION_SECONDS)
+
+
+class HTTPCacheStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started_at = datetime.utcnow()
+        self.hits = 0  # Served fresh, no request
+        self.revalidated = 0  # 304 Not Modified, body reused
+        self.misses = 0  # Full response fetched
+        self.by_endpoint: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: str, outcome: str):
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        counters = self.by_endpoint.setdefault(endpoint, {"hits": 0, "revalidated": 0, "misses": 0})
+        counters[outcome] += 1
+
+    def snapshot(self) -> Dict:
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            "since": self.started_at.isoformat(),
+            "lookups": lookups,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+            # Fresh hits never reach the provider; 304s still count against quota
+            "requestsSaved": self.hits,
+            "byEndpoint": self.by_endpoint,
+        }
+
+
+class HTTPCache:
+    """Validator-aware response cache shared by the provider clients"""
+
+    def __init__(self, mode: str = "auto", directory: Optional[str] = None):
+        self.mode = mode
+        self.disk = DiskBackend(directory or os.path.join(tempfile.gettempdir(), "scoreflow-http-cache"))
+        self.redis = RedisBackend()
+        self.stats = HTTPCacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @property
+    def backend(self):
+        if self.mode == "redis" or (self.mode == "auto" and cache.redis_client is not None):
+            return self.redis
+        return self.disk
+
+    @staticmethod
+    def make_key(provider: str, path: str, params: Optional[Dict] = None) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return f"{provider}:{path}?{query}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+        try:
+            data = await self.backend.get(key)
+            return CachedResponse(**data) if data else None
+        except Exception as e:
+            logger.warning(f"⚠️  HTTP cache read failed: {e}")
+            return None
+
+    async def store(self, key: str, body: Any, ttl: int, headers) -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+        entry = CachedResponse(
+            body=body,
+            stored_at=time.time(),
+            ttl=ttl,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+        )
+        await self._put(key, entry)
+        return entry
+
+    async def touch(self, key: str, entry: CachedResponse, headers):
+        """Entry revalidated by a 304: restart its TTL, keep newer validators"""
+        entry.stored_at = time.time()
+        entry.etag = headers.get("etag") or entry.etag
+        entry.last_modified = headers.get("last-modified") or entry.last_modified
+        await self._put(key, entry)
+
+    async def _put(self, key: str, entry: CachedResponse):
+        try:
+            await self.backend.set(key, asdict(entry))
+        except Exception as e:
+            logger.warning(f"⚠️  HTTP cache write failed: {e}")
+
+
+http_cache = HTTPCache(mode=settings.HTTP_CACHE_BACKEND, directory=settings.HTTP_CACHE_DIR or None)
@@ -0,0 +1,76 @@
+"""
+Shared pooled HTTP clients for external football data providers
+
+One httpx.AsyncClient per provider keeps TCP/TLS connections alive between
+requests instead of paying DNS + TCP + TLS handshakes on every call.
+Clients are created on first use (so the CLI and worker need no setup) and
+closed by the API lifespan / worker shutdown via `http_clients.aclose()`.
+HTTP/2 is used when HTTP2_ENABLED is set and the optional `h2` package is
+installed (pip install "httpx[http2]"); otherwise HTTP/1.1 keep-alive.
+"""
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (optional, enables httpx HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+FOOTBALL_DATA = "football-data"
+API_FOOTBALL = "api-football"
+
+
+class HTTPClientRegistry:
+    """Lazily created, long-lived httpx clients keyed by provider"""
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 30.0,
+        http2: bool = True,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=10.0)
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """Pooled client for `provider` (created on first use)"""
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2)
+            self._clients[provider] = client
+            logger.info(f"🔌 HTTP client for {provider} ready ({'HTTP/2' if self.http2 else 'HTTP/1.1 keep-alive'})")
+        return client
+
+    def set(self, provider: str, client: Optional[httpx.AsyncClient]):
+        """Inject a client (e.g. pointed at a mock server); None resets to default"""
+        if client is None:
+            self._clients.pop(provider, None)
+        else:
+            self._clients[provider] = client
+
+    async def aclose(self):
+        """Close every pooled client (lifespan / worker shutdown)"""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"⚠️  Error closing HTTP client: {e}")
+
+
+http_clients = HTTPClientRegistry(http2=settings.HTTP2_ENABLED)
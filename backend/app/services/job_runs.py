@@ -0,0 +1,355 @@
+"""
+Persistent job-run history
+
+Every scheduler job and seed run writes a row to `job_runs`: start/end,
+duration, API requests spent, rows inserted/updated/unchanged and errors.
+Counters are collected through a ContextVar, so FootballAPIClient and
+DataSyncService record into whichever run is active without it being passed
+around. Rows are written on their own short sessions, so a job rolling back
+its work never loses its run record, and any worker (or API process) can read
+the status of a run started elsewhere.
+"""
+import functools
+import logging
+import os
+import socket
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import AsyncSessionLocal
+from app.db.models import JobRun
+
+logger = logging.getLogger(__name__)
+
+WORKER_IDENTITY = f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class JobRunCounters:
+    """Counters for the run active in the current context"""
+    run_id: Optional[int] = None
+    api_requests: int = 0
+    rows_inserted: int = 0
+    rows_updated: int = 0
+    rows_unchanged: int = 0
+    errors: List[str] = field(default_factory=list)
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+# The counters object is shared with child tasks (asyncio copies the context),
+# so increments made inside the seed pipeline's producers are visible here.
+_current_run: ContextVar[Optional[JobRunCounters]] = ContextVar("current_job_run", default=None)
+
+
+def current_run() -> Optional[JobRunCounters]:
+    return _current_run.get()
+
+
+def record_api_request(count: int = 1):
+    """Count an outgoing provider request against the active run"""
+    run = _current_run.get()
+    if run is not None:
+        run.api_requests += count
+
+
+def record_rows(inserted: int = 0, updated: int = 0, unchanged: int = 0):
+    """Count ingested rows against the active run"""
+    run = _current_run.get()
+    if run is not None:
+        run.rows_inserted += inserted
+        run.rows_updated += updated
+        run.rows_unchanged += unchanged
+
+
+def record_job_error(error: Any):
+    """Record an error the job handled itself; the run is marked failed"""
+    run = _current_run.get()
+    if run is not None:
+        run.errors.append(str(error))
+
+
+async def _write(statement) -> Optional[Any]:
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(statement)
+            await db.commit()
+            return result
+    except Exception as e:
+        # Never fail a sync because its bookkeeping could not be written
+        logger.warning(f"⚠️  Could not write job run: {e}")
+        return None
+
+
+async def update_job_progress(**details):
+    """Merge progress details into the active run and persist them immediately"""
+    run = _current_run.get()
+    if run is None:
+        return
+    now = datetime.utcnow()
+    run.details.update(details, updated_at=now.isoformat())
+    if run.run_id is not None:
+        await _write(
+            update(JobRun)
+            .where(JobRun.id == run.run_id)
+            .values(
+                heartbeat_at=now,
+                details=dict(run.details),
+                api_requests=run.api_requests,
+                rows_inserted=run.rows_inserted,
+                rows_updated=run.rows_updated,
+                rows_unchanged=run.rows_unchanged,
+            )
+        )
+
+
+@asynccontextmanager
+async def track_job_run(job_name: str, trigger: str = "scheduler", run_id: Optional[int] = None):
+    """Record one run of `job_name`
+    Args:
+        job_name: Scheduler job id or "seed"
+        trigger: Who started it (scheduler, admin, cli, worker)
+        run_id: Existing queued row to continue instead of inserting a new one
+    """
+    started_at = datetime.utcnow()
+    counters = JobRunCounters(run_id=run_id)
+
+    if run_id is not None:
+        await _write(
+            update(JobRun)
+            .where(JobRun.id == run_id)
+            .values(status="running", started_at=started_at, heartbeat_at=started_at, worker=WORKER_IDENTITY)
+        )
+    else:
+        result = await _write(
+            JobRun.__table__.insert()
+            .values(
+                job_name=job_name,
+                trigger=trigger,
+                status="running",
+                worker=WORKER_IDENTITY,
+                started_at=started_at,
+                heartbeat_at=started_at,
+                details={},
+            )
+            .returning(JobRun.id)
+        )
+        if result is not None:
+            counters.run_id = result.scalar()
+
+    token = _current_run.set(counters)
+    error = None
+    try:
+        yield counters
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_run.reset(token)
+        if error is None and counters.errors:
+            error = "; ".join(counters.errors)
+        finished_at = datetime.utcnow()
+        if counters.run_id is not None:
+            await _write(
+                update(JobRun)
+                .where(JobRun.id == counters.run_id)
+                .values(
+                    status="failed" if error else "success",
+                    finished_at=finished_at,
+                    duration_ms=int((finished_at - started_at).total_seconds() * 1000),
+                    api_requests=counters.api_requests,
+                    rows_inserted=counters.rows_inserted,
+                    rows_updated=counters.rows_updated,
+                    rows_unchanged=counters.rows_unchanged,
+                    error=error[:2000] if error else None,
+                    details=dict(counters.details),
+                )
+            )
+
+
+def tracked_job(job_name: str, trigger: str = "scheduler"):
+    """Decorator recording every call of an async job in job_runs"""
+    def decorator(job):
+        @functools.wraps(job)
+        async def wrapper(*args, **kwargs):
+            async with track_job_run(job_name, trigger=trigger):
+                return await job(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- Queue (SYNC_MODE=worker) ---
+
+async def queue_job_run(db: AsyncSession, job_name: str, trigger: str = "admin") -> JobRun:
+    """Queue a run for the sync worker to pick up"""
+    run = JobRun(
+        job_name=job_name,
+        trigger=trigger,
+        status="queued",
+        queued_at=datetime.utcnow(),
+        details={"message": "Queued, waiting for the sync worker..."},
+    )
+    db.add(run)
+    await db.commit()
+    await db.refresh(run)
+    return run
+
+
+async def claim_queued_run(job_name: str) -> Optional[int]:
+    """Atomically take the oldest queued run of `job_name` (safe across workers)"""
+    result = await _write(
+        text(
+            "UPDATE job_runs SET status = 'running', started_at = :now, heartbeat_at = :now, worker = :worker "
+            "WHERE id = ("
+            "  SELECT id FROM job_runs WHERE job_name = :job_name AND status = 'queued' "
+            "  ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED"
+            ") RETURNING id"
+        ).bindparams(now=datetime.utcnow(), worker=WORKER_IDENTITY, job_name=job_name)
+    )
+    return result.scalar() if result is not None else None
+
+
+# --- Reporting ---
+
+async def get_active_run(db: AsyncSession, job_name: str, stale_after: timedelta = timedelta(hours=6)) -> Optional[JobRun]:
+    """Queued or running run of `job_name`, if any
+    Runs older than `stale_after` are ignored: their worker most likely died.
+    """
+    result = await db.execute(
+        select(JobRun)
+        .where(
+            JobRun.job_name == job_name,
+            JobRun.status.in_(["queued", "running"]),
+            func.coalesce(JobRun.started_at, JobRun.queued_at) >= datetime.utcnow() - stale_after,
+        )
+        .order_by(JobRun.id.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def fail_stale_runs(job_name: str, stale_after: timedelta) -> List[JobRun]:
+    """Mark running runs without a heartbeat for `stale_after` as failed
+    Returns the interrupted runs so the caller can resume them.
+    """
+    cutoff = datetime.utcnow() - stale_after
+    result = await _write(
+        update(JobRun)
+        .where(
+            JobRun.job_name == job_name,
+            JobRun.status == "running",
+            func.coalesce(JobRun.heartbeat_at, JobRun.started_at) < cutoff,
+        )
+        .values(status="failed", finished_at=datetime.utcnow(), error="Interrupted: worker stopped sending heartbeats")
+        .returning(JobRun)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars().all()) if result is not None else []
+
+
+async def get_recent_runs(db: AsyncSession, job_name: Optional[str] = None, limit: int = 20) -> List[JobRun]:
+    query = select(JobRun).order_by(JobRun.id.desc()).limit(limit)
+    if job_name:
+        query = query.where(JobRun.job_name == job_name)
+    return list((await db.execute(query)).scalars().all())
+
+
+async def get_last_runs(db: AsyncSession) -> Dict[str, JobRun]:
+    """Most recent run of every job"""
+    result = await db.execute(
+        select(JobRun)
+        .distinct(JobRun.job_name)
+        .order_by(JobRun.job_name, JobRun.id.desc())
+    )
+    return {run.job_name: run for run in result.scalars().all()}
+
+
+async def get_latest_run(db: AsyncSession, job_name: str) -> Optional[JobRun]:
+    result = await db.execute(
+        select(JobRun).where(JobRun.job_name == job_name).order_by(JobRun.id.desc()).limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+def serialize_run(run: JobRun) -> Dict:
+    return {
+        "id": run.id,
+        "job": run.job_name,
+        "trigger": run.trigger,
+        "status": run.status,
+        "worker": run.worker,
+        "queuedAt": run.queued_at.isoformat() if run.queued_at else None,
+        "startedAt": run.started_at.isoformat() if run.started_at else None,
+        "heartbeatAt": run.heartbeat_at.isoformat() if run.heartbeat_at else None,
+        "finishedAt": run.finished_at.isoformat() if run.finished_at else None,
+        "durationMs": run.duration_ms,
+        "apiRequests": run.api_requests,
+        "rowsInserted": run.rows_inserted,
+        "rowsUpdated": run.rows_updated,
+        "rowsUnchanged": run.rows_unchanged,
+        "error": run.error,
+        "details": run.details or {},
+    }
+
+
+JOB_RUN_PERCENTILES_SQL = text("""
+SELECT
+    job_name,
+    COUNT(*) AS runs,
+    COUNT(*) FILTER (WHERE status = 'failed') AS failures,
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms) AS p50_ms,
+    percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms) AS p95_ms,
+    percentile_cont(0.99) WITHIN GROUP (ORDER BY duration_ms) AS p99_ms,
+    MAX(duration_ms) AS max_ms,
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY api_requests) AS p50_api_requests,
+    percentile_cont(0.95) WITHIN GROUP (ORDER BY api_requests) AS p95_api_requests,
+    SUM(api_requests) AS api_requests,
+    SUM(rows_inserted) AS rows_inserted,
+    SUM(rows_updated) AS rows_updated,
+    SUM(rows_unchanged) AS rows_unchanged,
+    MAX(finished_at) AS last_finished_at
+FROM job_runs
+WHERE started_at >= :since AND status IN ('success', 'failed')
+GROUP BY job_name
+ORDER BY job_name
+""")
+
+
+async def get_job_percentiles(db: AsyncSession, days: int = 7) -> List[Dict]:
+    """Duration and API-cost percentiles per job over the last `days` days"""
+    since = datetime.utcnow() - timedelta(days=days)
+    rows = (await db.execute(JOB_RUN_PERCENTILES_SQL, {"since": since})).mappings().all()
+
+    def _round(value):
+        return round(float(value), 1) if value is not None else None
+
+    return [
+        {
+            "job": row["job_name"],
+            "runs": row["runs"],
+            "failures": row["failures"],
+            "durationMs": {
+                "p50": _round(row["p50_ms"]),
+                "p95": _round(row["p95_ms"]),
+                "p99": _round(row["p99_ms"]),
+                "max": row["max_ms"],
+            },
+            "apiRequests": {
+                "p50": _round(row["p50_api_requests"]),
+                "p95": _round(row["p95_api_requests"]),
+                "total": row["api_requests"],
+            },
+            "rows": {
+                "inserted": row["rows_inserted"],
+                "updated": row["rows_updated"],
+                "unchanged": row["rows_unchanged"],
+            },
+            "lastFinishedAt": row["last_finished_at"].isoformat() if row["last_finished_at"] else None,
+        }
+        for row in rows
+    ]
@@ -0,0 +1,53 @@
+"""
+Incremental decoding of large provider JSON responses
+
+`iter_json_items` yields the elements of one top-level array (e.g. the
+`matches` of a competition season) while the body is still downloading, so
+only one element is materialised at a time instead of the raw body plus the
+full dict tree. Uses `ijson` (in requirements.txt); if it cannot be imported
+the body is read and decoded with `response.json()` as a safety net, which
+warn_if_fallback() reports at process startup.
+"""
+import logging
+from typing import AsyncIterator, Dict
+
+import httpx
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def warn_if_fallback():
+    """Log once (at startup) when large responses are decoded in one piece"""
+    if not IJSON_AVAILABLE:
+        logger.warning("⚠️  ijson is not installed: provider responses are decoded whole, not streamed")
+
+
+class _AsyncByteReader:
+    """Async file-like view of a streamed httpx body, as ijson expects"""
+
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+
+    async def read(self, size: int = -1) -> bytes:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
+async def iter_json_items(response: httpx.Response, key: str) -> AsyncIterator[Dict]:
+    """Yield the items of the top-level `key` array of a streamed response"""
+    if IJSON_AVAILABLE:
+        async for item in ijson.items(_AsyncByteReader(response), f"{key}.item", use_float=True):
+            yield item
+        return
+
+    await response.aread()
+    for item in response.json().get(key) or []:
+        yield item
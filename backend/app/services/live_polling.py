@@ -0,0 +1,129 @@
+"""
+Kickoff-aware live polling timetable
+
+Instead of polling every league with a fixture in a 3-day window every
+5 minutes, the adaptive poller builds a timetable from stored kickoff times:
+- a league is polled every LIVE_POLL_SECONDS from kickoff until the expected
+  full-time of its matches,
+- from full-time to full-time + 30 min (waiting for the FINISHED status) it
+  backs off to LIVE_POLL_COOLDOWN_SECONDS,
+- a league with a match stored as live is polled whatever its kickoff time
+  (extra time, penalties, long stoppages, results published late): every
+  LIVE_POLL_SECONDS until full-time + grace, then at the cooldown rate until
+  the match leaves the live status,
+- leagues with nothing in that window are not polled at all.
+Due leagues are ordered live-first, so the rate limiter serves them before
+leagues that are only waiting for a final whistle.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import LIVE_STATUSES, Match, League
+
+# match_date is stored as kickoff in UTC+7 (see DataSyncService)
+MATCH_DATE_OFFSET = timedelta(hours=7)
+# Kickoff -> full-time including half-time and stoppage
+MATCH_DURATION = timedelta(minutes=115)
+# Keep polling after expected full-time until the result is confirmed
+FULL_TIME_GRACE = timedelta(minutes=30)
+
+FINISHED_STATUSES = ["finished", "FINISHED"]
+
+
+@dataclass
+class LeaguePollPlan:
+    league_external_id: int
+    name: str
+    in_play: int = 0
+    awaiting_result: int = 0
+    first_kickoff: Optional[datetime] = None
+    last_kickoff: Optional[datetime] = None
+
+    @property
+    def is_live(self) -> bool:
+        return self.in_play > 0
+
+    @property
+    def interval(self) -> timedelta:
+        seconds = settings.LIVE_POLL_SECONDS if self.is_live else settings.LIVE_POLL_COOLDOWN_SECONDS
+        return timedelta(seconds=seconds)
+
+    def date_range(self) -> tuple:
+        """UTC date range (YYYY-MM-DD) covering this league's active matches"""
+        date_from = (self.first_kickoff - MATCH_DATE_OFFSET).date()
+        date_to = (self.last_kickoff - MATCH_DATE_OFFSET).date() + timedelta(days=1)
+        return date_from.strftime("%Y-%m-%d"), date_to.strftime("%Y-%m-%d")
+
+
+@dataclass
+class LivePollingPlanner:
+    """Decides which leagues are due for a live poll (state kept per process)"""
+
+    last_polled: Dict[int, datetime] = field(default_factory=dict)
+
+    async def build_timetable(self, db: AsyncSession, now: Optional[datetime] = None) -> List[LeaguePollPlan]:
+        """Leagues with matches stored as live, or between kickoff and
+        full-time + grace and not finished; live first
+        """
+        now_local = (now or datetime.utcnow()) + MATCH_DATE_OFFSET
+        window_start = now_local - MATCH_DURATION - FULL_TIME_GRACE
+
+        result = await db.execute(
+            select(League.external_id, League.name, Match.match_date, Match.status)
+            .join(League, Match.league_id == League.id)
+            .where(or_(
+                Match.status.in_(LIVE_STATUSES),
+                and_(
+                    Match.match_date >= window_start,
+                    Match.match_date <= now_local,
+                    Match.status.notin_(FINISHED_STATUSES),
+                ),
+            ))
+        )
+
+        plans: Dict[int, LeaguePollPlan] = {}
+        for external_id, name, kickoff, status in result.all():
+            plan = plans.setdefault(external_id, LeaguePollPlan(external_id, name))
+            # A match still live after full-time (extra time, penalties) stays
+            # on the fast interval through the grace period
+            in_play_until = kickoff + MATCH_DURATION
+            if status in LIVE_STATUSES:
+                in_play_until += FULL_TIME_GRACE
+            if in_play_until >= now_local:
+                plan.in_play += 1
+            else:
+                plan.awaiting_result += 1
+            plan.first_kickoff = min(plan.first_kickoff or kickoff, kickoff)
+            plan.last_kickoff = max(plan.last_kickoff or kickoff, kickoff)
+
+        return sorted(
+            plans.values(),
+            key=lambda p: (not p.is_live, -p.in_play, p.first_kickoff),
+        )
+
+    def due(self, plans: List[LeaguePollPlan], now: Optional[datetime] = None) -> List[LeaguePollPlan]:
+        """Filter the timetable to leagues whose poll interval has elapsed"""
+        now = now or datetime.utcnow()
+        active = {plan.league_external_id for plan in plans}
+        # Forget leagues that dropped out of the window
+        for league_id in list(self.last_polled):
+            if league_id not in active:
+                del self.last_polled[league_id]
+
+        return [
+            plan for plan in plans
+            if plan.league_external_id not in self.last_polled
+            # Small tolerance so a 60s interval job does not skip every other run
+            or now - self.last_polled[plan.league_external_id] >= plan.interval - timedelta(seconds=5)
+        ]
+
+    def mark_polled(self, league_external_id: int, now: Optional[datetime] = None):
+        self.last_polled[league_external_id] = now or datetime.utcnow()
+
+
+live_polling_planner = LivePollingPlanner()
@@ -0,0 +1,128 @@
+"""
+Season archive for the matches table
+
+The hot `matches` table keeps the current and recent seasons. Finished matches
+from older seasons are moved into `match_archive`, which is range-partitioned by
+match_date with one partition per season (July 1 -> July 1). Date lookups from
+the API and FeatureEngineer only touch `matches`; historical reads (training,
+head-to-head, a team's recent results) use the `matches_history` view (hot +
+archived), which API startup and archive_old_seasons create before anything is
+moved.
+"""
+from datetime import datetime, date
+from typing import List
+import logging
+
+from sqlalchemy import column, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SEASON_START_MONTH = 7
+
+ARCHIVE_COLUMNS = (
+    "id, home_team_id, away_team_id, league_id, match_date, status, "
+    "home_score, away_score, venue, round, external_id"
+)
+
+# Hot + archived matches, for training and other historical reads
+MATCHES_HISTORY = "matches_history"
+matches_history = table(
+    MATCHES_HISTORY,
+    *(column(name.strip()) for name in ARCHIVE_COLUMNS.split(",")),
+)
+CREATE_HISTORY_VIEW_SQL = (
+    f"CREATE OR REPLACE VIEW {MATCHES_HISTORY} AS "
+    f"SELECT {ARCHIVE_COLUMNS} FROM matches "
+    f"UNION ALL "
+    f"SELECT {ARCHIVE_COLUMNS} FROM match_archive"
+)
+
+# Finished matches older than :cutoff that nothing else references
+ARCHIVABLE_WHERE = """
+    m.match_date < :cutoff
+    AND m.status IN ('finished', 'FINISHED')
+    AND NOT EXISTS (SELECT 1 FROM followed_matches f WHERE f.match_id = m.id)
+    AND NOT EXISTS (SELECT 1 FROM predictions p WHERE p.match_id = m.id)
+"""
+
+
+def season_of(day: date) -> int:
+    """Season start year for a date (2024 = 2024/25 season)"""
+    return day.year if day.month >= SEASON_START_MONTH else day.year - 1
+
+
+def season_bounds(season: int) -> tuple:
+    return (
+        datetime(season, SEASON_START_MONTH, 1),
+        datetime(season + 1, SEASON_START_MONTH, 1),
+    )
+
+
+class MatchArchiveService:
+    """Moves old finished matches into the season-partitioned archive"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def ensure_partition(self, season: int):
+        """Create the archive partition for a season if it does not exist"""
+        start, end = season_bounds(season)
+        await self.db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS match_archive_{season} "
+            f"PARTITION OF match_archive "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+
+    async def ensure_history_view(self):
+        """(Re)create the hot + archived union view used for historical reads"""
+        await self.db.execute(text(CREATE_HISTORY_VIEW_SQL))
+
+    def archive_cutoff(self, today: date = None) -> datetime:
+        """Start of the oldest season kept in the hot table"""
+        today = today or date.today()
+        keep = max(settings.MATCH_ARCHIVE_KEEP_SEASONS, 1)
+        return season_bounds(season_of(today) - (keep - 1))[0]
+
+    async def archivable_seasons(self, cutoff: datetime) -> List[int]:
+        result = await self.db.execute(
+            text(f"SELECT DISTINCT date_trunc('month', m.match_date) FROM matches m WHERE {ARCHIVABLE_WHERE}"),
+            {"cutoff": cutoff},
+        )
+        return sorted({season_of(row[0].date()) for row in result.all()})
+
+    async def archive_old_seasons(self, today: date = None) -> int:
+        """Move archivable matches into match_archive in a single statement
+        Returns:
+            Number of matches moved
+        """
+        # Historical readers switch to the view before any row leaves `matches`
+        await self.ensure_history_view()
+        await self.db.commit()
+
+        cutoff = self.archive_cutoff(today)
+        seasons = await self.archivable_seasons(cutoff)
+        if not seasons:
+            return 0
+
+        for season in seasons:
+            await self.ensure_partition(season)
+
+        result = await self.db.execute(
+            text(
+                f"WITH moved AS ("
+                f"  DELETE FROM matches m WHERE {ARCHIVABLE_WHERE} "
+                f"  RETURNING m.*"
+                f") "
+                f"INSERT INTO match_archive ({ARCHIVE_COLUMNS}, archived_at) "
+                f"SELECT {ARCHIVE_COLUMNS}, :now FROM moved"
+            ),
+            {"cutoff": cutoff, "now": datetime.utcnow()},
+        )
+        await self.db.commit()
+
+        moved = result.rowcount or 0
+        logger.info(f"🗄️  Archived {moved} matches older than {cutoff.date()} (seasons {seasons})")
+        return moved
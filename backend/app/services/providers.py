@@ -0,0 +1,336 @@
+"""
+Unified football data provider interface
+
+Every provider returns the same normalized records (MatchRecord, TeamRecord,
+StandingRecord) so DataSyncService and the seed pipeline ingest them without
+knowing the wire format. Statuses use football-data.org's vocabulary and
+league IDs are football-data.org competition IDs (what `leagues.external_id`
+stores); team and match IDs are the provider's own, so switch
+FOOTBALL_API_PROVIDER only for a database seeded from that provider.
+
+- FootballDataProvider: football-data.org, matches streamed as they decode
+- APIFootballProvider: API-Football (v3.football.api-sports.io)
+"""
+import logging
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.services.api_football_client import APIFootballClient
+from app.services.football_api import FootballAPIClient
+from app.services.http_clients import API_FOOTBALL
+
+logger = logging.getLogger(__name__)
+
+# football-data.org competition ID -> API-Football league ID
+API_FOOTBALL_LEAGUES = {
+    2021: 39,  # Premier League
+    2016: 40,  # Championship
+    2014: 140,  # La Liga
+    2002: 78,  # Bundesliga
+    2019: 135,  # Serie A
+    2015: 61,  # Ligue 1
+    2003: 88,  # Eredivisie
+    2017: 94,  # Primeira Liga
+    2013: 71,  # Brasileirão
+    2001: 2,  # Champions League
+    2000: 1,  # World Cup
+    2018: 4,  # European Championship
+}
+
+# API-Football short status -> football-data.org status
+API_FOOTBALL_STATUSES = {
+    "TBD": "SCHEDULED", "NS": "TIMED",
+    "1H": "IN_PLAY", "2H": "IN_PLAY", "ET": "IN_PLAY", "BT": "IN_PLAY",
+    "P": "IN_PLAY", "LIVE": "IN_PLAY", "INT": "PAUSED", "HT": "PAUSED",
+    "FT": "FINISHED", "AET": "FINISHED", "PEN": "FINISHED",
+    "AWD": "AWARDED", "WO": "AWARDED",
+    "PST": "POSTPONED", "SUSP": "SUSPENDED",
+    "CANC": "CANCELLED", "ABD": "CANCELLED",
+}
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@dataclass
+class TeamRecord:
+    external_id: int
+    name: str
+    short_name: Optional[str] = None
+    crest: str = ""
+    country: str = ""
+
+    @classmethod
+    def from_football_data(cls, data: Dict) -> "TeamRecord":
+        return cls(
+            external_id=data["id"],
+            name=data["name"],
+            short_name=data.get("shortName"),
+            crest=data.get("crest") or "",
+            country=(data.get("area") or {}).get("name", ""),
+        )
+
+    @classmethod
+    def from_api_football(cls, data: Dict, country: str = "") -> "TeamRecord":
+        return cls(
+            external_id=data["id"],
+            name=data["name"],
+            short_name=data.get("code"),
+            crest=data.get("logo") or "",
+            country=data.get("country") or country,
+        )
+
+
+@dataclass
+class MatchRecord:
+    external_id: int
+    league_external_id: Optional[int]
+    utc_date: datetime  # timezone-aware
+    status: str  # football-data.org vocabulary (SCHEDULED, TIMED, IN_PLAY, FINISHED, ...)
+    home_team: TeamRecord
+    away_team: TeamRecord
+    home_score: Optional[int] = None
+    away_score: Optional[int] = None
+    matchday: Optional[int] = None
+    venue: str = ""
+    last_updated: Optional[datetime] = None  # naive UTC; None when the provider has none
+
+    @property
+    def match_date(self) -> datetime:
+        """Kickoff as stored in matches.match_date (naive UTC+7)"""
+        return (self.utc_date + timedelta(hours=7)).replace(tzinfo=None)
+
+    @property
+    def match_day(self) -> date:
+        """UTC kickoff day, the unit of /matches date filters"""
+        return self.utc_date.date()
+
+    @classmethod
+    def from_football_data(cls, data: Dict) -> "MatchRecord":
+        full_time = (data.get("score") or {}).get("fullTime") or {}
+        last_updated = _parse_iso(data.get("lastUpdated"))
+        return cls(
+            external_id=data["id"],
+            league_external_id=(data.get("competition") or {}).get("id"),
+            utc_date=_parse_iso(data["utcDate"]),
+            status=data["status"],
+            home_team=TeamRecord.from_football_data(data["homeTeam"]),
+            away_team=TeamRecord.from_football_data(data["awayTeam"]),
+            home_score=full_time.get("home"),
+            away_score=full_time.get("away"),
+            matchday=data.get("matchday"),
+            venue=data.get("venue") or "",
+            last_updated=last_updated.replace(tzinfo=None) if last_updated else None,
+        )
+
+    @classmethod
+    def from_api_football(cls, data: Dict, league_external_id: int) -> "MatchRecord":
+        fixture = data["fixture"]
+        league = data.get("league") or {}
+        round_number = re.search(r"(\d+)$", league.get("round") or "")
+        return cls(
+            external_id=fixture["id"],
+            league_external_id=league_external_id,
+            utc_date=_parse_iso(fixture["date"]),
+            status=API_FOOTBALL_STATUSES.get((fixture.get("status") or {}).get("short"), "SCHEDULED"),
+            home_team=TeamRecord.from_api_football(data["teams"]["home"], league.get("country", "")),
+            away_team=TeamRecord.from_api_football(data["teams"]["away"], league.get("country", "")),
+            home_score=(data.get("goals") or {}).get("home"),
+            away_score=(data.get("goals") or {}).get("away"),
+            matchday=int(round_number.group(1)) if round_number else None,
+            venue=(fixture.get("venue") or {}).get("name") or "",
+        )
+
+
+@dataclass
+class StandingRecord:
+    position: int
+    team: TeamRecord
+    played: int
+    won: int
+    draw: int
+    lost: int
+    goals_for: int
+    goals_against: int
+    goal_difference: int
+    points: int
+    form: str = ""
+
+    @classmethod
+    def from_football_data_response(cls, response: Dict) -> List["StandingRecord"]:
+        """Rows of the first (TOTAL) table of a /standings response"""
+        standings = response.get("standings") or []
+        table = standings[0].get("table") or [] if standings else []
+        return [
+            cls(
+                position=row["position"],
+                team=TeamRecord.from_football_data(row["team"]),
+                played=row["playedGames"],
+                won=row["won"],
+                draw=row["draw"],
+                lost=row["lost"],
+                goals_for=row["goalsFor"],
+                goals_against=row["goalsAgainst"],
+                goal_difference=row["goalDifference"],
+                points=row["points"],
+                form=row.get("form") or "",
+            )
+            for row in table
+        ]
+
+    @classmethod
+    def from_api_football(cls, row: Dict) -> "StandingRecord":
+        totals = row.get("all") or {}
+        goals = totals.get("goals") or {}
+        return cls(
+            position=row["rank"],
+            team=TeamRecord.from_api_football(row["team"]),
+            played=totals.get("played") or 0,
+            won=totals.get("win") or 0,
+            draw=totals.get("draw") or 0,
+            lost=totals.get("lose") or 0,
+            goals_for=goals.get("for") or 0,
+            goals_against=goals.get("against") or 0,
+            goal_difference=row.get("goalsDiff") or 0,
+            points=row.get("points") or 0,
+            form=row.get("form") or "",
+        )
+
+
+class MatchFetchFailed(Exception):
+    """Matches of some leagues could not be fetched"""
+
+    def __init__(self, league_ids):
+        self.league_ids = sorted(league_ids)
+        super().__init__(f"matches not fetched for leagues {self.league_ids}")
+
+
+class FootballProvider(ABC):
+    """What the sync pipeline needs from a data provider"""
+
+    name: str
+
+    @abstractmethod
+    def iter_matches(
+        self,
+        league_ids: List[int],
+        date_from: str,
+        date_to: str,
+        status: Optional[str] = None,
+        failed: Optional[Set[int]] = None,
+    ) -> AsyncIterator[MatchRecord]:
+        """Matches of `league_ids` between two dates (YYYY-MM-DD), as they are decoded
+        Args:
+            failed: Set filled with the leagues whose matches could not be
+                fetched (request failed or skipped, league not mapped). Their
+                absence from the results does not mean they have no matches.
+        """
+
+    @abstractmethod
+    async def get_standings(self, league_id: int) -> List[StandingRecord]:
+        """Current league table"""
+
+    @abstractmethod
+    async def get_team(self, team_id: int) -> Optional[TeamRecord]:
+        """Team details"""
+
+    async def get_matches_grouped(
+        self,
+        league_ids: List[int],
+        date_from: str,
+        date_to: str,
+        status: Optional[str] = None,
+        failed: Optional[Set[int]] = None,
+    ) -> Dict[int, List[MatchRecord]]:
+        """Matches grouped by league ID (every requested ID is present)
+        Args:
+            failed: See iter_matches; leagues in it map to an empty list
+        """
+        grouped: Dict[int, List[MatchRecord]] = {league_id: [] for league_id in league_ids}
+        async for record in self.iter_matches(league_ids, date_from, date_to, status, failed):
+            if record.league_external_id in grouped:
+                grouped[record.league_external_id].append(record)
+        return grouped
+
+
+class FootballDataProvider(FootballProvider):
+    """football-data.org; /matches arrays are decoded incrementally"""
+
+    name = "football-data"
+
+    def __init__(self, client: Optional[FootballAPIClient] = None):
+        self.client = client or FootballAPIClient()
+
+    async def iter_matches(self, league_ids, date_from, date_to, status=None, failed=None):
+        # Failed requests raise, so `failed` is never filled
+        async for match in self.client.iter_matches_multi(league_ids, date_from, date_to, status):
+            yield MatchRecord.from_football_data(match)
+
+    async def get_standings(self, league_id: int) -> List[StandingRecord]:
+        return StandingRecord.from_football_data_response(
+            await self.client.get_competition_standings(league_id)
+        )
+
+    async def get_team(self, team_id: int) -> Optional[TeamRecord]:
+        return TeamRecord.from_football_data(await self.client.get_team(team_id))
+
+
+def season_for(day: str) -> int:
+    """European season (start year) a YYYY-MM-DD date falls in"""
+    parsed = datetime.strptime(day, "%Y-%m-%d").date()
+    return parsed.year if parsed.month >= 7 else parsed.year - 1
+
+
+class APIFootballProvider(FootballProvider):
+    """API-Football; leagues without a known ID mapping are reported as failed"""
+
+    name = API_FOOTBALL
+
+    def __init__(self, client: Optional[APIFootballClient] = None):
+        self.client = client or APIFootballClient(settings.API_FOOTBALL_KEY)
+
+    async def iter_matches(self, league_ids, date_from, date_to, status=None, failed=None):
+        # The client turns failed requests into None instead of raising
+        failed = set() if failed is None else failed
+        for league_id in league_ids:
+            api_league = API_FOOTBALL_LEAGUES.get(league_id)
+            if api_league is None:
+                logger.warning(f"⚠️  No API-Football league for competition {league_id}, skipped")
+                failed.add(league_id)
+                continue
+            fixtures = await self.client.get_fixtures(api_league, season_for(date_from), date_from, date_to)
+            if fixtures is None:
+                failed.add(league_id)
+                continue
+            for fixture in fixtures:
+                record = MatchRecord.from_api_football(fixture, league_id)
+                if status is None or record.status == status:
+                    yield record
+
+    async def get_standings(self, league_id: int) -> List[StandingRecord]:
+        api_league = API_FOOTBALL_LEAGUES.get(league_id)
+        if api_league is None:
+            return []
+        rows = await self.client.get_standings(api_league, season_for(date.today().isoformat()))
+        return [StandingRecord.from_api_football(row) for row in rows]
+
+    async def get_team(self, team_id: int) -> Optional[TeamRecord]:
+        data = await self.client.get_team(team_id)
+        return TeamRecord.from_api_football(data["team"]) if data else None
+
+
+def get_provider(api_client: Optional[FootballAPIClient] = None) -> FootballProvider:
+    """Provider selected by FOOTBALL_API_PROVIDER
+    Args:
+        api_client: football-data.org client to reuse (e.g. one pointed at a mock)
+    """
+    if settings.FOOTBALL_API_PROVIDER == API_FOOTBALL:
+        return APIFootballProvider()
+    return FootballDataProvider(api_client)
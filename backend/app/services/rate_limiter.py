@@ -0,0 +1,88 @@
+"""
+Process-wide async token bucket for provider rate limits
+
+football-data.org free tier allows 10 requests/minute per key. Every
+FootballAPIClient shares one bucket, so overlapping scheduler jobs, the admin
+seed and CLI commands queue behind each other instead of sleeping blindly.
+The bucket is corrected from the X-Requests-Available-Minute and
+X-RequestCounter-Reset response headers, so it also accounts for requests made
+by other processes using the same key.
+"""
+import asyncio
+import logging
+import time
+from typing import Mapping, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTokenBucket:
+    """Token bucket with continuous refill and server-driven corrections"""
+
+    def __init__(self, rate_per_minute: int, capacity: Optional[int] = None):
+        self.capacity = float(capacity or rate_per_minute)
+        self.rate = rate_per_minute / 60.0  # tokens per second
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float):
+        if self.blocked_until is not None:
+            if now < self.blocked_until:
+                self.updated_at = now
+                return
+            # Server-side minute window has reset: full quota again
+            self.blocked_until = None
+            self.tokens = self.capacity
+        else:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """Wait until a request may be sent, then consume one token"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        # Holding the lock while sleeping keeps callers in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                if self.blocked_until is not None:
+                    wait = self.blocked_until - now
+                else:
+                    wait = (1 - self.tokens) / self.rate
+                await asyncio.sleep(max(wait, 0.01))
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Align the bucket with the provider's view of the remaining quota"""
+        available = headers.get("X-Requests-Available-Minute")
+        reset = headers.get("X-RequestCounter-Reset")
+        if available is None:
+            return
+
+        try:
+            available = float(available)
+        except ValueError:
+            return
+
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = min(self.tokens, available)
+
+        if available <= 0 and reset is not None:
+            try:
+                self.blocked_until = now + float(reset)
+                logger.info(f"⏳ Provider quota exhausted, pausing requests for {reset}s")
+            except ValueError:
+                pass
+
+
+# Shared by every football-data.org client in this process
+football_data_limiter = AsyncTokenBucket(settings.FOOTBALL_API_RATE_LIMIT)
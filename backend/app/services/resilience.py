@@ -0,0 +1,207 @@
+"""
+Retries and circuit breaking for provider API calls
+
+`send_with_retry` retries timeouts, connection errors, 429s and 5xx responses
+with jittered exponential backoff. The server's own hints come first: a
+`Retry-After` header, or football-data.org's `X-RequestCounter-Reset` when
+the minute quota is used up. Each provider has a CircuitBreaker: after
+PROVIDER_CIRCUIT_FAILURES consecutive failed calls it opens and calls raise
+CircuitOpen immediately. Once PROVIDER_CIRCUIT_RESET_SECONDS have passed, a
+single probe call is let through. Its outcome either closes the breaker or
+reopens it. A 429 means the provider is up but busy, so it is retried but
+never counts towards opening the breaker.
+"""
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Mapping, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpen(Exception):
+    """The provider is failing; calls are rejected without a request"""
+
+    def __init__(self, provider: str, retry_in: float):
+        self.provider = provider
+        self.retry_in = retry_in
+        super().__init__(f"{provider} circuit open, retrying in {retry_in:.0f}s")
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open -> closed"""
+
+    def __init__(self, provider: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.probing or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        """Raise CircuitOpen unless a request may be sent now"""
+        if self.opened_at is None:
+            return
+        retry_in = self.opened_at + self.reset_timeout - time.monotonic()
+        if retry_in > 0 or self.probing:
+            raise CircuitOpen(self.provider, max(retry_in, 0.0))
+        # Half-open: this caller is the single probe
+        self.probing = True
+
+    def release_probe(self):
+        """The probe ended without reaching the provider (e.g. budget refusal,
+        cancellation): let the next call probe instead; the failure count is unchanged
+        """
+        self.probing = False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info(f"✅ {self.provider} circuit closed")
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self, error):
+        self.last_error = str(error)
+        self.failures += 1
+        if self.probing or (self.opened_at is None and self.failures >= self.failure_threshold):
+            logger.warning(
+                f"🔌 {self.provider} circuit open for {self.reset_timeout:.0f}s "
+                f"after {self.failures} failures: {error}"
+            )
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+    def snapshot(self) -> Dict:
+        return {
+            "provider": self.provider,
+            "state": self.state,
+            "consecutiveFailures": self.failures,
+            "lastError": self.last_error,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """Process-wide breaker for `provider`"""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            provider,
+            failure_threshold=settings.PROVIDER_CIRCUIT_FAILURES,
+            reset_timeout=settings.PROVIDER_CIRCUIT_RESET_SECONDS,
+        )
+        _breakers[provider] = breaker
+    return breaker
+
+
+def breaker_report():
+    return [breaker.snapshot() for breaker in _breakers.values()]
+
+
+def server_delay(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds the provider asked us to wait, if it said so"""
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(retry_after)
+                return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    # football-data.org: seconds until the minute counter resets
+    if headers.get("X-Requests-Available-Minute") == "0":
+        try:
+            return max(0.0, float(headers.get("X-RequestCounter-Reset", "")))
+        except ValueError:
+            pass
+    return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+async def send_with_retry(
+    provider: str,
+    send: Callable[[], Awaitable[httpx.Response]],
+    attempts: Optional[int] = None,
+) -> httpx.Response:
+    """Call `send` until it returns a non-retryable response
+    `send` performs one request, including its budget and rate-limit checks, so
+    every retry is accounted like a normal request. The last response is
+    returned when retries run out (callers still raise_for_status).
+    Raises:
+        CircuitOpen: the provider's breaker is open
+        httpx.TransportError: the last attempt timed out or failed to connect
+    """
+    breaker = get_breaker(provider)
+    attempts = attempts or settings.PROVIDER_RETRY_ATTEMPTS
+    max_delay = settings.PROVIDER_RETRY_MAX_DELAY
+
+    for attempt in range(attempts):
+        breaker.before_call()
+        try:
+            response = await send()
+        except httpx.TransportError as e:
+            breaker.record_failure(e)
+            if attempt + 1 >= attempts:
+                raise
+            delay = backoff_delay(attempt, settings.PROVIDER_RETRY_BASE_DELAY, max_delay)
+            logger.warning(f"🔁 {provider} request failed ({e!r}), retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            # Not a provider failure (ApiBudgetExceeded, CancelledError, ...): a
+            # half-open probe must not stay claimed, or the breaker never closes
+            breaker.release_probe()
+            raise
+
+        if response.status_code not in RETRY_STATUSES:
+            breaker.record_success()
+            return response
+
+        if response.status_code == 429:
+            # Provider is up, just throttling us
+            breaker.record_success()
+        else:
+            breaker.record_failure(f"HTTP {response.status_code}")
+
+        if attempt + 1 >= attempts:
+            return response
+        # Release the connection of a streamed response before retrying
+        await response.aclose()
+        delay = server_delay(response.headers)
+        if delay is None:
+            delay = backoff_delay(attempt, settings.PROVIDER_RETRY_BASE_DELAY, max_delay)
+        elif delay > max_delay:
+            logger.warning(f"⏭️  {provider} asked to wait {delay:.0f}s, giving up")
+            return response
+        logger.warning(f"🔁 {provider} HTTP {response.status_code}, retry {attempt + 1} in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    return response
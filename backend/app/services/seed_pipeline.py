@@ -0,0 +1,335 @@
+"""
+Pipelined seeding: API fetches overlap DB ingestion
+
+Producers take seed units (a match window for a group of leagues, or one
+league's standings), fetch them through the rate-limited FootballAPIClient and
+put the payloads on a bounded asyncio.Queue. A single consumer ingests them
+with DataSyncService on its own session. While the consumer writes one
+payload, the producers are already waiting on the next API response, so total
+seed time approaches the API quota limit instead of fetch time + write time.
+
+Each ingested unit is checkpointed in `seed_checkpoints` under the plan's key
+(a hash of its unit keys). Running the same plan again, e.g. after a crash or
+restart, skips the units already done; checkpoints are cleared once the whole
+plan has been ingested.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, text
+
+from app.db.database import AsyncSessionLocal
+from app.db.models import League, SeedCheckpoint
+from app.services.data_sync import DataSyncService
+from app.services.api_budget import ApiBudgetExceeded
+from app.services.football_api import FootballAPIClient
+from app.services.providers import MatchFetchFailed, get_provider
+from app.services.resilience import CircuitOpen
+from app.services.job_runs import current_run, record_job_error
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class SeedUnit:
+    """One API request worth of seeding"""
+    kind: str  # "matches" or "standings"
+    league_ids: Tuple[int, ...]
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        leagues = ",".join(str(league_id) for league_id in self.league_ids)
+        if self.kind == "matches":
+            return f"matches:{leagues}:{self.date_from}:{self.date_to}"
+        return f"standings:{leagues}"
+
+
+@dataclass
+class SeedResult:
+    matches: int = 0
+    standings: int = 0
+    units_done: int = 0
+    failed: List[str] = field(default_factory=list)
+    # Units skipped because a previous run of the same plan already did them
+    resumed: int = 0
+    # Units not fetched because the API budget ran out
+    deferred: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+def plan_seed_units(
+    league_ids: List[int],
+    date_from: str,
+    date_to: str,
+    include_standings: bool = True,
+    window_days: int = FootballAPIClient.MAX_MATCHES_WINDOW_DAYS,
+) -> List[SeedUnit]:
+    """Split a seed into batched match windows plus one standings unit per league"""
+    units = []
+    if league_ids:
+        start = datetime.strptime(date_from, "%Y-%m-%d").date()
+        end = datetime.strptime(date_to, "%Y-%m-%d").date()
+        while start <= end:
+            chunk_end = min(start + timedelta(days=window_days - 1), end)
+            units.append(SeedUnit(
+                "matches",
+                tuple(league_ids),
+                start.strftime("%Y-%m-%d"),
+                chunk_end.strftime("%Y-%m-%d"),
+            ))
+            start = chunk_end + timedelta(days=1)
+
+    if include_standings:
+        units.extend(SeedUnit("standings", (league_id,)) for league_id in league_ids)
+    return units
+
+
+def split_per_league(units: List[SeedUnit]) -> List[SeedUnit]:
+    """One unit per league, e.g. to retry failed batched windows separately"""
+    return [
+        SeedUnit(unit.kind, (league_id,), unit.date_from, unit.date_to)
+        for unit in units
+        for league_id in unit.league_ids
+    ]
+
+
+def plan_key(units: List[SeedUnit]) -> str:
+    """Stable identifier of a seed plan, used to find its checkpoints"""
+    digest = hashlib.sha1("|".join(sorted(unit.key for unit in units)).encode()).hexdigest()
+    return f"seed:{digest[:16]}"
+
+
+CHECKPOINT_SQL = text("""
+INSERT INTO seed_checkpoints (plan_key, unit_key, rows, job_run_id, completed_at)
+VALUES (:plan_key, :unit_key, :rows, :job_run_id, :completed_at)
+ON CONFLICT (plan_key, unit_key)
+DO UPDATE SET rows = EXCLUDED.rows, job_run_id = EXCLUDED.job_run_id, completed_at = EXCLUDED.completed_at
+""")
+
+
+class SeedCheckpointStore:
+    """Completed seed units per plan, shared by every worker through the DB"""
+
+    # Checkpoints of plans nobody resumed are dropped after this long
+    MAX_AGE = timedelta(days=2)
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def completed(self, key: str) -> Dict[str, int]:
+        """{unit_key: rows} already ingested for the plan"""
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(SeedCheckpoint).where(SeedCheckpoint.completed_at < datetime.utcnow() - self.MAX_AGE)
+            )
+            result = await db.execute(
+                select(SeedCheckpoint.unit_key, SeedCheckpoint.rows).where(SeedCheckpoint.plan_key == key)
+            )
+            done = {unit_key: rows or 0 for unit_key, rows in result.all()}
+            await db.commit()
+        return done
+
+    async def mark_done(self, db, key: str, unit: SeedUnit, rows: int):
+        """Record a unit on the ingesting session (committed by the caller)"""
+        run = current_run()
+        await db.execute(CHECKPOINT_SQL, {
+            "plan_key": key,
+            "unit_key": unit.key,
+            "rows": rows,
+            "job_run_id": run.run_id if run else None,
+            "completed_at": datetime.utcnow(),
+        })
+
+    async def clear(self, key: str):
+        async with self.session_factory() as db:
+            await db.execute(delete(SeedCheckpoint).where(SeedCheckpoint.plan_key == key))
+            await db.commit()
+
+
+ProgressCallback = Callable[[SeedUnit, int, int], Optional[Awaitable[None]]]
+
+
+class SeedPipeline:
+    """Bounded producer/consumer seeder"""
+
+    def __init__(
+        self,
+        api_client: Optional[FootballAPIClient] = None,
+        session_factory=AsyncSessionLocal,
+        queue_size: int = 4,
+        fetch_concurrency: int = 2,
+        on_progress: Optional[ProgressCallback] = None,
+        checkpoints: Optional[SeedCheckpointStore] = None,
+    ):
+        self.api_client = api_client or FootballAPIClient()
+        self.provider = get_provider(self.api_client)
+        self.session_factory = session_factory
+        self.queue_size = queue_size
+        self.fetch_concurrency = fetch_concurrency
+        self.on_progress = on_progress
+        self.checkpoints = checkpoints
+        self.plan_key: Optional[str] = None
+
+    async def _fetch(self, unit: SeedUnit) -> Dict[int, object]:
+        if unit.kind == "matches":
+            failed = set()
+            grouped = await self.provider.get_matches_grouped(
+                list(unit.league_ids), unit.date_from, unit.date_to, failed=failed
+            )
+            if failed:
+                # Fail the unit rather than advance cursors over an unfetched window
+                raise MatchFetchFailed(failed)
+            return grouped
+        league_id = unit.league_ids[0]
+        return {league_id: await self.provider.get_standings(league_id)}
+
+    async def _produce(self, units: asyncio.Queue, payloads: asyncio.Queue, result: SeedResult):
+        while True:
+            try:
+                unit = units.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                await payloads.put((unit, await self._fetch(unit)))
+            except (ApiBudgetExceeded, CircuitOpen) as e:
+                # Leave the rest of the queue unfetched; it is reported as deferred
+                logger.warning(f"⏭️  Seed stopped at {unit.key}: {e}")
+                result.deferred.append(unit.key)
+                return
+            except Exception as e:
+                logger.error(f"❌ Seed fetch failed for {unit.key}: {e}")
+                record_job_error(f"{unit.key}: {e}")
+                result.failed.append(unit.key)
+                await payloads.put((unit, None))
+
+    async def _ingest(self, service: DataSyncService, unit: SeedUnit, payload: Dict[int, object]) -> int:
+        count = 0
+        if unit.kind == "matches":
+            for league_id, matches_data in payload.items():
+                count += await service.ingest_matches(
+                    league_id, matches_data, window=(unit.date_from, unit.date_to)
+                )
+            return count
+
+        for league_id, standings in payload.items():
+            league = (await service.db.execute(
+                select(League).where(League.external_id == league_id)
+            )).scalar_one_or_none()
+            if league is not None:
+                count += await service.ingest_standings(league, standings)
+        return count
+
+    async def _checkpoint(self, db, unit: SeedUnit, count: int):
+        try:
+            await self.checkpoints.mark_done(db, self.plan_key, unit, count)
+            await db.commit()
+        except Exception as e:
+            # The unit itself is ingested; at worst a resume fetches it again
+            await db.rollback()
+            logger.warning(f"⚠️  Could not checkpoint {unit.key}: {e}")
+
+    async def _report(self, unit: SeedUnit, done: int, total: int):
+        if self.on_progress is not None:
+            maybe = self.on_progress(unit, done, total)
+            if asyncio.iscoroutine(maybe):
+                await maybe
+
+    async def _consume(self, payloads: asyncio.Queue, total: int, result: SeedResult):
+        async with self.session_factory() as db:
+            service = DataSyncService(db, api_client=self.api_client, provider=self.provider)
+            while True:
+                item = await payloads.get()
+                if item is _DONE:
+                    return
+                unit, payload = item
+                if payload is not None:
+                    try:
+                        count = await self._ingest(service, unit, payload)
+                        if unit.kind == "matches":
+                            result.matches += count
+                        else:
+                            result.standings += count
+                        if self.checkpoints is not None:
+                            await self._checkpoint(db, unit, count)
+                    except Exception as e:
+                        await db.rollback()
+                        logger.error(f"❌ Seed ingest failed for {unit.key}: {e}")
+                        record_job_error(f"{unit.key}: {e}")
+                        result.failed.append(unit.key)
+
+                result.units_done += 1
+                await self._report(unit, result.units_done, total)
+
+    async def run(self, units: List[SeedUnit]) -> SeedResult:
+        """Fetch and ingest all units, returning counts and failed unit keys"""
+        result = SeedResult()
+        started = time.perf_counter()
+        total = len(units)
+
+        if self.checkpoints is not None:
+            self.plan_key = plan_key(units)
+            try:
+                done = await self.checkpoints.completed(self.plan_key)
+            except Exception as e:
+                logger.warning(f"⚠️  Seed checkpoints unavailable, starting from scratch: {e}")
+                done = {}
+            if done:
+                logger.info(f"⏩ Resuming seed {self.plan_key}: {len(done)}/{total} units already done")
+            for unit in units:
+                if unit.key in done:
+                    result.resumed += 1
+                    result.units_done += 1
+                    if unit.kind == "matches":
+                        result.matches += done[unit.key]
+                    else:
+                        result.standings += done[unit.key]
+                    await self._report(unit, result.units_done, total)
+            units = [unit for unit in units if unit.key not in done]
+
+        pending: asyncio.Queue = asyncio.Queue()
+        for unit in units:
+            pending.put_nowait(unit)
+        payloads: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        consumer = asyncio.create_task(self._consume(payloads, total, result))
+        producers = [
+            asyncio.create_task(self._produce(pending, payloads, result))
+            for _ in range(max(1, min(self.fetch_concurrency, len(units))))
+        ]
+        async def produce_all():
+            await asyncio.gather(*producers)
+            await payloads.put(_DONE)
+
+        try:
+            # A failing consumer propagates here instead of leaving producers
+            # blocked on a full queue
+            await asyncio.gather(produce_all(), consumer)
+        except BaseException:
+            for task in producers + [consumer]:
+                task.cancel()
+            raise
+
+        while not pending.empty():
+            result.deferred.append(pending.get_nowait().key)
+        if self.checkpoints is not None and not result.failed and not result.deferred:
+            # Plan complete: the next run of the same windows starts fresh
+            try:
+                await self.checkpoints.clear(self.plan_key)
+            except Exception as e:
+                logger.warning(f"⚠️  Could not clear seed checkpoints: {e}")
+        result.elapsed = time.perf_counter() - started
+        logger.info(
+            f"🌱 Seed pipeline: {result.units_done} units, {result.matches} matches, "
+            f"{result.standings} standings in {result.elapsed:.1f}s "
+            f"({result.resumed} resumed, {len(result.failed)} failed, {len(result.deferred)} deferred)"
+        )
+        return result
@@ -0,0 +1,172 @@
+"""
+Per-league sync cursors for incremental match syncs
+
+A cursor remembers which UTC match dates were already fetched for a league
+and, per date, the newest `lastUpdated` seen on it. With it:
+- the nightly job only fetches the dates of its window that were never
+  fetched (the new edge days) plus a short recent range around today,
+  where results are confirmed and kickoffs still move,
+- ingestion skips a match whose `lastUpdated` is not newer than its own
+  date's watermark: a fetch covering that date already returned this version.
+The watermark is per date because fetches cover different ranges (live polls,
+realtime and batched windows): a narrow fetch must not mark changes on other
+dates as seen. Dates without a watermark are always ingested.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import SyncCursor
+from app.services.providers import MatchRecord
+from app.services.seed_pipeline import SeedUnit, plan_seed_units
+
+DateRange = Tuple[date, date]
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _merge(ranges: List[DateRange]) -> List[DateRange]:
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def ranges_to_fetch(
+    cursor: Optional[SyncCursor],
+    window: DateRange,
+    recent: DateRange,
+) -> List[DateRange]:
+    """Parts of `window` never fetched, plus `recent` (clipped to `window`)"""
+    start, end = window
+    if cursor is None or cursor.fetched_from is None or cursor.fetched_to is None:
+        return [window]
+    if cursor.fetched_to < start or cursor.fetched_from > end:
+        return [window]
+
+    ranges = []
+    if start < cursor.fetched_from:
+        ranges.append((start, cursor.fetched_from - timedelta(days=1)))
+    if cursor.fetched_to < end:
+        ranges.append((cursor.fetched_to + timedelta(days=1), end))
+    recent_start, recent_end = max(recent[0], start), min(recent[1], end)
+    if recent_start <= recent_end:
+        ranges.append((recent_start, recent_end))
+    return _merge(ranges)
+
+
+async def load_cursors(db: AsyncSession, league_ids: List[int]) -> Dict[int, SyncCursor]:
+    result = await db.execute(
+        select(SyncCursor).where(SyncCursor.league_external_id.in_(league_ids))
+    )
+    return {cursor.league_external_id: cursor for cursor in result.scalars().all()}
+
+
+async def plan_incremental_units(
+    db: AsyncSession,
+    league_ids: List[int],
+    date_from: str,
+    date_to: str,
+    recent_days_back: int,
+    recent_days_ahead: int,
+    today: Optional[date] = None,
+) -> List[SeedUnit]:
+    """Match units covering only what each league still needs from the window
+    Leagues needing the same ranges share batched units.
+    """
+    today = today or date.today()
+    window = (_parse_date(date_from), _parse_date(date_to))
+    recent = (today - timedelta(days=recent_days_back), today + timedelta(days=recent_days_ahead))
+    cursors = await load_cursors(db, league_ids)
+
+    groups: Dict[Tuple[DateRange, ...], List[int]] = defaultdict(list)
+    for league_id in league_ids:
+        ranges = tuple(ranges_to_fetch(cursors.get(league_id), window, recent))
+        if ranges:
+            groups[ranges].append(league_id)
+
+    units = []
+    for ranges, group in groups.items():
+        for start, end in ranges:
+            units.extend(plan_seed_units(
+                group,
+                start.strftime("%Y-%m-%d"),
+                end.strftime("%Y-%m-%d"),
+                include_standings=False,
+            ))
+    return units
+
+
+def _watermark(watermarks: Optional[Dict[str, str]], day: date) -> Optional[datetime]:
+    value = (watermarks or {}).get(day.isoformat())
+    return datetime.fromisoformat(value) if value else None
+
+
+def filter_unchanged(cursor: Optional[SyncCursor], matches_data: List[MatchRecord]) -> Tuple[List[MatchRecord], int]:
+    """Drop matches whose lastUpdated is not newer than their date's watermark
+    Returns:
+        (matches to ingest, number skipped)
+    """
+    if cursor is None or not cursor.day_watermarks:
+        return matches_data, 0
+
+    changed = []
+    for match_data in matches_data:
+        if match_data.last_updated is not None:
+            watermark = _watermark(cursor.day_watermarks, match_data.match_day)
+            if watermark is not None and match_data.last_updated <= watermark:
+                continue
+        changed.append(match_data)
+    return changed, len(matches_data) - len(changed)
+
+
+async def get_cursor(db: AsyncSession, league_id: int) -> Optional[SyncCursor]:
+    result = await db.execute(select(SyncCursor).where(SyncCursor.league_external_id == league_id))
+    return result.scalar_one_or_none()
+
+
+def advance_cursor(
+    db: AsyncSession,
+    cursor: Optional[SyncCursor],
+    league_id: int,
+    date_from: str,
+    date_to: str,
+    matches_data: List[MatchRecord],
+) -> SyncCursor:
+    """Extend the cursor with a successfully ingested window (committed by the caller)"""
+    start, end = _parse_date(date_from), _parse_date(date_to)
+    if cursor is None:
+        cursor = SyncCursor(league_external_id=league_id)
+        db.add(cursor)
+
+    watermarks = dict(cursor.day_watermarks or {})
+    if cursor.fetched_from is None or end < cursor.fetched_from - timedelta(days=1) \
+            or start > cursor.fetched_to + timedelta(days=1):
+        # Disjoint from what was fetched before: the cursor restarts at this window
+        cursor.fetched_from, cursor.fetched_to = start, end
+        cursor.last_updated_seen = None
+        watermarks = {}
+    else:
+        cursor.fetched_from = min(cursor.fetched_from, start)
+        cursor.fetched_to = max(cursor.fetched_to, end)
+
+    # Only dates inside this window were fully returned by this fetch
+    for match_data in matches_data:
+        day = match_data.match_day
+        if match_data.last_updated is None or not start <= day <= end:
+            continue
+        current = _watermark(watermarks, day)
+        if current is None or match_data.last_updated > current:
+            watermarks[day.isoformat()] = match_data.last_updated.isoformat()
+        cursor.last_updated_seen = max(cursor.last_updated_seen or match_data.last_updated, match_data.last_updated)
+    # Reassigned (not mutated) so the JSON column is flagged as changed
+    cursor.day_watermarks = watermarks
+    return cursor
@@ -0,0 +1,80 @@
+"""
+Dedicated sync worker: runs the scheduler jobs outside the API processes
+Run with: python -m app.worker [seed]
+
+With SYNC_MODE=worker the API never starts the scheduler, so JSON parsing,
+ORM flushes and logging from sync jobs no longer share the API event loop.
+Several worker replicas are safe: leader election still picks one of them.
+"""
+
+import asyncio
+import logging
+import signal
+import sys
+
+from app.core.config import settings
+from app.core.leader import scheduler_leader
+from app.core.scheduler import start_scheduler, stop_scheduler
+from app.db.database import dispose_engines
+from app.services.http_clients import http_clients
+from app.services.json_stream import warn_if_fallback
+
+logger = logging.getLogger(__name__)
+
+
+async def run_scheduler():
+    """Run the scheduler until SIGINT/SIGTERM"""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Windows: fall back to KeyboardInterrupt
+            pass
+
+    logger.info("🛠️  Starting ScoreFlow sync worker...")
+    if settings.SCHEDULER_LEADER_ELECTION:
+        scheduler_leader.on_elected = start_scheduler
+        scheduler_leader.on_demoted = stop_scheduler
+        await scheduler_leader.start()
+    else:
+        start_scheduler()
+
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info("🛑 Stopping sync worker...")
+        if settings.SCHEDULER_LEADER_ELECTION:
+            await scheduler_leader.stop()
+        else:
+            stop_scheduler()
+        await dispose_engines()
+        await http_clients.aclose()
+
+
+async def run_seed():
+    """Run one full seed in the worker process"""
+    from app.api.v1.endpoints.admin import run_seed_process
+    try:
+        await run_seed_process(trigger="worker")
+    finally:
+        await dispose_engines()
+        await http_clients.aclose()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    warn_if_fallback()
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "scheduler"
+    if command == "scheduler":
+        asyncio.run(run_scheduler())
+    elif command == "seed":
+        asyncio.run(run_seed())
+    else:
+        print("Usage: python -m app.worker [scheduler|seed]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measure API latency percentiles while a sync runs
+Compares inline mode (scheduler in the API process) with SYNC_MODE=worker.
+
+Usage:
+    python benchmarks/api_latency_during_sync.py --base-url http://localhost:8000 \
+        --path /api/v1/matches/by-date?date=2025-01-01 --duration 60 --concurrency 20 \
+        [--trigger-seed --token <admin JWT>]
+
+Run it once with the API started normally (SYNC_MODE=inline) and once with
+SYNC_MODE=worker plus `python -m app.worker seed` running alongside, then
+compare the p99 lines. --trigger-seed starts /admin/seed at t=0 in inline mode.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def worker(client, path, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/v1/leagues/")
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--trigger-seed", action="store_true")
+    parser.add_argument("--token", default="")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=60) as client:
+        if args.trigger_seed:
+            response = await client.post("/api/v1/admin/seed")
+            print(f"Seed trigger: {response.status_code} {response.text[:200]}")
+
+        latencies, errors = [], []
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(*[
+            worker(client, args.path, deadline, latencies, errors)
+            for _ in range(args.concurrency)
+        ])
+
+    print(f"Requests: {len(latencies)}  errors: {len(errors)}")
+    if latencies:
+        print(f"mean {statistics.mean(latencies):.1f} ms")
+        for pct in (50, 95, 99):
+            print(f"p{pct}  {percentile(latencies, pct):.1f} ms")
+        print(f"max  {max(latencies):.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,261 @@
+"""
+FeatureEngineer.extract_features latency: per-getter queries vs one statement
+
+Builds a synthetic multi-season database in a scratch Postgres schema
+(--schema, dropped and recreated on every run) and times, for the same sample
+of matches:
+    legacy  the previous extraction path (its getters live in this file): the
+            match row, then form, goal averages and rest days with one ORM
+            query per team each (7 queries)
+    single  extract_features: MATCH_FEATURES_SQL, one LATERAL statement
+Both paths must produce the same features; mismatches are reported.
+
+Usage (from backend/, with the usual .env so app settings load):
+    python benchmarks/feature_extraction.py --leagues 10 --seasons 6 --samples 300
+    python benchmarks/feature_extraction.py --database-url postgresql+asyncpg://... --no-indexes
+
+Default size: 10 leagues x 20 teams x 6 seasons = 22,800 matches. --no-indexes
+drops the (team, match_date) indexes to show what they contribute.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, insert, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.models import League, Match, Team  # noqa: E402
+from app.ml.feature_engineering import FINISHED_STATUSES, FeatureEngineer  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def double_round_robin(team_ids):
+    """Rounds of (home, away) pairs, every pairing home and away (circle method)"""
+    teams = list(team_ids)
+    rounds = []
+    for r in range(len(teams) - 1):
+        pairs = [(teams[i], teams[-1 - i]) for i in range(len(teams) // 2)]
+        rounds.append(pairs if r % 2 == 0 else [(away, home) for home, away in pairs])
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds + [[(away, home) for home, away in pairs] for pairs in rounds]
+
+
+def synthetic_rows(leagues: int, teams: int, seasons: int, seed: int):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    last_season = now.year if now.month >= 7 else now.year - 1
+    league_rows, team_rows, match_rows = [], [], []
+    match_id = 0
+    for league_id in range(1, leagues + 1):
+        league_rows.append({"id": league_id, "name": f"League {league_id}", "season": last_season, "external_id": league_id})
+        team_ids = [(league_id - 1) * teams + i for i in range(1, teams + 1)]
+        team_rows += [{"id": team_id, "name": f"Team {team_id}", "external_id": team_id} for team_id in team_ids]
+        for season in range(last_season - seasons + 1, last_season + 1):
+            start = datetime(season, 8, 10, 14) + timedelta(hours=league_id)
+            for round_no, pairs in enumerate(double_round_robin(team_ids)):
+                for slot, (home, away) in enumerate(pairs):
+                    match_id += 1
+                    kickoff = start + timedelta(days=7 * round_no + slot % 3, hours=slot % 4 * 2)
+                    finished = kickoff < now
+                    match_rows.append({
+                        "id": match_id,
+                        "home_team_id": home,
+                        "away_team_id": away,
+                        "league_id": league_id,
+                        "match_date": kickoff,
+                        "status": "FINISHED" if finished else "SCHEDULED",
+                        "home_score": rng.choice((0, 1, 1, 2, 2, 3, 4)) if finished else None,
+                        "away_score": rng.choice((0, 0, 1, 1, 2, 3)) if finished else None,
+                        "round": f"Matchday {round_no + 1}",
+                        "external_id": match_id,
+                    })
+    return league_rows, team_rows, match_rows
+
+
+async def build_schema(engine, args):
+    tables = [League.__table__, Team.__table__, Match.__table__]
+    async with engine.begin() as conn:
+        await conn.execute(text(f'DROP SCHEMA IF EXISTS "{args.schema}" CASCADE'))
+        await conn.execute(text(f'CREATE SCHEMA "{args.schema}"'))
+        await conn.execute(text(f'SET search_path TO "{args.schema}"'))
+        await conn.run_sync(lambda sync_conn: Match.metadata.create_all(sync_conn, tables=tables))
+        if args.no_indexes:
+            await conn.execute(text("DROP INDEX ix_matches_home_team_date, ix_matches_away_team_date"))
+
+        leagues, teams, matches = synthetic_rows(args.leagues, args.teams, args.seasons, args.seed)
+        await conn.execute(insert(League.__table__), leagues)
+        await conn.execute(insert(Team.__table__), teams)
+        for i in range(0, len(matches), 5000):
+            await conn.execute(insert(Match.__table__), matches[i:i + 5000])
+        await conn.execute(text("ANALYZE leagues, teams, matches"))
+    return len(matches)
+
+
+# The per-team getters FeatureEngineer used before MATCH_FEATURES_SQL, kept
+# here as the baseline: one ORM query per feature per team.
+
+def _team_filter(team_id: int):
+    return (
+        ((Match.home_team_id == team_id) | (Match.away_team_id == team_id)),
+        Match.status.in_(FINISHED_STATUSES),
+    )
+
+
+async def legacy_team_form(db, team_id: int, last_n: int = 5) -> float:
+    matches = (await db.execute(
+        select(Match).where(*_team_filter(team_id)).order_by(Match.match_date.desc()).limit(last_n)
+    )).scalars().all()
+    if not matches:
+        return 0.5
+
+    points = 0
+    for match in matches:
+        scored, conceded = (
+            (match.home_score, match.away_score) if match.home_team_id == team_id
+            else (match.away_score, match.home_score)
+        )
+        if scored > conceded:
+            points += 3
+        elif scored == conceded:
+            points += 1
+    return points / (last_n * 3)
+
+
+async def legacy_goals_avg(db, team_id: int, last_n: int = 10):
+    matches = (await db.execute(
+        select(Match).where(*_team_filter(team_id)).order_by(Match.match_date.desc()).limit(last_n)
+    )).scalars().all()
+    if not matches:
+        return 1.0, 1.0
+
+    scored, conceded = [], []
+    for match in matches:
+        if match.home_team_id == team_id:
+            scored.append(match.home_score or 0)
+            conceded.append(match.away_score or 0)
+        else:
+            scored.append(match.away_score or 0)
+            conceded.append(match.home_score or 0)
+    return sum(scored) / len(scored), sum(conceded) / len(conceded)
+
+
+async def legacy_days_since_last_match(db, team_id: int) -> int:
+    last_match = (await db.execute(
+        select(Match).where(*_team_filter(team_id)).order_by(Match.match_date.desc()).limit(1)
+    )).scalar_one_or_none()
+    if not last_match:
+        return 7
+    return max((datetime.utcnow() - last_match.match_date).days, 0)
+
+
+async def legacy_extract_features(fe: FeatureEngineer, match_id: int):
+    """The extraction path before MATCH_FEATURES_SQL (7 queries)"""
+    db = fe.db
+    match = (await db.execute(select(Match).where(Match.id == match_id))).scalar_one_or_none()
+    home_elo = await fe.get_team_elo(match.home_team_id)
+    away_elo = await fe.get_team_elo(match.away_team_id)
+    home_form = await legacy_team_form(db, match.home_team_id)
+    away_form = await legacy_team_form(db, match.away_team_id)
+    home_goals, home_conceded = await legacy_goals_avg(db, match.home_team_id)
+    away_goals, away_conceded = await legacy_goals_avg(db, match.away_team_id)
+    home_days = await legacy_days_since_last_match(db, match.home_team_id)
+    away_days = await legacy_days_since_last_match(db, match.away_team_id)
+    return fe.build_features(
+        home_elo, away_elo,
+        {"form": home_form, "goals_avg": float(home_goals), "conceded_avg": float(home_conceded), "rest_days": home_days},
+        {"form": away_form, "goals_avg": float(away_goals), "conceded_avg": float(away_conceded), "rest_days": away_days},
+    )
+
+
+async def single_extract_features(fe: FeatureEngineer, match_id: int):
+    with contextlib.redirect_stdout(io.StringIO()):  # extract_features prints debug lines
+        return await fe.extract_features(match_id)
+
+
+async def run(session_factory, extract, match_ids, counter):
+    latencies, results = [], {}
+    counter["queries"] = 0
+    async with session_factory() as db:
+        fe = FeatureEngineer(db)
+        await extract(fe, match_ids[0])  # warm up connection and statement cache
+        counter["queries"] = 0
+        for match_id in match_ids:
+            started = time.perf_counter()
+            results[match_id] = await extract(fe, match_id)
+            latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, results, counter["queries"] / len(match_ids)
+
+
+def same_features(a, b):
+    return all(abs(float(a[key]) - float(b[key])) < 1e-9 for key in a)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL_ASYNC)
+    parser.add_argument("--schema", default="bench_features")
+    parser.add_argument("--leagues", type=int, default=10)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--seasons", type=int, default=6)
+    parser.add_argument("--samples", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-indexes", action="store_true", help="Drop the (team, match_date) indexes")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema afterwards")
+    args = parser.parse_args()
+
+    engine = create_async_engine(
+        args.database_url,
+        connect_args={"server_settings": {"search_path": args.schema}},
+    )
+    counter = {"queries": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_query(*_args):
+        counter["queries"] += 1
+
+    try:
+        started = time.perf_counter()
+        total = await build_schema(engine, args)
+        print(f"Schema {args.schema}: {total} matches ({args.leagues} leagues x {args.teams} teams x "
+              f"{args.seasons} seasons) in {time.perf_counter() - started:.1f}s, "
+              f"indexes={'off' if args.no_indexes else 'on'}")
+
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        sample = random.Random(args.seed).sample(range(1, total + 1), min(args.samples, total))
+
+        outcomes = {}
+        for name, extract in (("legacy", legacy_extract_features), ("single", single_extract_features)):
+            latencies, results, per_call = await run(session_factory, extract, sample, counter)
+            outcomes[name] = results
+            print(f"{name:<7} queries/match={per_call:.1f}  mean={statistics.mean(latencies):.2f}ms  "
+                  f"p50={percentile(latencies, 50):.2f}ms  p95={percentile(latencies, 95):.2f}ms  "
+                  f"p99={percentile(latencies, 99):.2f}ms")
+
+        mismatches = [m for m in sample if not same_features(outcomes["legacy"][m], outcomes["single"][m])]
+        print(f"Feature mismatches: {len(mismatches)}/{len(sample)}" + (f" (e.g. match {mismatches[0]})" if mismatches else ""))
+    finally:
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f'DROP SCHEMA IF EXISTS "{args.schema}" CASCADE'))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
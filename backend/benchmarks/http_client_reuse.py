@@ -0,0 +1,131 @@
+"""
+Per-request latency: new httpx.AsyncClient per call vs the shared pooled client
+
+Starts a local mock provider (a minimal HTTP/1.1 keep-alive server returning a
+football-data.org-like /matches body after --latency-ms) and issues the same
+sequential requests both ways, the way the clients did before and after
+app.services.http_clients.
+
+Usage (from backend/, with the usual .env so app settings load):
+    python benchmarks/http_client_reuse.py --requests 200 --latency-ms 20
+    python benchmarks/http_client_reuse.py --url https://api.football-data.org/v4/competitions \
+        --requests 5   # real TLS endpoint; mind the 10 req/min quota
+
+Against the local server the difference is the TCP connect + client setup;
+against a real HTTPS provider it also includes DNS and the TLS handshake.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BODY = json.dumps({
+    "matches": [
+        {"id": i, "utcDate": "2025-01-01T15:00:00Z", "status": "FINISHED",
+         "lastUpdated": "2025-01-01T17:00:00Z", "competition": {"id": 2021}}
+        for i in range(50)
+    ]
+}).encode()
+
+
+async def handle(reader, writer, latency):
+    try:
+        while True:
+            # Read one request (headers only, GET has no body)
+            request = await reader.readuntil(b"\r\n\r\n")
+            if not request:
+                break
+            await asyncio.sleep(latency)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: " + str(len(BODY)).encode() + b"\r\n"
+                b"Connection: keep-alive\r\n\r\n" + BODY
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name, latencies):
+    print(
+        f"{name:<22} n={len(latencies):<5} mean={statistics.mean(latencies):7.2f}ms "
+        f"p50={percentile(latencies, 50):7.2f}ms p95={percentile(latencies, 95):7.2f}ms "
+        f"p99={percentile(latencies, 99):7.2f}ms"
+    )
+
+
+async def per_call(url, count, headers):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url, headers=headers, timeout=30.0)
+            response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def pooled(url, count, headers):
+    from app.services.http_clients import HTTPClientRegistry, HTTP2_AVAILABLE
+
+    registry = HTTPClientRegistry(http2=url.startswith("https"))
+    client = registry.get("benchmark")
+    print(f"(pooled client: {'HTTP/2' if registry.http2 else 'HTTP/1.1'}, h2 installed: {HTTP2_AVAILABLE})")
+    latencies = []
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        await registry.aclose()
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mock server think time")
+    parser.add_argument("--url", help="Benchmark a real endpoint instead of the local mock")
+    parser.add_argument("--token", default=os.getenv("FOOTBALL_API_KEY", ""), help="X-Auth-Token for --url")
+    args = parser.parse_args()
+
+    server = None
+    headers = {}
+    url = args.url
+    if url is None:
+        latency = args.latency_ms / 1000
+        server = await asyncio.start_server(lambda r, w: handle(r, w, latency), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/v4/matches"
+    elif args.token:
+        headers["X-Auth-Token"] = args.token
+
+    print(f"Target: {url}  requests: {args.requests}")
+    try:
+        report("new client per call", await per_call(url, args.requests, headers))
+        report("shared pooled client", await pooled(url, args.requests, headers))
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
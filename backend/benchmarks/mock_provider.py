@@ -0,0 +1,258 @@
+"""
+Local mock of football-data.org and API-Football for offline benchmarks
+
+A plain ASGI app that replays fixtures written by provider_recorder.py:
+    /football-data/v4/...  -> football-data.org fixtures
+    /api-football/...      -> API-Football fixtures
+A request with no exact (path, query) recording is answered from the latest
+recording of the same path. If the path was never recorded either, a
+deterministic synthetic football-data.org payload is generated for
+/matches, /competitions/{id}/matches and /competitions/{id}/standings, so
+benchmarks also run with an empty fixtures directory.
+
+Provider behaviour knobs:
+    latency       fixed think time in ms, or "recorded" to replay each
+                  fixture's original latency
+    rate_limit    requests per minute; beyond it 429 + Retry-After, and
+                  X-Requests-Available-Minute / X-RequestCounter-Reset on
+                  every response like football-data.org
+    error_rate    probability of an injected 429 (seeded, reproducible)
+
+Standalone:
+    python benchmarks/mock_provider.py --port 8099 --latency 80 --rate-limit 600 --error-rate 0.02
+then point FOOTBALL_API_BASE_URL at http://127.0.0.1:8099/football-data/v4.
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from provider_recorder import DEFAULT_FIXTURES_DIR, fixture_key  # noqa: E402
+
+PROVIDER_PREFIXES = (
+    ("/football-data/v4", "football-data"),
+    ("/api-football", "api-football"),
+)
+
+
+def synthetic_matches(competition_ids, date_from: str, date_to: str, per_day: int = 2):
+    """Deterministic football-data.org /matches entries for a date window"""
+    matches = []
+    day = datetime.strptime(date_from, "%Y-%m-%d").date()
+    end = datetime.strptime(date_to, "%Y-%m-%d").date()
+    today = datetime.utcnow().date()
+    while day <= end:
+        for competition_id in competition_ids:
+            for slot in range(per_day):
+                match_id = competition_id * 100_000 + day.toordinal() % 10_000 * 10 + slot
+                home = competition_id * 100 + (day.toordinal() + slot * 2) % 20
+                away = competition_id * 100 + (day.toordinal() + slot * 2 + 1) % 20
+                finished = day < today
+                matches.append({
+                    "id": match_id,
+                    "utcDate": f"{day.isoformat()}T{15 + slot * 2:02d}:00:00Z",
+                    "status": "FINISHED" if finished else "TIMED",
+                    "matchday": day.toordinal() % 38 + 1,
+                    "lastUpdated": f"{day.isoformat()}T{17 + slot * 2:02d}:00:00Z" if finished else f"{today.isoformat()}T00:00:00Z",
+                    "competition": {"id": competition_id},
+                    "homeTeam": {"id": home, "name": f"Team {home}", "shortName": f"T{home}"},
+                    "awayTeam": {"id": away, "name": f"Team {away}", "shortName": f"T{away}"},
+                    "score": {"fullTime": {
+                        "home": match_id % 4 if finished else None,
+                        "away": match_id % 3 if finished else None,
+                    }},
+                })
+        day += timedelta(days=1)
+    return matches
+
+
+def synthetic_standings(competition_id: int, teams: int = 20):
+    table = [
+        {
+            "position": position,
+            "team": {"id": competition_id * 100 + position - 1, "name": f"Team {competition_id * 100 + position - 1}"},
+            "playedGames": 20, "won": 20 - position, "draw": position % 5, "lost": position - 1,
+            "points": (20 - position) * 3 + position % 5, "goalsFor": 40 - position,
+            "goalsAgainst": 10 + position, "goalDifference": 30 - 2 * position, "form": "W,D,L,W,W",
+        }
+        for position in range(1, teams + 1)
+    ]
+    return {"competition": {"id": competition_id}, "standings": [{"type": "TOTAL", "table": table}]}
+
+
+def synthesize(path: str, query: Dict[str, str]) -> Optional[Dict]:
+    parts = path.strip("/").split("/")
+    today = datetime.utcnow().date().isoformat()
+    date_from, date_to = query.get("dateFrom", today), query.get("dateTo", today)
+    if parts == ["matches"]:
+        ids = [int(c) for c in query.get("competitions", "2021").split(",") if c]
+        return {"matches": synthetic_matches(ids, date_from, date_to)}
+    if len(parts) == 3 and parts[0] == "competitions" and parts[1].isdigit():
+        if parts[2] == "matches":
+            return {"matches": synthetic_matches([int(parts[1])], date_from, date_to)}
+        if parts[2] == "standings":
+            return synthetic_standings(int(parts[1]))
+    return None
+
+
+class MockProvider:
+    """ASGI app replaying recorded provider responses"""
+
+    def __init__(
+        self,
+        fixtures_dir: str = DEFAULT_FIXTURES_DIR,
+        latency: str = "0",
+        rate_limit: int = 0,
+        error_rate: float = 0.0,
+        seed: int = 42,
+    ):
+        self.exact: Dict[str, Dict] = {}
+        self.by_path: Dict[Tuple[str, str], Dict] = {}
+        for filename in sorted(glob.glob(os.path.join(fixtures_dir, "*.json"))):
+            with open(filename, encoding="utf-8") as f:
+                record = json.load(f)
+            self.exact[fixture_key(record["provider"], record["path"], record["query"])] = record
+            self.by_path[(record["provider"], record["path"])] = record
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.window: deque = deque()
+        self.stats = {"requests": 0, "replayed": 0, "synthetic": 0, "rate_limited": 0, "injected_429": 0, "not_found": 0}
+
+    def _lookup(self, provider: str, path: str, query: Dict[str, str]) -> Tuple[Optional[Dict], str]:
+        record = self.exact.get(fixture_key(provider, path, query)) or self.by_path.get((provider, path))
+        if record is not None:
+            return record, "replayed"
+        body = synthesize(path, query) if provider == "football-data" else None
+        if body is not None:
+            return {"status": 200, "headers": {"content-type": "application/json"}, "body": body, "elapsed_ms": None}, "synthetic"
+        return None, "not_found"
+
+    def _delay(self, record: Optional[Dict]) -> float:
+        if self.latency == "recorded":
+            return ((record or {}).get("elapsed_ms") or 0) / 1000
+        return float(self.latency) / 1000
+
+    def _rate_headers(self, now: float) -> Tuple[bool, Dict[str, str]]:
+        """(allowed, headers) for a sliding one-minute window"""
+        if not self.rate_limit:
+            return True, {}
+        while self.window and now - self.window[0] >= 60:
+            self.window.popleft()
+        reset = int(60 - (now - self.window[0])) + 1 if self.window else 60
+        if len(self.window) >= self.rate_limit:
+            return False, {"X-Requests-Available-Minute": "0", "X-RequestCounter-Reset": str(reset), "Retry-After": str(reset)}
+        self.window.append(now)
+        return True, {
+            "X-Requests-Available-Minute": str(self.rate_limit - len(self.window)),
+            "X-RequestCounter-Reset": str(reset),
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        self.stats["requests"] += 1
+        path = scope["path"]
+        query = dict(parse_qsl(scope.get("query_string", b"").decode()))
+        provider = None
+        for prefix, name in PROVIDER_PREFIXES:
+            if path.startswith(prefix):
+                provider, path = name, path[len(prefix):] or "/"
+                break
+
+        record, outcome = self._lookup(provider, path, query) if provider else (None, "not_found")
+        await asyncio.sleep(self._delay(record))
+
+        allowed, headers = self._rate_headers(time.monotonic())
+        if not allowed:
+            self.stats["rate_limited"] += 1
+            return await self._respond(send, 429, headers, {"message": "Too many requests"})
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.stats["injected_429"] += 1
+            return await self._respond(send, 429, {**headers, "Retry-After": "1"}, {"message": "Injected 429"})
+        self.stats[outcome] += 1
+        if record is None:
+            return await self._respond(send, 404, headers, {"message": f"No fixture for {scope['path']}"})
+        return await self._respond(send, record["status"], {**record["headers"], **headers}, record["body"])
+
+    @staticmethod
+    async def _respond(send, status: int, headers: Dict[str, str], body):
+        payload = json.dumps(body).encode()
+        raw_headers = [
+            (k.lower().encode(), str(v).encode())
+            for k, v in headers.items()
+            if k.lower() not in ("content-type", "content-length")
+        ]
+        raw_headers += [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": payload})
+
+
+class MockProviderServer:
+    """Run a MockProvider with uvicorn inside the current event loop"""
+
+    def __init__(self, app: MockProvider, host: str = "127.0.0.1", port: int = 0):
+        import uvicorn
+
+        self.app = app
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="off"))
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self.server.serve())
+        while not self.server.started:
+            if self._task.done():
+                self._task.result()
+            await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.should_exit = True
+        await self._task
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", default="0", help='Milliseconds, or "recorded"')
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per minute (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected 429")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = MockProvider(args.fixtures, args.latency, args.rate_limit, args.error_rate, args.seed)
+    print(f"Mock provider: {len(app.exact)} fixtures, football-data.org at http://{args.host}:{args.port}/football-data/v4")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Record football-data.org / API-Football responses as replayable fixtures
+
+Runs the real provider clients with a recording transport on their pooled
+HTTP clients and writes one JSON file per distinct request (provider, path,
+query) to --out. benchmarks/mock_provider.py replays these fixtures.
+
+Usage (from backend/, with the usual .env so app settings load):
+    python benchmarks/provider_recorder.py --leagues 2021,2014 \
+        --date-from 2025-01-01 --date-to 2025-01-20 [--api-football-fixtures 2025-01-11]
+
+Every recorded request is a real one: it goes through the API budget and
+rate limiter like any other request (football-data.org free tier: 10/min).
+Request headers (API keys) are never written; response headers are kept
+except hop-by-hop / encoding ones.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Not meaningful when replayed (body is stored decoded)
+DROPPED_HEADERS = {
+    "content-encoding", "content-length", "transfer-encoding", "connection",
+    "keep-alive", "date", "set-cookie", "alt-svc", "server",
+}
+
+
+def fixture_key(provider: str, path: str, query: Dict[str, str]) -> str:
+    """Stable identity of a request, shared with the mock server"""
+    return f"{provider}:{path}?" + "&".join(f"{k}={v}" for k, v in sorted(query.items()))
+
+
+def fixture_filename(key: str) -> str:
+    return hashlib.sha1(key.encode()).hexdigest()[:16] + ".json"
+
+
+class FixtureStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.saved = 0
+
+    def save(self, provider: str, path: str, query: Dict[str, str], response: httpx.Response, elapsed_ms: float):
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        record = {
+            "provider": provider,
+            "path": path,
+            "query": query,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS},
+            "body": body,
+            # Real provider latency, replayed by mock_provider.py --latency recorded
+            "elapsed_ms": round(elapsed_ms, 1),
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        key = fixture_key(provider, path, query)
+        with open(os.path.join(self.directory, fixture_filename(key)), "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=1)
+        self.saved += 1
+        print(f"  📼 {response.status_code} {key}")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests through and store each response under the provider's path"""
+
+    def __init__(self, store: FixtureStore, provider: str, base_path: str, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.store = store
+        self.provider = provider
+        self.base_path = base_path.rstrip("/")
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        await response.aread()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        path = request.url.path
+        if path.startswith(self.base_path):
+            path = path[len(self.base_path):] or "/"
+        self.store.save(self.provider, path, dict(request.url.params), response, elapsed_ms)
+        return response
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--leagues", default="2021", help="Comma-separated football-data.org competition IDs")
+    parser.add_argument("--date-from", required=True)
+    parser.add_argument("--date-to", required=True)
+    parser.add_argument("--no-standings", action="store_true")
+    parser.add_argument("--api-football-fixtures", metavar="DATE", help="Also record API-Football /fixtures?date=DATE")
+    args = parser.parse_args()
+
+    from app.core.config import settings
+    from app.services.api_football_client import APIFootballClient
+    from app.services.football_api import FootballAPIClient
+    from app.services.http_clients import http_clients, FOOTBALL_DATA, API_FOOTBALL
+
+    store = FixtureStore(args.out)
+    league_ids = [int(league_id) for league_id in args.leagues.split(",") if league_id]
+
+    # Fixtures must hold real responses, not HTTP cache hits
+    from app.services.http_cache import http_cache
+    http_cache.mode = "off"
+
+    football_data_base = httpx.URL(settings.FOOTBALL_API_BASE_URL).path
+    http_clients.set(FOOTBALL_DATA, httpx.AsyncClient(
+        transport=RecordingTransport(store, FOOTBALL_DATA, football_data_base), timeout=30.0
+    ))
+    http_clients.set(API_FOOTBALL, httpx.AsyncClient(
+        transport=RecordingTransport(store, API_FOOTBALL, httpx.URL(APIFootballClient.BASE_URL).path), timeout=30.0
+    ))
+
+    print(f"Recording into {args.out}")
+    try:
+        client = FootballAPIClient()
+        await client.get_competitions()
+        await client.get_matches_multi(league_ids, args.date_from, args.date_to)
+        if not args.no_standings:
+            for league_id in league_ids:
+                await client.get_competition_standings(league_id)
+
+        if args.api_football_fixtures:
+            if not settings.API_FOOTBALL_KEY:
+                print("⚠️  API_FOOTBALL_KEY not set, skipping API-Football")
+            else:
+                api_football = APIFootballClient(settings.API_FOOTBALL_KEY)
+                await api_football._request("fixtures", {"date": args.api_football_fixtures})
+    finally:
+        await http_clients.aclose()
+
+    print(f"✅ Recorded {store.saved} responses")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""
+Offline sync throughput and end-to-end seed time against the mock provider
+
+Starts benchmarks/mock_provider.py in-process and points the football-data.org
+client at it, so runs are repeatable and spend no real API quota.
+
+    fetch  only the provider client: SeedPipeline's match windows fetched with
+           get_matches_multi at --concurrency, no database
+    seed   the full SeedPipeline (fetch + DataSyncService ingest) into the
+           configured DATABASE_URL; use a scratch database whose leagues
+           table contains the --leagues IDs
+
+Usage (from backend/, with the usual .env so app settings load):
+    python benchmarks/sync_throughput.py fetch --leagues 2021,2014,2002 --days 60 --latency 80
+    python benchmarks/sync_throughput.py seed --leagues 2021,2014 --days 28 \
+        --latency recorded --rate-limit 120 --error-rate 0.05 --client-rate 100
+
+--client-rate sets the client-side token bucket (requests/minute, default
+unlimited); the real football-data.org limit is 10. The HTTP response cache
+is off and the shared API budget is not charged during the run.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_provider import MockProvider, MockProviderServer  # noqa: E402
+from provider_recorder import DEFAULT_FIXTURES_DIR  # noqa: E402
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_fetch(client, units, concurrency):
+    latencies, matches = [], 0
+    queue = asyncio.Queue()
+    for unit in units:
+        queue.put_nowait(unit)
+
+    async def worker():
+        nonlocal matches
+        while not queue.empty():
+            unit = queue.get_nowait()
+            start = time.perf_counter()
+            grouped = await client.get_matches_multi(list(unit.league_ids), unit.date_from, unit.date_to)
+            latencies.append((time.perf_counter() - start) * 1000)
+            matches += sum(len(items) for items in grouped.values())
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies, matches
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=("fetch", "seed"))
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--leagues", default="2021,2014,2002,2019,2015")
+    parser.add_argument("--days", type=int, default=28, help="Window size, centred on today")
+    parser.add_argument("--concurrency", type=int, default=2, help="Fetchers (fetch_concurrency in seed mode)")
+    parser.add_argument("--latency", default="50", help='Mock think time in ms, or "recorded"')
+    parser.add_argument("--rate-limit", type=int, default=0, help="Mock requests/minute (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Mock injected 429 probability")
+    parser.add_argument("--client-rate", type=int, default=0, help="Client token bucket requests/minute (0 = unlimited)")
+    args = parser.parse_args()
+
+    from app.services.api_budget import api_budget
+    from app.services.football_api import FootballAPIClient
+    from app.services.http_cache import http_cache
+    from app.services.http_clients import http_clients
+    from app.services.rate_limiter import AsyncTokenBucket
+    from app.services.seed_pipeline import SeedPipeline, plan_seed_units
+
+    async def unmetered(*_args, **_kwargs):
+        return None
+
+    # Mock requests must not count against the real key's shared budget
+    api_budget.reserve = unmetered
+    http_cache.mode = "off"
+
+    league_ids = [int(league_id) for league_id in args.leagues.split(",") if league_id]
+    today = date.today()
+    date_from = (today - timedelta(days=args.days // 2)).strftime("%Y-%m-%d")
+    date_to = (today + timedelta(days=args.days - args.days // 2 - 1)).strftime("%Y-%m-%d")
+
+    mock = MockProvider(args.fixtures, args.latency, args.rate_limit, args.error_rate)
+    async with MockProviderServer(mock) as server:
+        client = FootballAPIClient()
+        client.base_url = f"{server.base_url}/football-data/v4"
+        client.limiter = AsyncTokenBucket(args.client_rate or 1_000_000)
+
+        print(f"Mock: {server.base_url} ({len(mock.exact)} fixtures)  latency={args.latency} "
+              f"rate-limit={args.rate_limit or '∞'} error-rate={args.error_rate}")
+        print(f"Window {date_from} → {date_to}, {len(league_ids)} leagues, mode={args.mode}")
+
+        started = time.perf_counter()
+        try:
+            if args.mode == "fetch":
+                units = plan_seed_units(league_ids, date_from, date_to, include_standings=False)
+                latencies, matches = await run_fetch(client, units, args.concurrency)
+                elapsed = time.perf_counter() - started
+                print(f"Units: {len(units)}  matches: {matches}  elapsed: {elapsed:.2f}s  "
+                      f"throughput: {matches / elapsed:.0f} matches/s")
+                if latencies:
+                    print(f"Unit latency mean={statistics.mean(latencies):.1f}ms "
+                          f"p50={percentile(latencies, 50):.1f}ms p95={percentile(latencies, 95):.1f}ms")
+            else:
+                units = plan_seed_units(league_ids, date_from, date_to)
+                result = await SeedPipeline(api_client=client, fetch_concurrency=args.concurrency).run(units)
+                elapsed = time.perf_counter() - started
+                print(f"Units: {result.units_done}/{len(units)}  matches: {result.matches}  "
+                      f"standings: {result.standings}  failed: {len(result.failed)}  deferred: {len(result.deferred)}")
+                print(f"End-to-end seed: {elapsed:.2f}s  throughput: {result.matches / elapsed:.0f} matches/s")
+        finally:
+            await http_clients.aclose()
+
+        print(f"Provider: {mock.stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,14 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from sqlalchemy import text
 import logging
 
 from app.core.config import settings
 from app.api.v1 import router as api_router
 from app.api.v1.endpoints import admin, users
-from app.db.database import engine, Base
+from app.db.database import engine, Base, check_read_engine, dispose_engines
+from app.db.instrumentation import db_metrics, UNMATCHED_ROUTE
 from app.services.cache import cache
+from app.services.http_clients import http_clients
+from app.services.json_stream import warn_if_fallback
+from app.services.match_archive import CREATE_HISTORY_VIEW_SQL
 from app.core.scheduler import start_scheduler, stop_scheduler
+from app.core.leader import scheduler_leader
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +23,7 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting ScoreFlow API...")
+    warn_if_fallback()
     
     # Create tables with retry logic (for slow Render DBs)
     import asyncio
@@ -26,6 +33,8 @@ async def lifespan(app: FastAPI):
             logger.info(f"🔄 Connecting to DB (Attempt {attempt + 1}/{max_retries})...")
             async with engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                # H2H and team history read archived seasons through this view
+                await conn.execute(text(CREATE_HISTORY_VIEW_SQL))
             logger.info("✅ DB Connected & Tables Created")
             break
         except Exception as e:
@@ -36,13 +45,26 @@ async def lifespan(app: FastAPI):
                 logger.error("🛑 Max retries reached, giving up.")
                 raise e
     
+    # Route read-only endpoints to the replica if one is configured and reachable
+    if await check_read_engine():
+        logger.info("✅ Read replica connected")
+    
     # Connect to Redis
     await cache.connect()
     
     # Start background scheduler for auto-updates
-    if settings.ENABLE_SCHEDULER:
+    run_scheduler = settings.ENABLE_SCHEDULER and settings.SYNC_MODE != "worker"
+    if run_scheduler and settings.SCHEDULER_LEADER_ELECTION:
+        # Only the worker that wins the advisory lock runs the jobs
+        scheduler_leader.on_elected = start_scheduler
+        scheduler_leader.on_demoted = stop_scheduler
+        await scheduler_leader.start()
+        logger.info("✅ Background scheduler enabled (leader election)")
+    elif run_scheduler:
         start_scheduler()
         logger.info("✅ Background scheduler enabled")
+    elif settings.SYNC_MODE == "worker":
+        logger.info("ℹ️  Sync jobs run in the dedicated worker (python -m app.worker)")
     else:
         logger.info("⚠️  Background scheduler disabled")
     
@@ -50,9 +72,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🛑 Shutting down ScoreFlow API...")
-    if settings.ENABLE_SCHEDULER:
+    if run_scheduler and settings.SCHEDULER_LEADER_ELECTION:
+        await scheduler_leader.stop()
+    elif run_scheduler:
         stop_scheduler()
-    await engine.dispose()
+    await dispose_engines()
+    await http_clients.aclose()
     await cache.disconnect()
 
 
@@ -80,6 +105,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def count_db_queries(request: Request, call_next):
+    """Count DB statements per request (reported by /admin/metrics/db)"""
+    token = db_metrics.start_request()
+    try:
+        return await call_next(request)
+    finally:
+        route = request.scope.get("route")
+        db_metrics.finish_request(
+            f"{request.method} {route.path}" if route else UNMATCHED_ROUTE, token
+        )
+
+
 # Include routers
 app.include_router(api_router, prefix="/api/v1")
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
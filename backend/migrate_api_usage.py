@@ -0,0 +1,19 @@
+import asyncio
+
+from app.db.database import engine
+from app.db.models import ApiUsage
+
+
+async def migrate():
+    """Create the api_usage table backing the shared API request budget
+    Usage: python migrate_api_usage.py
+    """
+    print("Migrating API usage...")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: ApiUsage.__table__.create(sync_conn, checkfirst=True))
+        print("✅ Table 'api_usage' created/verified.")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,25 @@
+import asyncio
+
+from sqlalchemy import text
+
+from app.db.database import engine
+from app.db.models import JobRun, SeedCheckpoint
+
+
+async def migrate():
+    """Create the job_runs and seed_checkpoints tables (run history, resumable seeds)
+    Usage: python migrate_job_runs.py
+    """
+    print("Migrating job runs...")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: JobRun.__table__.create(sync_conn, checkfirst=True))
+        await conn.execute(text("ALTER TABLE job_runs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP"))
+        print("✅ Table 'job_runs' created/verified.")
+
+        await conn.run_sync(lambda sync_conn: SeedCheckpoint.__table__.create(sync_conn, checkfirst=True))
+        print("✅ Table 'seed_checkpoints' created/verified.")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,21 @@
+import asyncio
+
+from app.db.database import engine
+from app.db.models import Match
+
+
+async def migrate():
+    """Create the partial index on live match statuses used by admin stats
+    Usage: python migrate_live_status_index.py
+    """
+    print("Migrating live status index...")
+    async with engine.begin() as conn:
+        for index in Match.__table__.indexes:
+            if index.name == "ix_matches_live_status":
+                await conn.run_sync(lambda sync_conn, index=index: index.create(sync_conn, checkfirst=True))
+                print(f"✅ Index '{index.name}' created/verified.")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
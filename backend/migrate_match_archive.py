@@ -0,0 +1,45 @@
+import asyncio
+import sys
+from sqlalchemy import text
+
+from app.db.database import engine, AsyncSessionLocal
+from app.db.models import MatchArchive
+from app.services.match_archive import MatchArchiveService, season_of
+
+
+async def migrate():
+    """Create the season-partitioned match archive, history view and hot-table index
+    Usage: python migrate_match_archive.py [--archive]
+    """
+    print("Migrating match archive...")
+    async with engine.begin() as conn:
+        # Partitioned parent table (partitions are created per season below)
+        await conn.run_sync(lambda sync_conn: MatchArchive.__table__.create(sync_conn, checkfirst=True))
+        print("✅ match_archive (PARTITION BY RANGE match_date) ready.")
+
+        await conn.execute(text("CREATE INDEX IF NOT EXISTS idx_matches_match_date ON matches(match_date);"))
+        print("✅ Index 'idx_matches_match_date' created/verified.")
+
+    async with AsyncSessionLocal() as db:
+        service = MatchArchiveService(db)
+
+        # One partition per season already present in the hot table
+        result = await db.execute(text("SELECT MIN(match_date), MAX(match_date) FROM matches"))
+        first, last = result.one()
+        if first and last:
+            for season in range(season_of(first.date()), season_of(last.date()) + 1):
+                await service.ensure_partition(season)
+                print(f"✅ Partition match_archive_{season} created/verified.")
+
+        await service.ensure_history_view()
+        await db.commit()
+        print("✅ View 'matches_history' created/verified.")
+
+        if "--archive" in sys.argv:
+            count = await service.archive_old_seasons()
+            print(f"✅ Archived {count} matches.")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,21 @@
+import asyncio
+
+from app.db.database import engine
+from app.db.models import Match
+
+
+async def migrate():
+    """Create the (team, match_date) indexes used by feature extraction
+    Usage: python migrate_match_team_indexes.py
+    """
+    print("Migrating match team indexes...")
+    async with engine.begin() as conn:
+        for index in Match.__table__.indexes:
+            if index.name.startswith("ix_matches_") and index.name.endswith("_team_date"):
+                await conn.run_sync(lambda sync_conn, index=index: index.create(sync_conn, checkfirst=True))
+                print(f"✅ Index '{index.name}' created/verified.")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,24 @@
+import asyncio
+from sqlalchemy import text
+
+from app.db.database import engine
+from app.db.models import SyncCursor
+
+
+async def migrate():
+    """Create the sync_cursors table used by the incremental nightly sync
+    Usage: python migrate_sync_cursors.py
+    Until a league has a cursor, the nightly job fetches its full window once.
+    """
+    print("Migrating sync cursors...")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: SyncCursor.__table__.create(sync_conn, checkfirst=True))
+        print("✅ Table 'sync_cursors' created/verified.")
+        # Per-date watermarks (added after the table first shipped)
+        await conn.execute(text("ALTER TABLE sync_cursors ADD COLUMN IF NOT EXISTS day_watermarks JSON"))
+        print("✅ Column 'sync_cursors.day_watermarks' created/verified.")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -31,6 +31,7 @@ if DATABASE_URL and DATABASE_URL.startswith("postgresql://"):
 # Imports
 from app.db.models import Match, Team, TeamStats
 from app.ml.feature_engineering import FeatureEngineer
+from app.services.match_archive import MatchArchiveService, matches_history
 
 # Windows Asyncio Fix
 if sys.platform == 'win32':
@@ -46,16 +47,19 @@ async def train_model():
     AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
     async with AsyncSessionLocal() as db:
-        print("📊 Fetching finished matches...")
-        stmt = select(Match).where(Match.status == "finished").options(
-            selectinload(Match.home_team),
-            selectinload(Match.away_team)
-        )
+        print("📊 Fetching finished matches (hot + archived seasons)...")
+        await MatchArchiveService(db).ensure_history_view()
+        await db.commit()
+        stmt = select(
+            matches_history.c.id,
+            matches_history.c.home_score,
+            matches_history.c.away_score
+        ).where(matches_history.c.status == "finished")
         result = await db.execute(stmt)
-        matches = result.scalars().all()
+        matches = result.all()
         print(f"✅ Found {len(matches)} matches.")
 
-        feature_engineer = FeatureEngineer(db)
+        feature_engineer = FeatureEngineer(db, history=True)
         X = []
         y = []
 